@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Veri Çekme Benchmark'ı
+Sıralı çekme ile eşzamanlı FetchEngine'i yerel stub sunucuya karşı karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_fetch.py --latency 0.3 --concurrency 4 --rps 4
+"""
+
+import argparse
+import logging
+import time
+
+from bench_utils import StubEbayServer
+
+from ebay_scraper import EbayScraper
+
+# Eski run_market_research her sorgudan sonra ortalama 3 sn (2-4 sn) bekliyordu
+LEGACY_MEAN_DELAY = 3.0
+
+def run_sequential(scraper):
+    """Eski davranış: sorguları tek tek çek (bekleme süresi hariç)"""
+    products = []
+    for category in scraper.categories:
+        products.extend(scraper.search_category_products(category, limit=20))
+    for keyword in scraper.trending_keywords:
+        products.extend(scraper.search_trending_products(keyword, limit=15))
+    return products
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.3, help='Stub sunucu yanıt gecikmesi (sn)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rps', type=float, default=4.0, help='Host başına istek/sn')
+    parser.add_argument('--burst', type=int, default=4)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with StubEbayServer(latency=args.latency) as server:
+        sequential = EbayScraper(max_concurrency=1, requests_per_second=1000, burst=1000)
+        sequential.base_url = server.base_url
+        start = time.perf_counter()
+        seq_products = run_sequential(sequential)
+        seq_time = time.perf_counter() - start
+        query_count = len(sequential.categories) + len(sequential.trending_keywords)
+        legacy_time = seq_time + query_count * LEGACY_MEAN_DELAY
+
+        concurrent = EbayScraper(max_concurrency=args.concurrency, requests_per_second=args.rps, burst=args.burst)
+        concurrent.base_url = server.base_url
+        start = time.perf_counter()
+        con_products = concurrent.collect_products()
+        con_time = time.perf_counter() - start
+
+    print(f"Sorgu sayısı           : {query_count}")
+    print(f"Sıralı (beklemesiz)    : {seq_time:.2f} sn, {len(seq_products)} ürün")
+    print(f"Eski akış (tahmini)    : {legacy_time:.2f} sn (sorgu başına ~{LEGACY_MEAN_DELAY:.0f} sn bekleme)")
+    print(f"Eşzamanlı FetchEngine  : {con_time:.2f} sn, {len(con_products)} ürün")
+    print(f"Hızlanma (sıralıya göre): {seq_time / con_time:.1f}x")
+    print(f"Hızlanma (eski akışa)  : {legacy_time / con_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
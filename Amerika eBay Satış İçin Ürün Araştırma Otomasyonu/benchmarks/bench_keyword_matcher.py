@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Anahtar Kelime Eşleştirici Benchmark'ı
+10, 1.000 ve 50.000 trend kelimelik sözlüklerle trend skorlamasını eski
+"her kelime için ayrı alt dize araması" döngüsüyle karşılaştırır ve her
+başlık için sonuçların aynı olduğunu doğrular.
+
+Kullanım:
+    python benchmarks/bench_keyword_matcher.py --titles 20000 --sizes 10 1000 50000
+"""
+
+import argparse
+import logging
+import random
+import time
+
+from bench_utils import iter_products, _TITLE_WORDS
+
+from product_analyzer import ProductAnalyzer
+
+def make_keywords(size, seed=7):
+    """Gerçekçi karışım: mevcut trend terimleri + başlık kelimelerinden ve rastgele harflerden ifadeler"""
+    rng = random.Random(seed)
+    keywords = dict(ProductAnalyzer().trend_keywords)
+    while len(keywords) < size:
+        if rng.random() < 0.3:
+            phrase = ' '.join(rng.sample(_TITLE_WORDS, rng.randint(1, 2)))
+        else:
+            phrase = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10)))
+        keywords.setdefault(phrase, round(rng.uniform(0.5, 1.5), 2))
+    return dict(list(keywords.items())[:size])
+
+def naive_trend_score(trend_keywords, title, search_keyword):
+    """Eski uygulama: her kelime için başlıkta ve arama teriminde alt dize araması"""
+    title_lower = title.lower()
+    keyword_lower = search_keyword.lower()
+    max_score = 0
+    for keyword, weight in trend_keywords.items():
+        if keyword in title_lower or keyword in keyword_lower:
+            max_score = max(max_score, 100 * weight)
+    return max_score if max_score > 0 else 50
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 1000, 50000])
+    parser.add_argument('--naive-limit', type=int, default=2000,
+                        help='Eski döngünün ölçüldüğü en fazla başlık sayısı (büyük sözlüklerde çok yavaş)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    products = [(p['title'], p['search_keyword']) for p in iter_products(args.titles)]
+
+    for size in args.sizes:
+        analyzer = ProductAnalyzer()
+        analyzer.trend_keywords = make_keywords(size)
+
+        start = time.perf_counter()
+        matcher = analyzer._trend_matcher()
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matched = [analyzer._calculate_trend_score(title, keyword) for title, keyword in products]
+        matcher_time = time.perf_counter() - start
+
+        sample = products[:args.naive_limit]
+        start = time.perf_counter()
+        naive = [naive_trend_score(analyzer.trend_keywords, title, keyword) for title, keyword in sample]
+        naive_time = time.perf_counter() - start
+
+        identical = naive == matched[:len(sample)]
+        matcher_us = matcher_time / len(products) * 1e6
+        naive_us = naive_time / len(sample) * 1e6
+        mode = 'Aho-Corasick' if matcher.use_automaton else 'sıralı tarama'
+        print(f"{size:>6,} kelime ({mode:<13}): derleme {build_time * 1000:7.1f} ms | "
+              f"eşleştirici {matcher_us:7.1f} µs/ürün | eski döngü {naive_us:9.1f} µs/ürün | "
+              f"hızlanma {naive_us / matcher_us:7.1f}x | aynı: {'evet' if identical else 'HAYIR'}")
+
+if __name__ == '__main__':
+    main()
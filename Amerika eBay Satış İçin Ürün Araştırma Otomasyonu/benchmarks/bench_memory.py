@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Bellek Benchmark'ı
+1M ürünlük bir çalıştırmanın en yüksek RSS değerini eski sözlük tabanlı akış
+(ürün başına sözlük + analyze_products içinde kopya + ürün başına zaman damgası
+metinleri) ile Product kayıtlı akış için ayrı süreçlerde ölçer.
+
+Kullanım:
+    python benchmarks/bench_memory.py --count 1000000
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+from datetime import datetime
+
+from bench_utils import iter_products
+
+def peak_rss_mb():
+    """Sürecin en yüksek RSS değeri (MB, Linux'ta ru_maxrss KB cinsindendir)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_dicts(count):
+    """Eski akış: sözlükler, ürün başına zaman damgası ve analiz kopyası"""
+    from product_analyzer import ProductAnalyzer
+    analyzer = ProductAnalyzer()
+
+    products = []
+    for product in iter_products(count):
+        product['scraped_at'] = datetime.now().isoformat()
+        products.append(product)
+
+    scores = analyzer.calculate_scores_batch(products).tolist()
+    analyzed = []
+    for product, score in zip(products, scores):
+        analyzed_product = product.copy()
+        analyzed_product['advanced_score'] = score
+        analyzed_product['analysis_timestamp'] = datetime.now().isoformat()
+        analyzed.append(analyzed_product)
+    return analyzed
+
+def run_records(count):
+    """Yeni akış: Product kayıtları yerinde skorlanır"""
+    from product_analyzer import ProductAnalyzer
+    from product_record import Product
+    analyzer = ProductAnalyzer()
+
+    products = [Product.from_dict(product) for product in iter_products(count)]
+    return analyzer.analyze_products(products)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--mode', choices=['dicts', 'records'], help='Tek bir modu bu süreçte çalıştır')
+    args = parser.parse_args()
+
+    if args.mode:
+        result = run_dicts(args.count) if args.mode == 'dicts' else run_records(args.count)
+        print(f"{len(result)} {peak_rss_mb():.1f}")
+        return
+
+    for mode in ('dicts', 'records'):
+        output = subprocess.run(
+            [sys.executable, __file__, '--count', str(args.count), '--mode', mode],
+            check=True, capture_output=True, text=True
+        ).stdout.split()
+        print(f"{mode:>8}: {int(output[0]):,} ürün, en yüksek RSS {float(output[1]):,.1f} MB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Ayrıştırıcı Mikro-Benchmark'ı
+Kayıtlı eBay arama sayfası fixture'ları üzerinde her ayrıştırıcı arka ucu için
+ürün/sn değerini ölçer ve çıktıların bs4 yedek arka ucuyla aynı olduğunu doğrular.
+
+Kullanım:
+    python benchmarks/bench_parser.py --repeat 50
+"""
+
+import argparse
+import time
+
+from bench_utils import FIXTURES_DIR
+
+from product_parser import PARSER_BACKENDS
+
+def comparable(products):
+    """Zaman damgası dışındaki alanları karşılaştırılabilir hale getir"""
+    return [{k: v for k, v in p.to_dict().items() if k != 'scraped_at'} for p in products]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50, help='Her fixture için tekrar sayısı')
+    args = parser.parse_args()
+
+    pages = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob('*.html'))]
+    print(f"{len(pages)} fixture sayfası, {args.repeat} tekrar")
+
+    reference = None
+    for name, backend_cls in reversed(list(PARSER_BACKENDS.items())):
+        try:
+            backend = backend_cls()
+        except ImportError:
+            print(f"{name:>12}: kurulu değil, atlandı")
+            continue
+
+        results = [backend.parse(page) for page in pages]
+        if reference is None:
+            reference = [comparable(r) for r in results]
+            status = 'referans'
+        else:
+            status = 'aynı' if [comparable(r) for r in results] == reference else 'FARKLI'
+
+        item_count = 0
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for page in pages:
+                item_count += len(backend.parse(page))
+        elapsed = time.perf_counter() - start
+
+        print(f"{name:>12}: {item_count / elapsed:>10,.0f} ürün/sn  ({elapsed:.2f} sn, çıktı: {status})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Ayrıştırma/Skorlama Hattı Benchmark'ı
+Kayıtlı sayfa fixture'larından oluşan bir külliyatı tek süreçte ve farklı
+çalışan sayılarıyla ParsePipeline üzerinden işler; sayfa/sn, hızlanma ve
+çıktının tek süreçli yol ile aynı olup olmadığını raporlar. Ayrıca aynı
+sayfanın satış sayıları artmış bir kopyasını başka bir arama terimiyle
+işleyerek tekilleştirme sonrası skorların hat modunda da güncel kaldığını
+doğrular; aynı ilanlar bir kategori ve bir trend terimiyle iki sırada
+birleştirildiğinde skorların sıradan bağımsız olduğunu kontrol eder.
+
+Kullanım:
+    python benchmarks/bench_pipeline.py --pages 400 --workers 1 2 4
+"""
+
+import argparse
+import logging
+import os
+import re
+import time
+
+from bench_utils import FIXTURES_DIR
+
+from pipeline import ParsePipeline
+from product_parser import get_parser_backend
+from product_analyzer import ProductAnalyzer
+
+def comparable(products):
+    """Zaman damgaları dışındaki alanları karşılaştırılabilir hale getir"""
+    return [{k: v for k, v in p.to_dict().items() if k not in ('scraped_at', 'analysis_timestamp')}
+            for p in products]
+
+def corpus(pages):
+    """Fixture sayfalarını döngüsel olarak tekrarlayan (içerik, arama terimi, limit) listesi"""
+    fixtures = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob('*.html'))]
+    return [(fixtures[i % len(fixtures)], f"keyword {i % 19}", None) for i in range(pages)]
+
+def run_serial(pages, backend):
+    parser = get_parser_backend(backend)
+    analyzer = ProductAnalyzer()
+    results = []
+    for content, keyword, limit in pages:
+        products = parser.parse(content, limit)
+        for product in products:
+            product.search_keyword = keyword
+        results.append(analyzer.analyze_products(products, sort_results=False))
+    return results
+
+def check_merged_scores(backend):
+    """Hat modu + tekrar eden ilanlar: birleştirilen kayıtların skoru kendi sayaçlarıyla tutarlı olmalı"""
+    from ebay_scraper import EbayScraper
+    # ebay_scraper içe aktarılırken INFO düzeyinde günlük yapılandırır
+    logging.getLogger().setLevel(logging.WARNING)
+    content = (FIXTURES_DIR / 'search_results_page1.html').read_bytes()
+    # Aynı ilanlar ikinci sorguda daha yüksek satış sayısıyla görünür
+    bumped = re.sub(rb'(\d[\d,]*) sold', lambda m: b'%d sold' % (int(m.group(1).replace(b',', b'')) * 10 + 5), content)
+    pages = [(content, 'first keyword', None), (bumped, 'second keyword', None)]
+
+    with ParsePipeline(workers=1, parser_backend=backend) as pipeline:
+        products = [product for _, outcome in sorted(pipeline.process_pages(pages), key=lambda item: item[0])
+                    for product in outcome]
+    scraper = EbayScraper()
+    try:
+        report = scraper.build_report(products, scored=True)
+        merged = scraper.last_analyzed_products
+        analyzer = ProductAnalyzer()
+        stale = [product for product in merged
+                 if product.advanced_score != analyzer.calculate_advanced_score(product)]
+        top_consistent = all(row['advanced_score'] == analyzer.calculate_advanced_score(row)
+                             for row in report['top_selling_products'])
+    finally:
+        scraper.close()
+    return len(products) - len(merged), not stale and top_consistent
+
+def check_merge_order(backend):
+    """Kategori ve trend sorgusunda görünen ilanların skoru birleşme sırasına bağlı olmamalı"""
+    from ebay_scraper import EbayScraper
+    logging.getLogger().setLevel(logging.WARNING)
+    content = (FIXTURES_DIR / 'search_results_page1.html').read_bytes()
+    queries = ['Health & Beauty', 'trending gadgets']
+    scores = {}
+    for order in (queries, queries[::-1]):
+        pages = [(content, keyword, None) for keyword in order]
+        with ParsePipeline(workers=1, parser_backend=backend) as pipeline:
+            products = [product for _, outcome in sorted(pipeline.process_pages(pages), key=lambda item: item[0])
+                        for product in outcome]
+        # Hat modu (skorlar birleşmeden önce hesaplanmış) ve vektörel analiz yolu
+        for scored in (True, False):
+            scraper = EbayScraper()
+            try:
+                scraper.build_report([product.copy() for product in products], scored=scored)
+                scores[(tuple(order), scored)] = {product.item_id: product.advanced_score
+                                                  for product in scraper.last_analyzed_products}
+            finally:
+                scraper.close()
+    reference, *others = scores.values()
+    return all(other == reference for other in others)
+
+def run_pipeline(pages, workers, backend):
+    with ParsePipeline(workers=workers, parser_backend=backend) as pipeline:
+        # Çalışanları ısıt (süreç başlatma maliyeti ölçüme girmesin)
+        list(pipeline.process_pages(pages[:workers]))
+        start = time.perf_counter()
+        results = [None] * len(pages)
+        for index, outcome in pipeline.process_pages(pages):
+            results[index] = outcome
+        return results, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=400, help='İşlenecek sayfa sayısı')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Denenecek çalışan sayıları')
+    parser.add_argument('--backend', default='auto', help='Ayrıştırıcı arka ucu')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    pages = corpus(args.pages)
+    print(f"{len(pages)} sayfa, {os.cpu_count()} CPU çekirdeği")
+
+    start = time.perf_counter()
+    reference = run_serial(pages, args.backend)
+    serial_elapsed = time.perf_counter() - start
+    reference = [comparable(products) for products in reference]
+    print(f"{'tek süreç':>12}: {len(pages) / serial_elapsed:>8,.1f} sayfa/sn  ({serial_elapsed:.2f} sn)")
+
+    for workers in args.workers:
+        results, elapsed = run_pipeline(pages, workers, args.backend)
+        status = 'aynı' if [comparable(products) for products in results] == reference else 'FARKLI'
+        print(f"{workers:>3} çalışan: {len(pages) / elapsed:>8,.1f} sayfa/sn  ({elapsed:.2f} sn, "
+              f"hızlanma: {serial_elapsed / elapsed:.2f}x, çıktı: {status})")
+
+    duplicates, consistent = check_merged_scores(args.backend)
+    print(f"Hat modu + {duplicates} tekrar eden ilan: birleştirilen skorlar {'güncel' if consistent else 'ESKİ'}")
+    order_independent = check_merge_order(args.backend)
+    print(f"Kategori + trend terimi birleşmesi: skorlar {'sıradan bağımsız' if order_independent else 'SIRAYA BAĞLI'}")
+
+if __name__ == '__main__':
+    main()
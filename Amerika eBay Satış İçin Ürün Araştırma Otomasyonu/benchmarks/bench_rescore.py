@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Artımlı Yeniden Skorlama Benchmark'ı
+Tam analyze_products geçişini, yalnızca ağırlık değişikliği ve trend tablosu
+değişikliği sonrasındaki rescore çağrılarıyla karşılaştırır; her durumda
+sonucun sıfırdan skorlamayla bit düzeyinde aynı olduğunu doğrular. Son olarak
+aynı uzunlukta farklı bir ürün listesinin önbellek yerine yeniden
+hesaplanarak skorlandığını kontrol eder.
+
+Kullanım:
+    python benchmarks/bench_rescore.py --size 1000000
+"""
+
+import argparse
+import logging
+import time
+
+from bench_utils import iter_products
+
+from product_analyzer import ProductAnalyzer
+from product_record import Product
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    products = [Product.from_dict(product) for product in iter_products(args.size)]
+    analyzer = ProductAnalyzer()
+
+    _, full_time = timed(lambda: analyzer.analyze_products(products, sort_results=False))
+    print(f"{args.size:,} ürün, tam analiz: {full_time:.2f} sn")
+
+    def check(label, elapsed):
+        expected = ProductAnalyzer()
+        expected.score_weights = dict(analyzer.score_weights)
+        expected.trend_keywords = dict(analyzer.trend_keywords)
+        identical = expected.calculate_scores_batch(products).tolist() == [p.advanced_score for p in products]
+        print(f"  {label:<32}: {elapsed:6.3f} sn ({full_time / elapsed:6.1f}x) | aynı: {'evet' if identical else 'HAYIR'}")
+
+    # Yalnızca ağırlık değişikliği: hiçbir bileşen yeniden hesaplanmaz
+    analyzer.score_weights['sales'] = 0.30
+    analyzer.score_weights['price'] = 0.25
+    _, elapsed = timed(lambda: analyzer.rescore(products))
+    check('ağırlık değişikliği', elapsed)
+
+    # Trend tablosu değişikliği: yalnızca trend bileşeni yeniden hesaplanır
+    analyzer.trend_keywords['wireless'] = 1.3
+    _, elapsed = timed(lambda: analyzer.rescore(products))
+    check('trend tablosu değişikliği', elapsed)
+
+    # Aynı uzunlukta farklı ürünler: önbellek bu listeye ait değildir, tüm bileşenler yeniden hesaplanır
+    other = [Product.from_dict(product) for product in iter_products(args.size, seed=7)]
+    _, elapsed = timed(lambda: analyzer.rescore(other))
+    products = other
+    check('farklı liste (aynı uzunluk)', elapsed)
+
+if __name__ == '__main__':
+    main()
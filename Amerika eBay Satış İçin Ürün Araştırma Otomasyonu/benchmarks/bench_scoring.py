@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Skorlama Benchmark'ı
+Skaler calculate_advanced_score döngüsünü vektörel calculate_scores_batch ile
+10k, 100k ve 1M sentetik üründe karşılaştırır ve sonuçların bit düzeyinde
+aynı olduğunu doğrular.
+
+Kullanım:
+    python benchmarks/bench_scoring.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+
+from bench_utils import generate_products
+
+from product_analyzer import ProductAnalyzer
+from product_record import Product
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    analyzer = ProductAnalyzer()
+    for size in args.sizes:
+        products = [Product.from_dict(product) for product in generate_products(size)]
+
+        start = time.perf_counter()
+        scalar = [analyzer.calculate_advanced_score(product) for product in products]
+        scalar_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = analyzer.calculate_scores_batch(products).tolist()
+        batch_time = time.perf_counter() - start
+
+        identical = scalar == batch
+        print(f"{size:>9,} ürün: skaler {scalar_time:7.2f} sn | vektörel {batch_time:6.2f} sn | "
+              f"hızlanma {scalar_time / batch_time:5.1f}x | aynı: {'evet' if identical else 'HAYIR'}")
+
+if __name__ == '__main__':
+    main()
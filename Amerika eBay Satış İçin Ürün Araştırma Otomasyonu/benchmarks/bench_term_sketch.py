@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Trend Terim Özeti Benchmark'ı
+Kesin sözlük sayacı ile sınırlı bellekli TrendTermTracker'ı (Space-Saving)
+Zipf dağılımlı bir kelime dağarcığından üretilen başlıklar üzerinde
+karşılaştırır: ilk 10 isabeti, en büyük sayım hatası, bellek ve süre.
+
+Kullanım:
+    python benchmarks/bench_term_sketch.py --titles 200000 --capacity 2000
+"""
+
+import argparse
+import importlib
+import itertools
+import random
+import string
+import time
+import tracemalloc
+
+# bench_utils yüklenirken proje dizini sys.path'e eklenir
+importlib.import_module('bench_utils')
+
+from term_sketch import TrendTermTracker, TITLE_WORD_RE, STOP_WORDS
+
+def generate_titles(count, vocabulary_size, seed=7):
+    """Uzun kuyruklu (Zipf) kelime dağılımıyla sentetik başlıklar üret"""
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(vocabulary_size)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary_size)))
+    for _ in range(count):
+        yield ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(4, 10)))
+
+def exact_counts(titles):
+    """Karşılaştırma için sınırsız kesin sayaç (eski _extract_trending_keywords davranışı + bigram)"""
+    words, bigrams = {}, {}
+    for title in titles:
+        tokens = [word for word in TITLE_WORD_RE.findall(title.lower()) if word not in STOP_WORDS]
+        for word in tokens:
+            words[word] = words.get(word, 0) + 1
+        for first, second in zip(tokens, tokens[1:]):
+            phrase = f"{first} {second}"
+            bigrams[phrase] = bigrams.get(phrase, 0) + 1
+    return words, bigrams
+
+def measure(build):
+    """Yapıyı iki kez kur: önce süreyi, sonra tracemalloc ile en yüksek bellek kullanımını ölç"""
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+def compare(name, exact, approx_top, limit=10):
+    """İlk N isabet oranı ve en büyük sayım hatası"""
+    true_top = [item for item, _ in sorted(exact.items(), key=lambda x: x[1], reverse=True)[:limit]]
+    approx_items = [entry['keyword'] for entry in approx_top]
+    recall = len(set(true_top) & set(approx_items)) / max(1, len(true_top))
+    max_error = max((entry['frequency'] - exact.get(entry['keyword'], 0) for entry in approx_top), default=0)
+    print(f"  {name:<8} ilk {limit} isabeti: {recall:.0%} | en büyük fazla sayım: {max_error:,} "
+          f"| kesin benzersiz: {len(exact):,}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--titles', type=int, default=200_000)
+    parser.add_argument('--vocabulary', type=int, default=200_000)
+    parser.add_argument('--capacity', type=int, default=2000)
+    args = parser.parse_args()
+
+    titles = list(generate_titles(args.titles, args.vocabulary))
+    total_tokens = sum(len(title.split()) for title in titles)
+
+    (words, bigrams), exact_time, exact_mb = measure(lambda: exact_counts(titles))
+
+    def build_tracker():
+        tracker = TrendTermTracker(args.capacity)
+        for title in titles:
+            tracker.add_title(title)
+        return tracker
+
+    tracker, sketch_time, sketch_mb = measure(build_tracker)
+
+    print(f"{args.titles:,} başlık, {total_tokens:,} kelime, kapasite {args.capacity:,} "
+          f"(teorik hata sınırı: N/{args.capacity:,} = {total_tokens // args.capacity:,})")
+    print(f"  kesin sayaç : {exact_time:6.2f} sn, en yüksek bellek {exact_mb:8.1f} MB")
+    print(f"  Space-Saving: {sketch_time:6.2f} sn, en yüksek bellek {sketch_mb:8.1f} MB")
+    compare('kelime', words, tracker.top_terms())
+    compare('bigram', bigrams, tracker.top_phrases())
+
+if __name__ == '__main__':
+    main()
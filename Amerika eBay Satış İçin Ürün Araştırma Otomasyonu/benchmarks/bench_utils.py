@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark Yardımcıları
+Kayıtlı arama sayfası fixture'larını yükler ve yerel bir stub HTTP sunucusu sağlar.
+"""
+
+import sys
+import time
+import random
+import hashlib
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Üst dizindeki modülleri (ebay_scraper, product_analyzer, ...) import edebilmek için
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+def load_fixture(name='search_results_page1.html'):
+    """Kayıtlı bir arama sonuç sayfasını bytes olarak yükle"""
+    return (FIXTURES_DIR / name).read_bytes()
+
+# Sentetik ürün üretimi için kelime havuzları
+_TITLE_WORDS = ['iphone', 'case', 'wireless', 'earbuds', 'yoga', 'mat', 'led', 'strip', 'lights', 'charger',
+                'running', 'shoes', 'vintage', 'watch', 'silicone', 'baking', 'gaming', 'mouse', 'dog', 'harness',
+                'laptop', 'stand', 'ring', 'light', 'hair', 'clips', 'garden', 'hose', 'black', 'pink', 'set']
+_TITLE_PREFIXES = ['New', 'Trending', 'Hot Selling', 'Best Seller', 'Popular', 'Top Rated', 'Limited Edition', 'Premium']
+_SHIPPING = ['Free shipping', '+$4.99 shipping', 'Fast shipping', 'Express delivery', 'Standard shipping', 'N/A']
+_SELLERS = ['techdeals (1,234) 99.5% positive', 'homeplus (560) 97% positive', 'fashionhub (88) 92.3% positive',
+            'gadgetworld (10) 86% positive', 'newseller (2) 70% positive', 'N/A', '']
+_KEYWORDS = ['Clothing, Shoes & Accessories', 'Home & Garden', 'Jewelry & Watches', 'Collectibles', 'Health & Beauty',
+             'Electronics', 'Sporting Goods', 'Toys & Hobbies', 'Business & Industrial', 'Motors', 'trending',
+             'hot selling', 'best seller', 'popular', 'top rated', 'most watched', 'fast shipping', 'new arrival',
+             'limited edition']
+
+def iter_products(n, seed=42):
+    """Deterministik sentetik ürün sözlüklerini tek tek üret (scraper çıktısıyla aynı şema)"""
+    rng = random.Random(seed)
+    scraped_at = '2025-08-02T12:00:00'
+    for i in range(n):
+        title = f"{rng.choice(_TITLE_PREFIXES)} {' '.join(rng.choices(_TITLE_WORDS, k=rng.randint(2, 6)))}"
+        yield {
+            'title': title,
+            'price': round(rng.choice((rng.uniform(0, 30), rng.uniform(30, 300), rng.uniform(300, 2000))), 2),
+            'url': f"https://www.ebay.com/itm/{100000000000 + i}",
+            'seller': rng.choice(_SELLERS),
+            'shipping': rng.choice(_SHIPPING),
+            'sold_count': rng.choice((0, rng.randint(1, 50), rng.randint(50, 3000))),
+            'watchers': rng.choice((0, rng.randint(1, 30), rng.randint(30, 300))),
+            'image_url': f"https://i.ebayimg.com/images/g/{i:08d}/s-l225.webp",
+            'scraped_at': scraped_at,
+            'search_keyword': rng.choice(_KEYWORDS),
+        }
+
+def generate_products(n, seed=42):
+    """Deterministik sentetik ürün sözlükleri listesi"""
+    return list(iter_products(n, seed))
+
+class StubEbayServer:
+    """Her isteğe sabit gecikmeyle fixture sayfası döndüren yerel HTTP sunucusu (ETag destekli)"""
+
+    def __init__(self, body=None, latency=0.2):
+        self.body = body if body is not None else load_fixture()
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest() + '"'
+        self.latency = latency
+        self.request_count = 0
+        self.not_modified_count = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if stub.inject_fault(self):
+                    return
+                if self.headers.get('If-None-Match') == stub.etag:
+                    with stub._lock:
+                        stub.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header('ETag', stub.etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', stub.etag)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(stub.body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(stub.body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # İstemci zaman aşımıyla bağlantıyı bırakmış olabilir
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def inject_fault(self, handler):
+        """Alt sınıflar hata enjekte etmek için yanıtı kendisi yazıp True döndürebilir"""
+        return False
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/sch/i.html"
+
+    def start(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+class FlakyEbayServer(StubEbayServer):
+    """Sıradaki isteklere sırayla hata enjekte eden stub sunucu
+
+    faults öğeleri: ('status', kod, retry_after|None), ('slow', saniye), ('reset',), ('ok',).
+    Liste bitince tüm istekler normal yanıtlanır; repeat=True ise liste döngüsel uygulanır.
+    """
+
+    def __init__(self, faults=(), repeat=False, body=None, latency=0.0):
+        super().__init__(body=body, latency=latency)
+        self.faults = list(faults)
+        self.repeat = repeat
+        self.fault_count = 0
+        self._position = 0
+
+    def _next_fault(self):
+        with self._lock:
+            if not self.faults or (self._position >= len(self.faults) and not self.repeat):
+                return ('ok',)
+            fault = self.faults[self._position % len(self.faults)]
+            self._position += 1
+            return fault
+
+    def inject_fault(self, handler):
+        fault = self._next_fault()
+        kind = fault[0]
+        if kind == 'ok':
+            return False
+        with self._lock:
+            self.fault_count += 1
+        if kind == 'slow':
+            time.sleep(fault[1])
+            return False
+        if kind == 'reset':
+            # Yanıt göndermeden bağlantıyı kapat
+            handler.close_connection = True
+            handler.connection.shutdown(2)
+            return True
+        status, retry_after = fault[1], fault[2]
+        handler.send_response(status)
+        if retry_after is not None:
+            handler.send_header('Retry-After', str(retry_after))
+        handler.send_header('Content-Length', '0')
+        handler.end_headers()
+        return True
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Komut Satırı Seçenek Denemesi
+Ortak seçeneklerin (geçmiş deposu, kayıt/oynatma, metrikler, Parquet dizini)
+alt komuttan önce ve sonra verildiğinde aynı sonucu verdiğini, alt komut
+varsayılanlarının önceden verilen değerleri ezmediğini doğrular. Ayrıca
+`--history-db` alt komuttan önce verilerek `analyze` çalıştırılır ve
+veritabanının gerçekten oluşturulduğu kontrol edilir. pyarrow yüklüyse iki
+JSONL dosyası tek `export` ile aktarılır ve veri setindeki satır sayısı
+iki dosyanın toplamıyla karşılaştırılır.
+
+Kullanım:
+    python benchmarks/demo_cli_options.py
+"""
+
+import contextlib
+import glob
+import importlib.util
+import io
+import logging
+import os
+import tempfile
+
+from bench_utils import iter_products
+
+import ebay_scraper
+from product_record import write_jsonl
+
+# (alt komut argümanları, seçenek, değer, hedef alan)
+CASES = [
+    (['analyze', 'p.jsonl'], '--history-db', 'foo.db', 'history_db'),
+    (['analyze', 'p.jsonl'], '--prefix', 'onek', 'prefix'),
+    (['analyze', 'p.jsonl'], '--velocity-weight', '0.2', 'velocity_weight'),
+    (['analyze', 'p.jsonl'], '--metrics-prom', 'm.prom', 'metrics_prom'),
+    (['fetch'], '--record', 'a.tar.gz', 'record'),
+    (['fetch'], '--replay', 'a.tar.gz', 'replay'),
+    (['fetch'], '--concurrency', '8', 'concurrency'),
+    (['fetch'], '--profile-dir', 'prof', 'profile_dir'),
+    (['export', 'p.jsonl'], '--parquet-dir', 'pq', 'parquet_dir'),
+]
+
+def main():
+    parser = ebay_scraper.build_arg_parser()
+
+    # ebay_scraper içe aktarılırken INFO düzeyinde günlük yapılandırır
+    logging.getLogger().setLevel(logging.WARNING)
+    failures = []
+    for command, option, value, dest in CASES:
+        before = getattr(parser.parse_args([option, value] + command), dest)
+        after = getattr(parser.parse_args(command + [option, value]), dest)
+        if str(before) != str(float(value) if isinstance(before, float) else value) or before != after:
+            failures.append(f"{option} {command[0]}: önce={before!r} sonra={after!r}")
+    print(f"Seçenek konumu: {len(CASES) - len(failures)}/{len(CASES)} durum aynı")
+    for failure in failures:
+        print(f"  FARKLI: {failure}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        products = os.path.join(tmp, 'p.jsonl')
+        write_jsonl(iter_products(200), products)
+        history_db = os.path.join(tmp, 'foo.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            ebay_scraper.main(['--history-db', history_db, '--parquet-dir', '', '--prefix', os.path.join(tmp, 'r'),
+                               'analyze', products])
+        created = os.path.exists(history_db)
+    print(f"--history-db alt komuttan önce: veritabanı {'oluşturuldu' if created else 'OLUŞTURULMADI'}")
+
+    exported = True
+    if importlib.util.find_spec('pyarrow') is None:
+        print("export: pyarrow yüklü değil, atlandı")
+    else:
+        import pyarrow.parquet as pq
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs = [os.path.join(tmp, 'a.jsonl'), os.path.join(tmp, 'b.jsonl')]
+            write_jsonl(iter_products(200, seed=1), inputs[0])
+            write_jsonl(iter_products(300, seed=2), inputs[1])
+            parquet_dir = os.path.join(tmp, 'pq')
+            with contextlib.redirect_stdout(io.StringIO()):
+                ebay_scraper.main(['export', '--parquet-dir', parquet_dir] + inputs)
+            rows = sum(pq.read_metadata(path).num_rows
+                       for path in glob.glob(os.path.join(parquet_dir, '**', '*.parquet'), recursive=True))
+        exported = rows == 500
+        print(f"export a.jsonl b.jsonl: {rows} satır (beklenen 500)")
+    print(f"Sonuç: {'GEÇTİ' if not failures and created and exported else 'KALDI'}")
+
+if __name__ == '__main__':
+    main()
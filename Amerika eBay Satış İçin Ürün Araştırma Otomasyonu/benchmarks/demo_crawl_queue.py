@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Dağıtık Tarama Kuyruğu Yerel Denemesi
+Yerel stub sunucuya karşı geçici bir SQLite kuyruğu planlar, birden fazla
+çalışan süreç başlatır ve sonuçları tek raporda birleştirir. --crash ile ilk
+çalışan bir görevi kiraladıktan sonra çöker; kirası dolan görev diğer
+çalışanlarca yeniden işlenir. Planlama ikinci kez çalıştırılarak tamamlanan
+görevlerin tekrar kuyruğa girmediği de gösterilir. Son olarak kira
+süresinden uzun süren bir sayfa (Retry-After beklemesini canlandırır) iki
+çalışanla işlenir; kira yenilendiği için sayfanın yalnızca bir kez çekildiği
+ve sonucun kaybolmadığı doğrulanır.
+
+Kullanım:
+    python benchmarks/demo_crawl_queue.py --workers 3 --pages 2 --crash
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+from bench_utils import StubEbayServer
+
+from crawl_queue import CrawlQueue, CrawlWorker, CrawlCoordinator
+from ebay_scraper import EbayScraper
+
+def worker_main(db_path, lease_seconds, crash):
+    """Ayrı süreçte çalışan: kendi scraper'ı ve kuyruk bağlantısıyla"""
+    logging.getLogger().setLevel(logging.WARNING)
+    queue = CrawlQueue(db_path, lease_seconds=lease_seconds, retry_delay=0.2)
+    if crash:
+        # Görevi kirala ve sonuç yazmadan "çök"
+        task = queue.lease(f"crasher:{os.getpid()}")
+        print(f"  [çökme] {task['query']} sayfa {task['page']} kiralandı, süreç sonlanıyor")
+        os._exit(1)
+
+    scraper = EbayScraper(requests_per_second=50, burst=10)
+    try:
+        completed = CrawlWorker(queue, scraper, poll_interval=0.1).run()
+        print(f"  çalışan {os.getpid()}: {completed} görev")
+    finally:
+        scraper.close()
+        queue.close()
+
+def check_slow_task(tmp, lease_seconds=0.5):
+    """Kira süresinin katları kadar süren görev: ikinci çalışan görevi yeniden kiralamamalı"""
+    db_path = os.path.join(tmp, 'slow.sqlite3')
+    with StubEbayServer(latency=lease_seconds * 4) as server:
+        queue = CrawlQueue(db_path, lease_seconds=lease_seconds)
+        queue.enqueue([(server.base_url, 'slow query', 1, 5, 'trending')])
+        completed = []
+
+        def work(delay):
+            time.sleep(delay)
+            worker_queue = CrawlQueue(db_path, lease_seconds=lease_seconds)
+            scraper = EbayScraper(requests_per_second=50, burst=10)
+            try:
+                completed.append(CrawlWorker(worker_queue, scraper, poll_interval=0.1).run())
+            finally:
+                scraper.close()
+                worker_queue.close()
+
+        threads = [threading.Thread(target=work, args=(delay,)) for delay in (0, 0.1)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        task = queue.conn.execute("SELECT status, attempts FROM tasks").fetchone()
+        queue.close()
+    return server.request_count, sum(completed), task['status'], task['attempts']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--pages', type=int, default=2, help='Sorgu başına sayfa')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub sunucu gecikmesi (sn)')
+    parser.add_argument('--lease', type=float, default=2.0, help='Kira süresi (sn)')
+    parser.add_argument('--crash', action='store_true', help='Bir çalışanın görev ortasında çökmesini canlandır')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp, StubEbayServer(latency=args.latency) as server:
+        db_path = os.path.join(tmp, 'crawl.sqlite3')
+        queue = CrawlQueue(db_path, lease_seconds=args.lease)
+        scraper = EbayScraper()
+        coordinator = CrawlCoordinator(queue)
+
+        added = coordinator.plan(scraper.categories, scraper.trending_keywords, sites=[server.base_url], pages=args.pages)
+        again = coordinator.plan(scraper.categories, scraper.trending_keywords, sites=[server.base_url], pages=args.pages)
+        print(f"Planlanan görev: {added} (ikinci planlamada eklenen: {again})")
+
+        start = time.perf_counter()
+        if args.crash:
+            crasher = multiprocessing.Process(target=worker_main, args=(db_path, args.lease, True))
+            crasher.start()
+            crasher.join()
+
+        processes = [multiprocessing.Process(target=worker_main, args=(db_path, args.lease, False))
+                     for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        print(f"Kuyruk durumu: {queue.stats()} ({elapsed:.2f} sn, sunucu isteği: {server.request_count})")
+        results = coordinator.build_report(scraper)
+        print(f"Birleştirilmiş rapor: {results['total_products_analyzed']} ürün, "
+              f"en yüksek skor: {results['top_selling_products'][0]['advanced_score']}")
+        scraper.close()
+        queue.close()
+
+        requests, completed, status, attempts = check_slow_task(tmp)
+    print(f"Kiradan uzun görev: {requests} istek, {completed} tamamlanan, durum {status}, deneme {attempts}")
+    print(f"Sonuç: {'GEÇTİ' if (requests, completed, status, attempts) == (1, 1, 'done', 1) else 'KALDI'}")
+
+if __name__ == '__main__':
+    main()
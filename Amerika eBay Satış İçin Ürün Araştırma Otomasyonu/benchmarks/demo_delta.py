@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Delta Modu Denemesi
+Sentetik ürünlerle iki ardışık çalıştırma yapar: ikinci çalıştırmada ürünlerin
+bir kısmının satış/fiyatı değişir, bir kısmı kaybolur ve yeni ürünler eklenir.
+Değişiklik sayılarının beklenenle aynı olduğunu doğrular ve tam raporlama ile
+delta raporlamasının sürelerini karşılaştırır.
+
+Kullanım:
+    python benchmarks/demo_delta.py --size 100000 --changed 0.05 --removed 0.03 --added 0.02
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from bench_utils import iter_products
+
+from delta import DeltaTracker
+from ebay_scraper import EbayScraper
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--changed', type=float, default=0.05)
+    parser.add_argument('--removed', type=float, default=0.03)
+    parser.add_argument('--added', type=float, default=0.02)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    first_run = list(iter_products(args.size))
+    keywords = sorted({product['search_keyword'] for product in first_run})
+    changed = int(args.size * args.changed)
+    removed = int(args.size * args.removed)
+    added = int(args.size * args.added)
+
+    # İkinci çalıştırma: baştaki ürünler değişir, sondakiler kaybolur, yeni kimlikler eklenir
+    second_run = [dict(product) for product in first_run[:args.size - removed]]
+    for product in second_run[:changed]:
+        product['sold_count'] += 1
+    for i, product in enumerate(iter_products(added, seed=7)):
+        product['url'] = f"https://www.ebay.com/itm/{200000000000 + i}"
+        second_run.append(product)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, 'delta_snapshot.json')
+        scraper = EbayScraper(delta_snapshot=snapshot_path)
+        try:
+            start = time.perf_counter()
+            scraper.build_report(first_run, queried_keywords=keywords)
+            first_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            report = scraper.build_report(second_run, queried_keywords=keywords)
+            delta_time = time.perf_counter() - start
+
+            changes_path = os.path.join(tmp, 'changes.jsonl')
+            lines = DeltaTracker.write_change_log(scraper.last_delta, changes_path)
+            log_size = os.path.getsize(changes_path)
+        finally:
+            scraper.close()
+
+        full = EbayScraper()
+        try:
+            start = time.perf_counter()
+            full.build_report(second_run)
+            full_time = time.perf_counter() - start
+        finally:
+            full.close()
+
+    expected = {'new': added, 'changed': changed, 'unchanged': args.size - removed - changed, 'disappeared': removed}
+    print(f"İlk çalıştırma (anlık görüntü oluşturma): {first_time:.2f} sn")
+    print(f"Delta özeti: {report['delta']}")
+    print(f"Değişiklik günlüğü: {lines:,} satır, {log_size / 1024:.1f} KB")
+    print(f"Tam rapor: {full_time:.2f} sn | delta raporu: {delta_time:.2f} sn ({full_time / delta_time:.1f}x)")
+    print(f"Beklenen sayılar: {'GEÇTİ' if report['delta'] == expected else 'KALDI'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Kayıt / Tekrar Oynatma Denemesi
+Tam pipeline'ı önce gecikmeli ve bir kez 503 döndüren yerel stub sunucuya
+karşı kayıt modunda çalıştırır, ardından sunucu kapalıyken arşivden iki kez
+oynatır: yapay gecikmesiz (bellek hızı) ve gecikme + jitter ile. Raporların
+(zaman damgaları hariç) kayıttakiyle aynı olduğunu, oynatmanın ağa hiç
+çıkmadığını ve 503 sonrası yeniden denemenin de aynen tekrarlandığını
+doğrular.
+
+Kullanım:
+    python benchmarks/demo_record_replay.py --latency 0.05 --jitter 0.02
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from bench_utils import FlakyEbayServer
+
+from ebay_scraper import EbayScraper
+from transport import RecordingTransport, ReplayTransport
+
+def comparable(value):
+    """Çalıştırmaya özgü zaman damgalarını çıkar"""
+    if isinstance(value, dict):
+        return {key: comparable(item) for key, item in value.items()
+                if key not in ('timestamp', 'analysis_timestamp', 'scraped_at')}
+    if isinstance(value, list):
+        return [comparable(item) for item in value]
+    return value
+
+def run(transport, base_url, rps):
+    scraper = EbayScraper(requests_per_second=rps, burst=4, transport=transport)
+    scraper.base_url = base_url
+    try:
+        start = time.perf_counter()
+        report = scraper.run_market_research()
+        elapsed = time.perf_counter() - start
+        retries = sum(scraper.metrics.counters.get('fetch_retries_total', {}).values())
+    finally:
+        scraper.close()
+    return comparable(report), elapsed, retries
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server-latency', type=float, default=0.1, help='Kayıt sırasında sunucu gecikmesi (sn)')
+    parser.add_argument('--rps', type=float, default=10.0, help='Kayıt sırasında host başına istek/sn')
+    parser.add_argument('--latency', type=float, default=0.05, help='Oynatmada yapay gecikme (sn)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Oynatmada gecikme sapması (± sn)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, 'responses.tar')
+        with FlakyEbayServer([('status', 503, None)], latency=args.server_latency) as server:
+            base_url = server.base_url
+            recorder = RecordingTransport(archive)
+            recorded, record_time, record_retries = run(recorder, base_url, args.rps)
+            requests_sent = server.request_count
+        # Sunucu kapandı: bundan sonraki tüm yanıtlar arşivden gelir
+        archive_size = os.path.getsize(archive)
+
+        fast = ReplayTransport(archive)
+        replayed, replay_time, replay_retries = run(fast, base_url, args.rps)
+
+        slow = ReplayTransport(archive, latency=args.latency, jitter=args.jitter, seed=42)
+        replayed_slow, slow_time, _ = run(slow, base_url, args.rps)
+
+    print(f"Kayıt: {requests_sent} istek ({record_retries:g} yeniden deneme), {record_time:.2f} sn, "
+          f"arşiv {archive_size / 1024:.1f} KB ({recorder.compression})")
+    print(f"Oynatma (gecikmesiz): {fast.served} yanıt ({replay_retries:g} yeniden deneme), {replay_time:.3f} sn "
+          f"({record_time / replay_time:.0f}x)")
+    print(f"Oynatma (gecikme {args.latency:g} ± {args.jitter:g} sn): {slow_time:.2f} sn")
+    same = recorded == replayed == replayed_slow
+    print(f"Raporlar aynı: {'evet' if same else 'hayır'} | ıska: {fast.misses + slow.misses}")
+    passed = (same and fast.served == requests_sent and not fast.misses and not slow.misses
+              and replay_retries == record_retries > 0 and replay_time < record_time)
+    print(f"Sonuç: {'GEÇTİ' if passed else 'KALDI'}")
+
+if __name__ == '__main__':
+    main()
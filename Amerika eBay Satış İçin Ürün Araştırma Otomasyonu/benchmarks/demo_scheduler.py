@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Zamanlayıcı Servisi Yerel Denemesi
+Yerel stub sunucuya karşı kısa aralıklı iki grupla (sık trend terimleri,
+seyrek kategoriler) servisi çalıştırır. Bir süre kilidi başka bir süreç
+tutar; bu sırada gelen turlar 'skip' politikasıyla atlanır. Sonunda servise
+SIGTERM gönderilir ve temiz kapanış doğrulanır. Son olarak kilit tutulurken
+başlatılan tek seferlik `ebay_scraper.py` çalıştırmasının (cron yolu) veri
+çekmeden atlandığı, kilit boşken ise rapor kaydettiği kontrol edilir.
+
+Kullanım:
+    python benchmarks/demo_scheduler.py --duration 6
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+
+from bench_utils import StubEbayServer
+
+from scheduler_daemon import RunLock, SchedulerDaemon, default_groups
+import ebay_scraper
+from ebay_scraper import EbayScraper
+
+def hold_lock(lock_path, seconds, ready):
+    """Ayrı süreçte kilidi tut (çakışan cron çalıştırmasını canlandırır)"""
+    with RunLock(lock_path) as lock:
+        lock.acquire()
+        ready.set()
+        time.sleep(seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=6.0, help='SIGTERM gönderilmeden önceki süre (sn)')
+    parser.add_argument('--hot-interval', type=float, default=0.5)
+    parser.add_argument('--cold-interval', type=float, default=2.0)
+    parser.add_argument('--hold', type=float, default=1.5, help='Başka sürecin kilidi tuttuğu süre (sn)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp, StubEbayServer(latency=0.01) as server:
+        lock_path = os.path.join(tmp, 'ebay_scraper.lock')
+        scraper = EbayScraper(requests_per_second=100, burst=20)
+        scraper.base_url = server.base_url
+        groups = default_groups(scraper, args.hot_interval, args.cold_interval)
+        daemon = SchedulerDaemon(scraper, groups, lock_path=lock_path, overlap='skip',
+                                 filename_prefix=os.path.join(tmp, 'ebay_market_research'))
+        daemon.install_signal_handlers()
+
+        # Servis kilidi tutulurken başlar: ilk turlar atlanmalı
+        ready = multiprocessing.Event()
+        holder = multiprocessing.Process(target=hold_lock, args=(lock_path, args.hold, ready))
+        holder.start()
+        ready.wait()
+
+        threading.Timer(args.duration, os.kill, args=(os.getpid(), signal.SIGTERM)).start()
+        start = time.perf_counter()
+        try:
+            daemon.run_forever()
+        finally:
+            scraper.close()
+        stopped_after = time.perf_counter() - start
+        holder.join()
+
+        outputs = sorted(name for name in os.listdir(tmp) if name.endswith('.json'))
+        with RunLock(lock_path) as probe:
+            free_after_stop = probe.acquire()
+
+        # Cron yolu: tek seferlik çalıştırma aynı kilidi alır
+        cron_prefix = os.path.join(tmp, 'cron')
+        cron_args = ['--lock', lock_path, '--base-url', server.base_url, '--rps', '100', '--cache-dir', '',
+                     '--history-db', '', '--parquet-dir', '', '--no-snapshot', '--prefix', cron_prefix]
+        requests_before = server.request_count
+        with RunLock(lock_path) as held:
+            held.acquire()
+            ebay_scraper.main(cron_args)
+        cron_skipped = server.request_count == requests_before and not any(
+            name.startswith('cron_') for name in os.listdir(tmp))
+        ebay_scraper.main(cron_args)
+        cron_ran = any(name.startswith('cron_') and name.endswith('.json') for name in os.listdir(tmp))
+
+    for group in groups:
+        print(f"{group.name:<13}: {group.runs} çalıştırma, {group.skipped} atlama (aralık {group.interval:g} sn)")
+    print(f"Kaydedilen rapor: {len(outputs)} | sunucu isteği: {server.request_count}")
+    print(f"SIGTERM sonrası kapanış: {stopped_after - args.duration:.2f} sn")
+    print(f"Tek seferlik çalıştırma: kilit doluyken {'atlandı' if cron_skipped else 'ATLANMADI'}, "
+          f"kilit boşken {'rapor kaydetti' if cron_ran else 'RAPOR KAYDETMEDİ'}")
+
+    hot, cold = groups
+    # Rapor adları saniye çözünürlüklü olduğundan aynı saniyedeki turlar aynı dosyaya yazılır
+    saved_groups = {group.name for group in groups if any(f"_{group.name}_" in name for name in outputs)}
+    passed = (hot.skipped > 0 and hot.runs > cold.runs > 0 and saved_groups == {hot.name, cold.name}
+              and free_after_stop and daemon.stopping and cron_skipped and cron_ran)
+    print(f"Sonuç: {'GEÇTİ' if passed else 'KALDI'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+İkili Anlık Görüntü Denemesi
+Sentetik ürünlerle birden fazla çalıştırmayı hem JSON (tüm skorlanmış ürünler)
+hem de bellek eşlemeli `.snap` olarak kaydeder. Geçmiş çalıştırmaları iki
+yoldan açıp toplu içgörüleri üretir ve şunları doğrular:
+
+  - içgörüler iki yolda aynıdır (medyan fiyat kesin değerle karşılaştırılır)
+  - anlık görüntü sütunları dosya üzerinde görünümdür (kopya yok)
+  - en yüksek skorlu ürünler yalnızca seçilen satırlar çözülerek okunur
+
+Kullanım:
+    python benchmarks/demo_snapshot.py --runs 20 --size 50000
+"""
+
+import argparse
+import glob
+import json
+import logging
+import math
+import os
+import statistics
+import tempfile
+import time
+
+from bench_utils import iter_products
+
+from product_analyzer import ProductAnalyzer
+from run_snapshot import open_snapshots, snapshot_insights, write_snapshot
+
+def _close(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_close(a[key], b[key]) for key in a)
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    return a == b
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--size', type=int, default=50000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    analyzer = ProductAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(args.runs):
+            products = analyzer.analyze_products(list(iter_products(args.size, seed=run)))
+            run_id = f"run{run:04d}"
+            with open(os.path.join(tmp, f"{run_id}.json"), 'w', encoding='utf-8') as f:
+                json.dump([product.to_dict() for product in products], f, ensure_ascii=False)
+            write_snapshot(products, os.path.join(tmp, f"{run_id}.snap"), run_id=run_id)
+
+        json_bytes = sum(os.path.getsize(path) for path in glob.glob(os.path.join(tmp, '*.json')))
+        snap_bytes = sum(os.path.getsize(path) for path in glob.glob(os.path.join(tmp, '*.snap')))
+
+        begin = time.perf_counter()
+        loaded = []
+        for path in sorted(glob.glob(os.path.join(tmp, '*.json'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded.extend(json.load(f))
+        expected = analyzer.generate_insights(loaded)
+        json_time = time.perf_counter() - begin
+        exact_median = statistics.median(product['price'] for product in loaded)
+        del loaded
+
+        begin = time.perf_counter()
+        snapshots = open_snapshots(tmp)
+        actual = snapshot_insights(snapshots)
+        snap_time = time.perf_counter() - begin
+
+        zero_copy = all(snapshot.price.base is not None and not snapshot.price.flags.owndata
+                        and not snapshot.price.flags.writeable for snapshot in snapshots)
+        top = snapshots[-1].top('advanced_score', 5)
+        for snapshot in snapshots:
+            snapshot.close()
+
+    expected = {key: value for key, value in expected.items() if key not in ('top_trends', 'top_phrases')}
+    expected['price_analysis']['median_price'] = exact_median
+    same = _close(expected, actual)
+    print(f"{args.runs} çalıştırma x {args.size:,} ürün: JSON {json_bytes / 1e6:.1f} MB, .snap {snap_bytes / 1e6:.1f} MB")
+    print(f"JSON yükle + generate_insights: {json_time:.2f} sn")
+    print(f".snap aç + snapshot_insights:   {snap_time:.2f} sn ({json_time / snap_time:.0f}x)")
+    print(f"Son çalıştırmanın en yüksek skoru: {top[0]['advanced_score'] if top else '-'}")
+    print(f"İçgörüler aynı: {'evet' if same else 'hayır'}")
+    print(f"Sütunlar kopyasız: {'evet' if zero_copy else 'hayır'}")
+    print(f"Sonuç: {'GEÇTİ' if same and zero_copy and snap_time < json_time else 'KALDI'}")
+
+if __name__ == '__main__':
+    main()
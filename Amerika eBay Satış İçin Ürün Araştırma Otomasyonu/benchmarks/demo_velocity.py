@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Satış Hızı Denemesi
+Sentetik ürünleri günlük anlık görüntülerle geçmiş deposuna besler: satışları
+hızlanan yükselen ürünler, sabit hızda satanlar ve satış sayısı yüksek ama
+artık satmayan (bayat) çok satanlar. Şunları doğrular:
+
+  - hız skoru yükselen ürünleri bayat çok satanların önüne koyar
+  - artımlı durum, geçmişten baştan oluşturulan durumla aynıdır
+  - skaler ve vektörel skorlama aynı sonucu verir
+  - anlık görüntü başına güncelleme süresi geçmiş büyüdükçe artmaz
+
+Kullanım:
+    python benchmarks/demo_velocity.py --items 20000 --days 30
+"""
+
+import argparse
+import importlib
+import logging
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# bench_utils yüklenirken proje dizini sys.path'e eklenir
+importlib.import_module('bench_utils')
+
+from history_store import ProductHistoryStore
+from product_analyzer import ProductAnalyzer
+from product_record import Product
+from velocity import VelocityTracker
+
+KINDS = ('rising', 'steady', 'stale')
+
+def snapshot(items, day, start):
+    """Bir günlük anlık görüntü: her tür kendi satış eğrisini izler"""
+    scraped_at = (start + timedelta(days=day)).isoformat()
+    products = []
+    for index, (kind, base_sold) in enumerate(items):
+        if kind == 'rising':
+            sold = base_sold + day * day // 2
+            watchers = 5 + day * 2
+        elif kind == 'steady':
+            sold = base_sold + day * 5
+            watchers = 40
+        else:
+            sold = base_sold + min(day, 3) * 20  # ilk günlerden sonra satış durur
+            watchers = max(0, 60 - day * 2)
+        products.append(Product(
+            title=f"{kind} item {index}", price=20.0 + index % 50, url=f"https://www.ebay.com/itm/{300000000000 + index}",
+            seller='seller 99% positive', shipping='Free shipping', sold_count=sold, watchers=watchers,
+            scraped_at=scraped_at, search_keyword='trending'
+        ))
+    return products
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--days', type=int, default=30)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    rng = random.Random(42)
+    items = [(KINDS[index % 3], 2000 if index % 3 == 2 else rng.randint(0, 50)) for index in range(args.items)]
+    start = datetime(2025, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProductHistoryStore(os.path.join(tmp, 'history.sqlite3'))
+        tracker = VelocityTracker(store)
+        update_times = []
+        for day in range(args.days):
+            products = snapshot(items, day, start)
+            begin = time.perf_counter()
+            tracker.update(products)
+            update_times.append(time.perf_counter() - begin)
+            store.upsert_products(products, run_id=products[0].scraped_at)
+
+        incremental = {item_id: state.row() for item_id, state in tracker.states.items()}
+        rebuilt = VelocityTracker(store)
+        rebuilt.rebuild()
+        rebuilt_rows = {row[0]: tuple(row) for row in
+                        store.conn.execute("SELECT * FROM velocity")}
+        same_state = incremental == rebuilt_rows
+
+        analyzer = ProductAnalyzer()
+        analyzer.velocity_tracker = tracker
+        analyzer.set_component_weight('velocity', 0.2)
+        last = snapshot(items, args.days - 1, start)
+        vector = analyzer.calculate_scores_batch(last).tolist()
+        scalar = [analyzer.calculate_advanced_score(product) for product in last]
+        velocity_scores = analyzer.compute_components(last).arrays['velocity']
+        store.close()
+
+    mean = {kind: float(velocity_scores[[i for i, (k, _) in enumerate(items) if k == kind]].mean()) for kind in KINDS}
+    early = sum(update_times[1:4]) / 3
+    late = sum(update_times[-3:]) / 3
+    print("Ortalama hız skoru: " + ", ".join(f"{kind} {score:.1f}" for kind, score in mean.items()))
+    print(f"Anlık görüntü başına güncelleme: ilk günler {early * 1000:.1f} ms, son günler {late * 1000:.1f} ms "
+          f"({args.items:,} ürün, {args.days} gün)")
+    print(f"Artımlı durum = baştan oluşturma: {'evet' if same_state else 'hayır'}")
+    print(f"Skaler = vektörel skor: {'evet' if scalar == vector else 'hayır'}")
+    passed = (mean['rising'] > mean['steady'] > mean['stale'] and same_state and scalar == vector
+              and late < early * 2)
+    print(f"Sonuç: {'GEÇTİ' if passed else 'KALDI'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Hata Enjeksiyonu Senaryoları
+FetchEngine'in dayanıklılık katmanını yerel, kararsız (flaky) bir stub sunucuya
+karşı çalıştırır: Retry-After'lı 429 (geri çekilme üst sınırından uzun
+olsa da sunucunun süresine uyulur; bütçeyi aşarsa beklenmeden devre açılır), art arda 503, okuma zaman aşımı, bağlantı
+kopması, kalıcı 500 ile devre kesici ve yavaş yanıtlarda eşzamanlılığın
+düşürülmesi. Her senaryo GEÇTİ/KALDI olarak raporlanır.
+
+Kullanım:
+    python benchmarks/fault_injection.py
+"""
+
+import logging
+import sys
+import time
+
+import requests
+
+from bench_utils import FlakyEbayServer
+
+from fetch_engine import FetchEngine
+from resilience import RetryPolicy, CircuitOpenError, RetryableStatusError
+
+def make_engine(**kwargs):
+    options = dict(max_concurrency=4, requests_per_second=100, burst=10, timeout=(1.0, 1.0),
+                   retry_policy=RetryPolicy(max_attempts=4, base_delay=0.05, max_delay=2.0))
+    options.update(kwargs)
+    return FetchEngine(requests.Session(), **options)
+
+def scenario_retry_after():
+    """429 + Retry-After: 1 -> en az 1 sn beklenip başarıyla tamamlanır"""
+    with FlakyEbayServer([('status', 429, 1)]) as server:
+        engine = make_engine()
+        start = time.monotonic()
+        content = engine.fetch(server.base_url)
+        elapsed = time.monotonic() - start
+        engine.close()
+        return content == server.body and server.request_count == 2 and elapsed >= 1.0
+
+def scenario_retry_after_above_max_delay():
+    """429 + Retry-After: 3 (max_delay 2 sn) -> sunucunun istediği 3 sn beklenir"""
+    with FlakyEbayServer([('status', 429, 3)]) as server:
+        engine = make_engine()
+        start = time.monotonic()
+        content = engine.fetch(server.base_url)
+        elapsed = time.monotonic() - start
+        engine.close()
+        return content == server.body and server.request_count == 2 and elapsed >= 3.0
+
+def scenario_retry_after_over_budget():
+    """429 + Retry-After: 120 (bütçe 10 sn) -> beklemeden hata, devre açık, sonraki istek sunucuya gitmez"""
+    with FlakyEbayServer([('status', 429, 120)], repeat=True) as server:
+        engine = make_engine(retry_policy=RetryPolicy(max_attempts=4, base_delay=0.05, max_delay=2.0,
+                                                      max_retry_after=10.0))
+        start = time.monotonic()
+        try:
+            engine.fetch(server.base_url)
+            return False
+        except RetryableStatusError as e:
+            failed_fast = time.monotonic() - start < 1.0 and e.retry_after >= 119
+        try:
+            engine.fetch(server.base_url)
+            return False
+        except CircuitOpenError:
+            pass
+        engine.close()
+        return failed_fast and server.request_count == 1
+
+def scenario_repeated_503():
+    """İki kez 503 sonrası başarı"""
+    with FlakyEbayServer([('status', 503, None), ('status', 503, None)]) as server:
+        engine = make_engine()
+        content = engine.fetch(server.base_url)
+        engine.close()
+        return content == server.body and server.request_count == 3
+
+def scenario_read_timeout():
+    """Yavaş yanıt okuma zaman aşımına düşer, yeniden deneme başarılı olur"""
+    with FlakyEbayServer([('slow', 2.0)]) as server:
+        engine = make_engine()
+        start = time.monotonic()
+        content = engine.fetch(server.base_url)
+        elapsed = time.monotonic() - start
+        engine.close()
+        return content == server.body and elapsed < 2.0
+
+def scenario_connection_reset():
+    """Yanıtsız kapanan bağlantı yeniden denenir"""
+    with FlakyEbayServer([('reset',)]) as server:
+        engine = make_engine()
+        content = engine.fetch(server.base_url)
+        engine.close()
+        return content == server.body and server.request_count == 2
+
+def scenario_circuit_breaker():
+    """Kalıcı 500: deneme hakkı biter, devre açılır ve sonraki istek sunucuya gitmez"""
+    with FlakyEbayServer([('status', 500, None)], repeat=True) as server:
+        engine = make_engine(breaker_threshold=4, breaker_reset=60)
+        try:
+            engine.fetch(server.base_url)
+            return False
+        except RetryableStatusError:
+            pass
+        requests_before = server.request_count
+        try:
+            engine.fetch(server.base_url)
+            return False
+        except CircuitOpenError:
+            pass
+        engine.close()
+        return requests_before == 4 and server.request_count == requests_before
+
+def scenario_circuit_recovery():
+    """Devre bekleme süresinden sonra tek deneme isteğiyle kapanır"""
+    with FlakyEbayServer([('status', 500, None)] * 2) as server:
+        engine = make_engine(breaker_threshold=2, breaker_reset=0.5,
+                             retry_policy=RetryPolicy(max_attempts=2, base_delay=0.01))
+        try:
+            engine.fetch(server.base_url)
+        except RetryableStatusError:
+            pass
+        time.sleep(0.6)
+        content = engine.fetch(server.base_url)
+        breaker = engine._breaker_for(server.base_url)
+        engine.close()
+        return content == server.body and breaker.state == breaker.CLOSED
+
+def scenario_adaptive_concurrency():
+    """Hedefin üzerindeki gecikmeler eşzamanlılık sınırını düşürür"""
+    with FlakyEbayServer(latency=0.3) as server:
+        engine = make_engine(max_concurrency=8, latency_target=0.1)
+        engine.run([(server.base_url, {'q': str(i)}) for i in range(16)])
+        limit = engine._limiter_for(server.base_url).limit
+        engine.close()
+        return limit < 8
+
+SCENARIOS = [
+    scenario_retry_after,
+    scenario_retry_after_above_max_delay,
+    scenario_retry_after_over_budget,
+    scenario_repeated_503,
+    scenario_read_timeout,
+    scenario_connection_reset,
+    scenario_circuit_breaker,
+    scenario_circuit_recovery,
+    scenario_adaptive_concurrency,
+]
+
+def main():
+    logging.getLogger().setLevel(logging.ERROR)
+    failed = 0
+    for scenario in SCENARIOS:
+        try:
+            passed = scenario()
+        except Exception as e:
+            passed = False
+            print(f"    hata: {type(e).__name__}: {e}")
+        failed += not passed
+        print(f"{'GEÇTİ' if passed else 'KALDI':>6}  {scenario.__doc__}")
+    print(f"\n{len(SCENARIOS) - failed}/{len(SCENARIOS)} senaryo geçti")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+İçe Aktarma Süresi Bütçesi
+Her senaryoyu ayrı bir yorumlayıcıda `python -X importtime` ile çalıştırır,
+proje modüllerinin kümülatif yükleme süresini (birkaç denemenin medyanı)
+bütçeyle karşılaştırır ve ağır bağımlılıkların (pandas, numpy, requests,
+pyarrow) gerekmeyen kod yollarında yüklenmediğini doğrular. Gerilemede
+çıkış kodu 1'dir; CI'da veya kısa görevlerden önce çalıştırılabilir.
+
+Kullanım:
+    python benchmarks/import_budget.py --budget-ms 150 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('pandas', 'numpy', 'requests', 'pyarrow')
+
+# (ad, çalıştırılacak kod, ölçülen kök modül, yüklenmemesi gereken modüller)
+SCENARIOS = [
+    ('import ebay_scraper', 'import ebay_scraper', 'ebay_scraper', HEAVY_MODULES),
+    ('report komutu', 'import ebay_scraper; ebay_scraper.build_arg_parser().parse_args(["report", "x.json"])',
+     'ebay_scraper', HEAVY_MODULES),
+    ('EbayScraper() (fetch yolu)', 'import ebay_scraper; ebay_scraper.EbayScraper().close()',
+     'ebay_scraper', ('pandas', 'numpy', 'pyarrow')),
+    ('import scheduler_daemon', 'import scheduler_daemon', 'scheduler_daemon', HEAVY_MODULES),
+    ('import crawl_queue', 'import crawl_queue', 'crawl_queue', HEAVY_MODULES),
+]
+
+def measure(code, root):
+    """Kök modülün kümülatif içe aktarma süresi (ms) ve yüklenen tüm modüller"""
+    probe = f"{code}\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe], cwd=PROJECT_DIR,
+                            capture_output=True, text=True, check=True)
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        # Biçim: "import time: <kendi µs> | <kümülatif µs> | <girintili modül adı>"
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.strip() == root and cumulative.strip().isdigit():
+            cumulative_us = int(cumulative)
+    loaded = set(result.stdout.split())
+    return (cumulative_us or 0) / 1000, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=150.0, help='Senaryo başına içe aktarma bütçesi (ms)')
+    parser.add_argument('--repeat', type=int, default=5, help='Deneme sayısı (medyan alınır)')
+    args = parser.parse_args()
+
+    failures = 0
+    for name, code, root, forbidden in SCENARIOS:
+        timings = []
+        loaded = set()
+        for _ in range(args.repeat):
+            elapsed, loaded = measure(code, root)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        heavy = sorted(module for module in forbidden if module in loaded)
+        ok = median <= args.budget_ms and not heavy
+        failures += not ok
+        note = f" | yüklenmemeliydi: {', '.join(heavy)}" if heavy else ''
+        print(f"{name:<28}: {median:7.1f} ms (bütçe {args.budget_ms:g} ms){note} | {'GEÇTİ' if ok else 'KALDI'}")
+
+    print(f"Sonuç: {'GEÇTİ' if not failures else f'KALDI ({failures} senaryo)'}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Tekrarlanabilir Benchmark Takımı
+Kayıtlı arama sayfası fixture'ları ve 1M ürüne kadar ölçeklenen sentetik ürün
+üreticisi üzerinde şu ölçümleri yapar:
+
+  e2e       run_market_research, fixture sayfalarını sunan yerel sunucuya karşı ve
+            aynı yanıtların kayıt arşivinden ağsız oynatılmasıyla
+  parse     extract_product_data (bs4, öğe başına) ve arka uç başına sayfa ayrıştırma
+  analyze   analyze_products ve generate_insights ölçeklenmesi
+  io        save_results (JSON/CSV/.snap ve pyarrow kuruluysa Parquet) ve .snap
+            anlık görüntüsünden içgörü üretimi
+
+Her çalıştırmanın sonucu ortam bilgisiyle birlikte benchmarks/results/
+altına JSON olarak kaydedilir; --compare iki sonucu karşılaştırır ve eşiği
+aşan gerilemelerde 1 çıkış koduyla biter.
+
+Kullanım:
+    python benchmarks/suite.py                         # varsayılan boyutlar (10k, 100k)
+    python benchmarks/suite.py --full                  # 1M ürün dahil
+    python benchmarks/suite.py --only analyze io --sizes 50000
+    python benchmarks/suite.py --compare-last          # çalıştır ve son kayıtla karşılaştır
+    python benchmarks/suite.py --compare A.json B.json # yalnızca iki kaydı karşılaştır
+"""
+
+import argparse
+import gc
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import FIXTURES_DIR, PROJECT_DIR, StubEbayServer, iter_products
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+DEFAULT_SIZES = (10_000, 100_000)
+FULL_SIZES = (10_000, 100_000, 1_000_000)
+
+# (ad, grup, fonksiyon, boyuta bağlı mı)
+BENCHMARKS = []
+
+def benchmark(name, group, sized=False):
+    """Benchmark kaydı: fonksiyon (boyut) -> (hazırlık sonrası çağrılacak ölçüm, işlenen öğe sayısı) döndürür"""
+    def register(func):
+        BENCHMARKS.append((name, group, func, sized))
+        return func
+    return register
+
+def _products(size):
+    from product_record import Product
+    return [Product.from_dict(product) for product in iter_products(size)]
+
+# Uçtan uca
+
+@benchmark('e2e.run_market_research', 'e2e')
+def bench_run_market_research(size=None):
+    from ebay_scraper import EbayScraper
+    server = StubEbayServer(latency=0.0).__enter__()
+    scraper = EbayScraper(requests_per_second=1000, burst=100)
+    scraper.base_url = server.base_url
+    queries = len(scraper.categories) + len(scraper.trending_keywords)
+
+    def run():
+        return scraper.run_market_research()
+
+    def teardown():
+        scraper.close()
+        server.__exit__(None, None, None)
+
+    return run, queries, teardown
+
+@benchmark('e2e.run_market_research[replay]', 'e2e')
+def bench_run_market_research_replay(size=None):
+    from ebay_scraper import EbayScraper
+    from transport import RecordingTransport, ReplayTransport
+    tmp = tempfile.TemporaryDirectory()
+    archive = os.path.join(tmp.name, 'responses.tar')
+    # Arşiv bir kez kaydedilir; ölçülen çalıştırmalar ağa çıkmaz
+    with StubEbayServer(latency=0.0) as server:
+        recorder = EbayScraper(requests_per_second=1000, burst=100, transport=RecordingTransport(archive))
+        recorder.base_url = server.base_url
+        recorder.run_market_research()
+        recorder.close()
+    transport = ReplayTransport(archive)
+    scraper = EbayScraper(transport=transport)
+    scraper.base_url = recorder.base_url
+    queries = len(scraper.categories) + len(scraper.trending_keywords)
+
+    def run():
+        transport.rewind()
+        return scraper.run_market_research()
+
+    def teardown():
+        scraper.close()
+        tmp.cleanup()
+
+    return run, queries, teardown
+
+# Ayrıştırma
+
+@benchmark('parse.extract_product_data', 'parse')
+def bench_extract_product_data(size=None):
+    from ebay_scraper import EbayScraper
+    from product_parser import BeautifulSoupBackend
+    scraper = EbayScraper()
+    backend = BeautifulSoupBackend()
+    items = [item for path in sorted(FIXTURES_DIR.glob('*.html')) for item in backend.iter_items(path.read_bytes())]
+
+    def run():
+        return [scraper.extract_product_data(item) for item in items]
+
+    return run, len(items), scraper.close
+
+def _parse_benchmark(backend_name):
+    def factory(size=None):
+        from product_parser import PARSER_BACKENDS
+        backend = PARSER_BACKENDS[backend_name]()
+        pages = [path.read_bytes() for path in sorted(FIXTURES_DIR.glob('*.html'))]
+        items = sum(len(backend.parse(page)) for page in pages)
+
+        def run():
+            return [backend.parse(page) for page in pages]
+
+        return run, items, None
+    return factory
+
+for _backend_name in ('selectolax', 'lxml', 'bs4'):
+    benchmark(f"parse.page[{_backend_name}]", 'parse')(_parse_benchmark(_backend_name))
+
+# Analiz
+
+@benchmark('analyze.analyze_products', 'analyze', sized=True)
+def bench_analyze_products(size):
+    from product_analyzer import ProductAnalyzer
+    analyzer = ProductAnalyzer()
+    products = _products(size)
+
+    def run():
+        return analyzer.analyze_products(products, sort_results=False)
+
+    return run, size, None
+
+@benchmark('analyze.generate_insights', 'analyze', sized=True)
+def bench_generate_insights(size):
+    from product_analyzer import ProductAnalyzer
+    analyzer = ProductAnalyzer()
+    products = analyzer.analyze_products(_products(size), sort_results=False)
+
+    def run():
+        return analyzer.generate_insights(products)
+
+    return run, size, None
+
+# G/Ç
+
+@benchmark('io.save_results', 'io', sized=True)
+def bench_save_results(size):
+    from ebay_scraper import EbayScraper
+    scraper = EbayScraper()
+    results = scraper.build_report(_products(size), dedup=False)
+    tmp = tempfile.TemporaryDirectory()
+    # pyarrow yoksa Parquet dışa aktarımı ölçüme girmez
+    parquet_dir = os.path.join(tmp.name, 'parquet') if importlib.util.find_spec('pyarrow') is not None else None
+    counter = iter(range(1_000_000))
+
+    def run():
+        # Her tekrar ayrı önek kullanır (saniye çözünürlüklü adlar çakışmasın)
+        prefix = os.path.join(tmp.name, f"run{next(counter)}")
+        return scraper.save_results(results, filename_prefix=prefix, parquet_dir=parquet_dir)
+
+    def teardown():
+        scraper.close()
+        tmp.cleanup()
+
+    return run, size, teardown
+
+@benchmark('io.snapshot_insights', 'io', sized=True)
+def bench_snapshot_insights(size):
+    from product_analyzer import ProductAnalyzer
+    from run_snapshot import open_snapshots, snapshot_insights, write_snapshot
+    tmp = tempfile.TemporaryDirectory()
+    write_snapshot(ProductAnalyzer().analyze_products(_products(size)), os.path.join(tmp.name, 'run.snap'))
+
+    def run():
+        # Ölçüm dosyayı açmayı da kapsar (bellek eşlemesi + başlık)
+        return snapshot_insights(open_snapshots(tmp.name))
+
+    return run, size, tmp.cleanup
+
+# Çalıştırma
+
+def measure(func, size, repeat):
+    """Hazırlık bir kez yapılır; ölçüm repeat kez tekrarlanır (her tekrar öncesi GC)"""
+    run, items, teardown = func(size) if size is not None else func()
+    timings = []
+    try:
+        run()  # ısınma (önbellekler, tembel içe aktarmalar)
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    finally:
+        if teardown is not None:
+            teardown()
+    best = min(timings)
+    return {
+        'items': items,
+        'repeat': repeat,
+        'min': best,
+        'median': statistics.median(timings),
+        'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'items_per_second': items / best if best > 0 else None,
+    }
+
+def _git_revision():
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PROJECT_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return revision + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def environment():
+    """Sonuçların karşılaştırılabilirliği için ortam bilgisi"""
+    versions = {}
+    for module in ('numpy', 'pandas', 'pyarrow', 'selectolax', 'lxml', 'bs4', 'requests'):
+        try:
+            versions[module] = getattr(__import__(module), '__version__', 'installed')
+        except ImportError:
+            versions[module] = None
+    return {
+        'git': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': versions,
+    }
+
+def run_suite(groups, sizes, repeat):
+    results = {}
+    for name, group, func, sized in BENCHMARKS:
+        if groups and group not in groups:
+            continue
+        for size in (sizes if sized else (None,)):
+            key = f"{name}[{size}]" if size is not None else name
+            try:
+                result = measure(func, size, repeat)
+            except ImportError as e:
+                print(f"{key:<40} atlandı ({e})")
+                continue
+            results[key] = result
+            rate = f"{result['items_per_second']:>14,.0f} öğe/sn" if result['items_per_second'] else ''
+            print(f"{key:<40} min {result['min']:9.4f} sn | medyan {result['median']:9.4f} sn | {rate}")
+    return results
+
+def save(results, sizes, repeat):
+    RESULTS_DIR.mkdir(exist_ok=True)
+    env = environment()
+    record = {
+        'timestamp': datetime.now().isoformat(),
+        'environment': env,
+        'sizes': list(sizes),
+        'repeat': repeat,
+        'results': results,
+    }
+    path = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{env['git']}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    return path
+
+def compare(base_path, new_path, threshold):
+    """İki kaydı karşılaştır; eşikten (oran) fazla yavaşlayan benchmark sayısını döndür"""
+    with open(base_path, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    print(f"\nKarşılaştırma: {Path(base_path).name} ({base['environment']['git']}) -> "
+          f"{Path(new_path).name} ({new['environment']['git']})")
+    if base['environment'].get('cpu_count') != new['environment'].get('cpu_count'):
+        print("  Uyarı: farklı makinelerde ölçülmüş olabilir (CPU sayısı farklı)")
+
+    regressions = 0
+    for key in sorted(set(base['results']) | set(new['results'])):
+        if key not in base['results'] or key not in new['results']:
+            print(f"  {key:<40} yalnızca {'yeni' if key in new['results'] else 'eski'} kayıtta")
+            continue
+        before = base['results'][key]['min']
+        after = new['results'][key]['min']
+        ratio = after / before if before else float('inf')
+        if ratio > 1 + threshold:
+            status = 'GERİLEME'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            status = 'iyileşme'
+        else:
+            status = 'aynı'
+        print(f"  {key:<40} {before:9.4f} -> {after:9.4f} sn ({ratio:5.2f}x) {status}")
+    print(f"Sonuç: {'GEÇTİ' if not regressions else f'KALDI ({regressions} gerileme)'}")
+    return regressions
+
+def latest_result(exclude=None):
+    paths = sorted(path for path in RESULTS_DIR.glob('*.json') if path != exclude) if RESULTS_DIR.exists() else []
+    return paths[-1] if paths else None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=sorted({group for _, group, _, _ in BENCHMARKS}),
+                        help='Yalnızca bu gruplar')
+    parser.add_argument('--sizes', type=int, nargs='+', default=None, help='Sentetik ürün sayıları')
+    parser.add_argument('--full', action='store_true', help='1M ürün dahil tüm boyutlar')
+    parser.add_argument('--repeat', type=int, default=3, help='Ölçüm tekrarı (en iyi süre karşılaştırılır)')
+    parser.add_argument('--compare', nargs='+', metavar='JSON',
+                        help='Tek dosya: bu çalıştırmayı onunla karşılaştır; iki dosya: yalnızca karşılaştır')
+    parser.add_argument('--compare-last', action='store_true', help='Bu çalıştırmayı son kayıtla karşılaştır')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Gerileme eşiği (0.10 = %%10 yavaşlama)')
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        sys.exit(1 if compare(args.compare[0], args.compare[1], args.threshold) else 0)
+
+    # ebay_scraper içe aktarılırken logging.basicConfig çalışır; seviye ondan sonra düşürülür
+    importlib.import_module('ebay_scraper')
+    logging.getLogger().setLevel(logging.WARNING)
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    baseline = args.compare[0] if args.compare else (latest_result() if args.compare_last else None)
+
+    results = run_suite(set(args.only or ()), sizes, args.repeat)
+    path = save(results, sizes, args.repeat)
+    print(f"Sonuçlar kaydedildi: {path}")
+
+    if baseline is not None:
+        sys.exit(1 if compare(baseline, path, args.threshold) else 0)
+    if args.compare_last:
+        print("Karşılaştırılacak önceki kayıt yok")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Dağıtık Tarama Kuyruğu
+Bu modül (site, sorgu, sayfa) görevlerini paylaşılan bir SQLite kuyruğunda
+tutar. Birden fazla çalışan süreç (veya paylaşılan diske erişen host)
+görevleri kiralar (lease), sonuçları yazar; çalışan görev sürerken kirayı
+arka planda yeniler (Retry-After beklemeleri kira süresini aşabilir), çöken
+çalışanların süresi dolan kiraları yeniden dağıtılır, başarısız görevler gecikmeli olarak yeniden denenir ve tamamlanan
+görevler tekrar işlenmez. Sonuçlar tek bir run_market_research raporunda
+birleştirilir.
+
+Kullanım:
+    python crawl_queue.py plan --db crawl.sqlite3 --pages 2
+    python crawl_queue.py work --db crawl.sqlite3        (her süreç/host için)
+    python crawl_queue.py report --db crawl.sqlite3
+"""
+
+import os
+import json
+import time
+import zlib
+import socket
+import sqlite3
+import logging
+import argparse
+import threading
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from product_record import PRODUCT_FIELDS, Product
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id        TEXT PRIMARY KEY,
+    site           TEXT NOT NULL,
+    query          TEXT NOT NULL,
+    page           INTEGER NOT NULL,
+    item_limit     INTEGER NOT NULL,
+    kind           TEXT NOT NULL,
+    status         TEXT NOT NULL DEFAULT 'pending',
+    attempts       INTEGER NOT NULL DEFAULT 0,
+    available_at   REAL NOT NULL DEFAULT 0,
+    lease_owner    TEXT,
+    lease_expires  REAL,
+    last_error     TEXT,
+    updated_at     REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, available_at);
+
+CREATE TABLE IF NOT EXISTS results (
+    task_id      TEXT PRIMARY KEY,
+    worker       TEXT NOT NULL,
+    finished_at  REAL NOT NULL,
+    item_count   INTEGER NOT NULL,
+    payload      BLOB NOT NULL
+);
+"""
+
+def make_task_id(site: str, query: str, page: int) -> str:
+    """Görev kimliği: aynı (site, sorgu, sayfa) yalnızca bir kez kuyruğa girer"""
+    return f"{site}|{query}|{page}"
+
+def encode_products(products: Iterable[Product]) -> bytes:
+    """Ürünleri PRODUCT_FIELDS sırasındaki satırlar olarak sıkıştırılmış JSON'a çevir"""
+    rows = [[getattr(product, field) for field in PRODUCT_FIELDS] for product in products]
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def decode_products(payload: bytes) -> List[Product]:
+    return [Product(*row) for row in json.loads(zlib.decompress(payload))]
+
+class CrawlQueue:
+    """SQLite tabanlı, kiralamalı ve yeniden denemeli görev kuyruğu"""
+
+    def __init__(self, db_path: str = 'crawl_queue.sqlite3', lease_seconds: float = 60,
+                 max_attempts: int = 3, retry_delay: float = 5.0):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # Otomatik işlem yok; kiralama BEGIN IMMEDIATE ile süreçler arası atomik yapılır
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _transaction(self):
+        return _ImmediateTransaction(self.conn)
+
+    def enqueue(self, tasks: Iterable[Tuple[str, str, int, int, str]]) -> int:
+        """(site, sorgu, sayfa, limit, tür) görevlerini ekle; var olanlar atlanır"""
+        now = time.time()
+        rows = [(make_task_id(site, query, page), site, query, page, item_limit, kind, now)
+                for site, query, page, item_limit, kind in tasks]
+        with self._transaction():
+            before = self.conn.total_changes
+            self.conn.executemany("""
+                INSERT OR IGNORE INTO tasks (task_id, site, query, page, item_limit, kind, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            added = self.conn.total_changes - before
+        logger.info(f"Kuyruğa {added} yeni görev eklendi ({len(rows) - added} tanesi zaten vardı)")
+        return added
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Bekleyen (veya kirası dolmuş) bir görevi kirala; yoksa None"""
+        now = time.time()
+        with self._transaction():
+            while True:
+                row = self.conn.execute("""
+                    SELECT * FROM tasks
+                    WHERE (status = 'pending' AND available_at <= :now)
+                       OR (status = 'leased' AND lease_expires < :now)
+                    ORDER BY available_at, rowid
+                    LIMIT 1
+                """, {'now': now}).fetchone()
+                if row is None:
+                    return None
+                if row['status'] != 'leased':
+                    break
+
+                # Kirası dolan görev: çalışan çökmüş veya takılmış olabilir
+                logger.warning(f"Kirası dolan görev yeniden dağıtılıyor: {row['task_id']} ({row['lease_owner']})")
+                if row['attempts'] < self.max_attempts:
+                    break
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'failed', last_error = 'kira süresi doldu', "
+                    "lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE task_id = ?",
+                    (now, row['task_id'])
+                )
+
+            self.conn.execute("""
+                UPDATE tasks
+                SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ?
+                WHERE task_id = ?
+            """, (worker_id, now + self.lease_seconds, now, row['task_id']))
+
+        task = dict(row)
+        task['attempts'] += 1
+        return task
+
+    def extend_lease(self, task_id: str, worker_id: str) -> bool:
+        """Uzun süren görevin kirasını uzat"""
+        now = time.time()
+        with self._transaction():
+            cursor = self.conn.execute("""
+                UPDATE tasks SET lease_expires = ?, updated_at = ?
+                WHERE task_id = ? AND status = 'leased' AND lease_owner = ?
+            """, (now + self.lease_seconds, now, task_id, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, task_id: str, worker_id: str, products: List[Product]) -> bool:
+        """Görev sonucunu yaz; görev başka bir çalışana geçtiyse sonuç yok sayılır"""
+        now = time.time()
+        payload = encode_products(products)
+        with self._transaction():
+            cursor = self.conn.execute("""
+                UPDATE tasks SET status = 'done', lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE task_id = ? AND status = 'leased' AND lease_owner = ?
+            """, (now, task_id, worker_id))
+            if cursor.rowcount != 1:
+                logger.warning(f"Görev kirası kaybedildi, sonuç atlandı: {task_id}")
+                return False
+            self.conn.execute("""
+                INSERT OR IGNORE INTO results (task_id, worker, finished_at, item_count, payload)
+                VALUES (?, ?, ?, ?, ?)
+            """, (task_id, worker_id, now, len(products), payload))
+        return True
+
+    def fail(self, task_id: str, worker_id: str, error: str):
+        """Görevi üstel gecikmeyle yeniden denemeye al veya deneme hakkı bittiyse başarısız işaretle"""
+        now = time.time()
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT attempts FROM tasks WHERE task_id = ? AND status = 'leased' AND lease_owner = ?",
+                (task_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return
+            if row['attempts'] >= self.max_attempts:
+                status, available_at = 'failed', now
+            else:
+                status, available_at = 'pending', now + self.retry_delay * 2 ** (row['attempts'] - 1)
+            self.conn.execute("""
+                UPDATE tasks
+                SET status = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL,
+                    last_error = ?, updated_at = ?
+                WHERE task_id = ?
+            """, (status, available_at, str(error)[:500], now, task_id))
+        logger.warning(f"Görev hatası ({task_id}, deneme {row['attempts']}): {error} -> {status}")
+
+    def stats(self) -> Dict[str, int]:
+        """Duruma göre görev sayıları"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        for row in self.conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status"):
+            counts[row['status']] = row['n']
+        return counts
+
+    def is_drained(self) -> bool:
+        """İşlenecek veya işlenmekte olan görev kalmadı mı"""
+        stats = self.stats()
+        return stats['pending'] == 0 and stats['leased'] == 0
+
+    def iter_results(self) -> Iterator[Tuple[Dict[str, Any], List[Product]]]:
+        """Tamamlanan görevleri ve ürünlerini görev ekleme sırasıyla üret"""
+        cursor = self.conn.execute("""
+            SELECT t.task_id, t.site, t.query, t.page, t.kind, r.worker, r.payload
+            FROM tasks AS t JOIN results AS r ON r.task_id = t.task_id
+            ORDER BY t.rowid
+        """)
+        for row in cursor:
+            task = {key: row[key] for key in ('task_id', 'site', 'query', 'page', 'kind', 'worker')}
+            yield task, decode_products(row['payload'])
+
+class _ImmediateTransaction:
+    """Yazma kilidini baştan alan işlem bağlamı (süreçler arası yarışları önler)"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+class LeaseHeartbeat:
+    """Görev işlenirken kirayı arka plan iş parçacığında düzenli olarak uzatır
+    
+    SQLite bağlantıları iş parçacıkları arasında paylaşılmadığından yenileme
+    kendi bağlantısıyla yapılır. Kira başka çalışana geçtiyse yenileme durur.
+    """
+
+    def __init__(self, queue: CrawlQueue, task_id: str, worker_id: str, interval: Optional[float] = None):
+        self.queue = queue
+        self.task_id = task_id
+        self.worker_id = worker_id
+        # Kira dolmadan önce en az iki yenileme şansı
+        self.interval = interval if interval is not None else queue.lease_seconds / 3
+        self.renewals = 0
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-heartbeat:{task_id}", daemon=True)
+
+    def _run(self):
+        queue = CrawlQueue(self.queue.db_path, lease_seconds=self.queue.lease_seconds)
+        try:
+            while not self._stop.wait(self.interval):
+                if not queue.extend_lease(self.task_id, self.worker_id):
+                    self.lost = True
+                    logger.warning(f"Görev kirası yenilenemedi: {self.task_id}")
+                    return
+                self.renewals += 1
+        except sqlite3.Error as e:
+            logger.warning(f"Görev kirası yenileme hatası ({self.task_id}): {e}")
+        finally:
+            queue.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+class CrawlWorker:
+    """Kuyruktan görev kiralayıp çeken, ayrıştıran ve sonucu yazan çalışan"""
+
+    def __init__(self, queue: CrawlQueue, scraper, worker_id: Optional[str] = None,
+                 poll_interval: float = 0.5):
+        self.queue = queue
+        self.scraper = scraper
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.completed = 0
+
+    def process(self, task: Dict[str, Any]) -> List[Product]:
+        """Tek bir görevi çalıştır: sayfayı çek ve ayrıştır"""
+        params = self.scraper.build_search_params(task['query'], task['item_limit'], page=task['page'])
+        content = self.scraper.fetch_engine.fetch(task['site'], params=params)
+        return self.scraper.parse_search_results(content, task['query'], task['item_limit'])
+
+    def run(self, max_tasks: Optional[int] = None) -> int:
+        """Kuyruk boşalana (veya max_tasks görev bitene) kadar çalış; tamamlanan görev sayısını döndür"""
+        logger.info(f"Çalışan başladı: {self.worker_id}")
+        while max_tasks is None or self.completed < max_tasks:
+            task = self.queue.lease(self.worker_id)
+            if task is None:
+                if self.queue.is_drained():
+                    break
+                # Başka çalışanların kiraları veya yeniden deneme gecikmeleri bekleniyor
+                time.sleep(self.poll_interval)
+                continue
+
+            try:
+                # Uzun Retry-After beklemelerinde kira dolup görev başka çalışana geçmesin
+                with LeaseHeartbeat(self.queue, task['task_id'], self.worker_id):
+                    products = self.process(task)
+            except Exception as e:
+                self.queue.fail(task['task_id'], self.worker_id, e)
+                continue
+
+            if self.queue.complete(task['task_id'], self.worker_id, products):
+                self.completed += 1
+                logger.info(f"{self.worker_id}: '{task['query']}' sayfa {task['page']} -> {len(products)} ürün")
+
+        logger.info(f"Çalışan bitti: {self.worker_id} ({self.completed} görev)")
+        return self.completed
+
+class CrawlCoordinator:
+    """Görevleri planlar ve tamamlanan sonuçları tek raporda birleştirir"""
+
+    def __init__(self, queue: CrawlQueue):
+        self.queue = queue
+
+    def plan(self, categories: List[str], keywords: List[str], sites: List[str], pages: int = 1,
+             category_limit: int = 20, keyword_limit: int = 15) -> int:
+        """Her site için kategori ve arama terimlerini sayfa görevlerine böl"""
+        tasks = []
+        for site in sites:
+            for page in range(1, pages + 1):
+                tasks += [(site, category, page, category_limit, 'category') for category in categories]
+                tasks += [(site, keyword, page, keyword_limit, 'trending') for keyword in keywords]
+        return self.queue.enqueue(tasks)
+
+    def collect_products(self) -> List[Product]:
+        """Tamamlanan tüm görevlerin ürünlerini birleştir"""
+        all_products = []
+        for task, products in self.queue.iter_results():
+            all_products.extend(products)
+        return all_products
+
+    def build_report(self, scraper) -> Dict[str, Any]:
+        """Birleştirilmiş ürünlerden run_market_research ile aynı yapıda rapor üret"""
+        stats = self.queue.stats()
+        if stats['pending'] or stats['leased']:
+            logger.warning(f"Kuyruk henüz boşalmadı, kısmi rapor üretiliyor: {stats}")
+        if stats['failed']:
+            logger.warning(f"{stats['failed']} görev başarısız oldu")
+        return scraper.build_report(self.collect_products())
+
+def main():
+    """Komut satırı: plan / work / report"""
+    parser = argparse.ArgumentParser(description="Dağıtık eBay tarama kuyruğu")
+    parser.add_argument('command', choices=['plan', 'work', 'report'])
+    parser.add_argument('--db', default='crawl_queue.sqlite3', help='Paylaşılan kuyruk veritabanı')
+    parser.add_argument('--pages', type=int, default=1, help='Sorgu başına sayfa sayısı (plan)')
+    parser.add_argument('--site', action='append', help='Arama URL\'si (plan; birden fazla verilebilir)')
+    parser.add_argument('--lease', type=float, default=60, help='Kira süresi (sn)')
+    parser.add_argument('--cache-dir', default=None, help='Yanıt önbelleği dizini (work)')
+    args = parser.parse_args()
+
+    from ebay_scraper import EbayScraper
+
+    queue = CrawlQueue(args.db, lease_seconds=args.lease)
+    scraper = EbayScraper(cache_dir=args.cache_dir)
+    try:
+        if args.command == 'plan':
+            CrawlCoordinator(queue).plan(scraper.categories, scraper.trending_keywords,
+                                         sites=args.site or [scraper.base_url], pages=args.pages)
+            print(queue.stats())
+        elif args.command == 'work':
+            CrawlWorker(queue, scraper).run()
+        else:
+            results = CrawlCoordinator(queue).build_report(scraper)
+            json_file, _, _ = scraper.save_results(results)
+            print(f"{results['total_products_analyzed']} ürün birleştirildi: {json_file}")
+    finally:
+        scraper.close()
+        queue.close()
+
+if __name__ == "__main__":
+    main()
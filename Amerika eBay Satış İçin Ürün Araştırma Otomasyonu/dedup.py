@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Sorgular Arası Ürün Tekilleştirme
+Aynı ilan birden fazla trend aramasında ve kategori sorgusunda görünebilir.
+Bu modül ürünleri URL'deki eBay ürün kimliğiyle, kimlik yoksa görsel ve
+normalize edilmiş başlık özetleriyle eşleştirir; her ürün için amortize O(1)
+sözlük aramasıyla birleştirir ve eşleşen tüm arama terimlerini saklar.
+"""
+
+import re
+import hashlib
+import logging
+from typing import List, Dict, Any, Iterable, Optional
+
+from product_record import Product, extract_item_id
+from term_sketch import STOP_WORDS
+
+logger = logging.getLogger(__name__)
+
+_TITLE_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# eBay görsel kimliği: .../images/g/<kimlik>/s-l225.webp (boyut/biçimden bağımsız)
+_IMAGE_ID_RE = re.compile(r'/images/g/([^/]+)/')
+
+def title_fingerprint(title: Optional[str]) -> Optional[str]:
+    """Büyük/küçük harf, noktalama ve kelime sırasından bağımsız başlık özeti"""
+    if not title or title == 'N/A':
+        return None
+    tokens = sorted({token for token in _TITLE_TOKEN_RE.findall(title.lower()) if token not in STOP_WORDS})
+    if not tokens:
+        return None
+    return hashlib.sha1(' '.join(tokens).encode('utf-8')).hexdigest()[:16]
+
+def image_fingerprint(image_url: Optional[str]) -> Optional[str]:
+    """Görsel URL'sinden boyut/biçimden bağımsız görsel anahtarı"""
+    if not image_url or image_url == 'N/A':
+        return None
+    match = _IMAGE_ID_RE.search(image_url)
+    if match:
+        return match.group(1)
+    return hashlib.sha1(image_url.split('?', 1)[0].encode('utf-8')).hexdigest()[:16]
+
+class ProductDeduplicator:
+    """Ürün kimliği (yedek: görsel/başlık özeti) ile tekilleştirme indeksi"""
+
+    def __init__(self):
+        self._by_id: Dict[str, Product] = {}
+        self._by_image: Dict[str, Product] = {}
+        self._by_title: Dict[tuple, Product] = {}
+        self.duplicates = 0
+        # Birleştirmede satış/izleyici sayısı artan kayıtlar (önceden skorlandıysa skorları eskidir)
+        self._updated: Dict[int, Product] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _find(self, item_id: str, image_key: Optional[str], title_key: Optional[tuple]) -> Optional[Product]:
+        existing = self._by_id.get(item_id)
+        if existing is not None:
+            return existing
+        # Kimliği URL'den çıkarılamayan ürünler için bulanık eşleştirme
+        if item_id.startswith('h:'):
+            if image_key is not None:
+                existing = self._by_image.get(image_key)
+                if existing is not None:
+                    return existing
+            if title_key is not None:
+                return self._by_title.get(title_key)
+        return None
+
+    def add(self, product: Any) -> bool:
+        """Ürünü indekse ekle; yeni ise True, mevcut bir ürünle birleştiyse False"""
+        product = Product.coerce(product)
+        item_id = extract_item_id(product.url, fallback=f"{product.title}|{product.image_url}")
+        image_key = image_fingerprint(product.image_url)
+        title_fp = title_fingerprint(product.title)
+        # Aynı başlıklı farklı satıcı ilanları birleşmesin diye satıcı da anahtara girer
+        title_key = (title_fp, product.seller) if title_fp is not None else None
+
+        existing = self._find(item_id, image_key, title_key)
+        if existing is not None:
+            if self._merge(existing, product):
+                self._updated[id(existing)] = existing
+            self.duplicates += 1
+            return False
+
+        self._by_id[item_id] = product
+        if image_key is not None:
+            self._by_image.setdefault(image_key, product)
+        if title_key is not None:
+            self._by_title.setdefault(title_key, product)
+        return True
+
+    @staticmethod
+    def _merge(existing: Product, duplicate: Product) -> bool:
+        """Tekrarı ilk görülen kayda birleştir: arama terimleri birleşir, sayaçlar en güncel (büyük) değeri alır
+        
+        Skoru etkileyen bir alan (sayaçlar veya arama terimleri) değiştiyse True döner.
+        """
+        keywords = existing.all_keywords()
+        merged = keywords | duplicate.all_keywords()
+        updated = len(merged) != len(keywords)
+        if updated:
+            existing.search_keywords = merged
+
+        if duplicate.sold_count > existing.sold_count:
+            existing.sold_count = duplicate.sold_count
+            updated = True
+        if duplicate.watchers > existing.watchers:
+            existing.watchers = duplicate.watchers
+            updated = True
+        return updated
+
+    def add_many(self, products: Iterable[Any]) -> 'ProductDeduplicator':
+        for product in products:
+            self.add(product)
+        return self
+
+    def products(self) -> List[Product]:
+        """Tekil ürünler (ilk görülme sırasıyla)"""
+        return list(self._by_id.values())
+
+    def updated_products(self) -> List[Product]:
+        """Birleştirmede sayaçları veya arama terimleri değişen tekil ürünler (skorlanmışlarsa yeniden skorlanmalı)"""
+        return list(self._updated.values())
+
+    def log_summary(self):
+        if self.duplicates:
+            logger.info(f"{self.duplicates} tekrar eden ürün birleştirildi ({len(self)} tekil ürün, "
+                        f"{len(self._updated)} ürün güncellendi)")
+
+def deduplicate(products: Iterable[Any]) -> List[Product]:
+    """Ürün listesini tekilleştir; her tekil ürün bir kez döner"""
+    index = ProductDeduplicator().add_many(products)
+    index.log_summary()
+    return index.products()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Değişiklik Algılama (Delta) Modu
+Bu modül yeni ayrıştırılan ürünleri bir önceki çalıştırmanın anlık
+görüntüsüyle (ürün kimliği + fiyat/satış/izleyici özeti) karşılaştırır.
+Yalnızca yeni, değişen ve kaybolan ürünler kompakt bir değişiklik günlüğüne
+(JSONL) yazılır; değişmeyen ürünler yeniden analiz edilmez ve dışa aktarılmaz.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional
+
+from product_record import Product, extract_item_id
+
+logger = logging.getLogger(__name__)
+
+# Anlık görüntü girdisi: kimlik -> [özet, fiyat, satış, izleyici, skor, arama terimi, başlık, url]
+_FINGERPRINT, _PRICE, _SOLD, _WATCHERS, _SCORE, _KEYWORD, _TITLE, _URL = range(8)
+
+def record_fingerprint(product: Any) -> str:
+    """Fiyat, satış ve izleyici sayısının kısa özeti"""
+    key = f"{product.get('price')!r}|{product.get('sold_count')!r}|{product.get('watchers')!r}"
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+def product_item_id(product: Any) -> str:
+    return extract_item_id(product.get('url'), fallback=f"{product.get('title')}|{product.get('image_url')}")
+
+class DeltaResult:
+    """Bir çalıştırmanın önceki anlık görüntüye göre farkı"""
+
+    def __init__(self):
+        self.new: List[Product] = []
+        self.changed: List[Product] = []
+        self.unchanged = 0
+        self.disappeared: List[Dict[str, Any]] = []
+        self.previous: Dict[str, list] = {}
+
+    @property
+    def to_analyze(self) -> List[Product]:
+        """Yeniden analiz edilecek ürünler (yeni + değişen)"""
+        return self.new + self.changed
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'new': len(self.new),
+            'changed': len(self.changed),
+            'unchanged': self.unchanged,
+            'disappeared': len(self.disappeared),
+        }
+
+    def iter_changes(self) -> Iterable[Dict[str, Any]]:
+        """Değişiklik günlüğü satırları"""
+        for change, products in (('new', self.new), ('changed', self.changed)):
+            for product in products:
+                item_id = product_item_id(product)
+                record = {
+                    'change': change,
+                    'item_id': item_id,
+                    'title': product.title,
+                    'url': product.url,
+                    'search_keyword': product.search_keyword,
+                    'price': product.price,
+                    'sold_count': product.sold_count,
+                    'watchers': product.watchers,
+                    'advanced_score': product.advanced_score,
+                }
+                previous = self.previous.get(item_id)
+                if previous is not None:
+                    record['previous'] = {
+                        'price': previous[_PRICE],
+                        'sold_count': previous[_SOLD],
+                        'watchers': previous[_WATCHERS],
+                        'advanced_score': previous[_SCORE],
+                    }
+                yield record
+        for record in self.disappeared:
+            yield record
+
+class DeltaTracker:
+    """Önceki çalıştırmanın anlık görüntüsünü tutan ve farkı hesaplayan nesne"""
+
+    def __init__(self, snapshot_path: str = 'delta_snapshot.json'):
+        self.snapshot_path = snapshot_path
+        self.snapshot: Dict[str, list] = self._load()
+
+    def _load(self) -> Dict[str, list]:
+        if not os.path.exists(self.snapshot_path):
+            return {}
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['items']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Delta anlık görüntüsü okunamadı, tam çalıştırma yapılacak: {e}")
+            return {}
+
+    def diff(self, products: Iterable[Any], queried_keywords: Optional[Iterable[str]] = None) -> DeltaResult:
+        """Ürünleri önceki anlık görüntüyle karşılaştır
+
+        Kaybolan ürünler yalnızca bu çalıştırmada aranan terimlerle sınırlıdır;
+        böylece sorguların bir alt kümesini çalıştırmak diğer ürünleri silmez.
+        """
+        result = DeltaResult()
+        seen = set()
+        for product in products:
+            product = Product.coerce(product)
+            item_id = product_item_id(product)
+            seen.add(item_id)
+            previous = self.snapshot.get(item_id)
+            if previous is None:
+                result.new.append(product)
+            elif previous[_FINGERPRINT] != record_fingerprint(product):
+                result.changed.append(product)
+                result.previous[item_id] = previous
+            else:
+                result.unchanged += 1
+
+        if queried_keywords is not None:
+            queried = set(queried_keywords)
+            for item_id, entry in self.snapshot.items():
+                if item_id not in seen and entry[_KEYWORD] in queried:
+                    result.disappeared.append({
+                        'change': 'disappeared',
+                        'item_id': item_id,
+                        'title': entry[_TITLE],
+                        'url': entry[_URL],
+                        'search_keyword': entry[_KEYWORD],
+                        'price': entry[_PRICE],
+                        'sold_count': entry[_SOLD],
+                        'watchers': entry[_WATCHERS],
+                        'advanced_score': entry[_SCORE],
+                    })
+
+        logger.info(f"Delta: {result.summary()}")
+        return result
+
+    def commit(self, result: DeltaResult):
+        """Farkı anlık görüntüye uygula ve diske yaz (analizden sonra; skorlar da saklanır)"""
+        for product in result.to_analyze:
+            self.snapshot[product_item_id(product)] = [
+                record_fingerprint(product), product.price, product.sold_count, product.watchers,
+                product.advanced_score, product.search_keyword, product.title, product.url
+            ]
+        for record in result.disappeared:
+            self.snapshot.pop(record['item_id'], None)
+
+        if not (result.to_analyze or result.disappeared) and os.path.exists(self.snapshot_path):
+            return
+
+        # json.dumps C kodlayıcısını kullanır (json.dump akış kodlayıcısından çok daha hızlı)
+        payload = json.dumps({'updated_at': datetime.now().isoformat(), 'items': self.snapshot},
+                             ensure_ascii=False, separators=(',', ':'))
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(temp_path, self.snapshot_path)
+
+    @staticmethod
+    def write_change_log(result: DeltaResult, path: str) -> int:
+        """Değişiklikleri JSONL dosyasına yaz; yazılan satır sayısını döndür"""
+        count = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in result.iter_changes():
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+                f.write('\n')
+                count += 1
+        return count
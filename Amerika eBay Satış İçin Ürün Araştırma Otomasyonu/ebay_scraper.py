@@ -4,28 +4,46 @@ eBay Piyasa Araştırması Otomasyonu
 Bu script eBay'den en çok satan ve satış potansiyeli yüksek ürünleri toplar.
 """
 
-import requests
-from bs4 import BeautifulSoup
+import os
 import time
 import random
 import json
 import csv
+import argparse
 from datetime import datetime
 import logging
 from urllib.parse import urljoin, quote
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
+from concurrent.futures import ThreadPoolExecutor
 
-# ProductAnalyzer sınıfını import et
-from product_analyzer import ProductAnalyzer
+# Ağır bağımlılıklar (requests, numpy/pandas, süreç havuzu) modül yüklenirken değil,
+# gerektiren kod yolunda içe aktarılır: report/export gibi kısa komutlar hızlı başlar
+from resilience import RetryPolicy
+from response_cache import ResponseCache
+from product_parser import BeautifulSoupBackend, get_parser_backend, clean_price, extract_first_number
+from product_record import PRODUCT_FIELDS, to_dicts, write_jsonl, read_jsonl
+from top_k import TopKSelector
+from history_store import ProductHistoryStore
+from dedup import ProductDeduplicator
+from delta import DeltaTracker
+from velocity import VelocityTracker
+from run_metrics import RunMetrics, RATE_BUCKETS, PROFILERS
+from scheduler_daemon import RunLock, OVERLAP_POLICIES, acquire_run_lock
 
 # Logging ayarları
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 class EbayScraper:
-    def __init__(self):
+    def __init__(self, max_concurrency=4, requests_per_second=1.0, burst=2, parser_backend='auto',
+                 cache_dir=None, cache_ttl=3600, cache_max_bytes=256 * 1024 * 1024, history_db=None,
+                 parse_workers=0, request_timeout=(5.0, 20.0), max_retries=3, delta_snapshot=None,
+                 metrics=None, metrics_prom_path=None, transport=None, velocity_weight=0.0):
         
+        import requests
+        from fetch_engine import FetchEngine
+        
+        self.base_url = "https://www.ebay.com/sch/i.html"
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -56,48 +74,121 @@ class EbayScraper:
             "most watched", "fast shipping", "new arrival", "limited edition"
         ]
         
-        self.analyzer = ProductAnalyzer()
+        # Aşama süreleri, sayaçlar ve histogramlar (JSON raporu + Prometheus metni)
+        self.metrics = metrics if metrics is not None else RunMetrics()
+        self.metrics_prom_path = metrics_prom_path
+        
+        # Disk yanıt önbelleği (isteğe bağlı)
+        self.cache = ResponseCache(cache_dir, ttl=cache_ttl, max_bytes=cache_max_bytes) if cache_dir else None
+        
+        # Eşzamanlı veri çekme motoru (keep-alive havuzu + host başına hız sınırı)
+        self.fetch_engine = FetchEngine(
+            self.session,
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+            burst=burst,
+            cache=self.cache,
+            timeout=request_timeout,
+            retry_policy=RetryPolicy(max_attempts=max_retries + 1),
+            metrics=self.metrics,
+            transport=transport
+        )
+        
+        # HTML ayrıştırıcı arka ucu (selectolax/lxml hızlı yol, bs4 yedek)
+        self.parser = get_parser_backend(parser_backend)
+        self.parser.metrics = self.metrics
+        self._bs4_backend = None
+        self.parser_backend = parser_backend
+        
+        # parse_workers > 0 ise ayrıştırma ve skorlama süreç havuzunda yapılır
+        self.parse_workers = parse_workers
+        self._pipeline = None
+        
+        # Analizör (numpy) ilk analizde oluşturulur; yalnızca veri çeken komutlar onu yüklemez
+        self._analyzer = None
+        
+        # Son analiz edilen ürünler (sütunsal dışa aktarım için)
+        self.last_analyzed_products = []
+        
+        # Kalıcı ürün geçmişi deposu (isteğe bağlı)
+        self.history_store = ProductHistoryStore(history_db) if history_db else None
+        
+        # Satış hızı (satış/gün, izleyici büyümesi, fiyat EWMA) geçmiş deposuyla artımlı izlenir;
+        # velocity_weight > 0 ise skora katılır
+        self.velocity_tracker = VelocityTracker(self.history_store) if self.history_store is not None else None
+        self.velocity_weight = velocity_weight
+        
+        # Delta modu: yalnızca önceki çalıştırmaya göre yeni/değişen ürünler analiz edilir (isteğe bağlı)
+        self.delta_tracker = DeltaTracker(delta_snapshot) if delta_snapshot else None
+        self.last_delta = None
+        
+        # Son toplamada başarıyla çekilen sorgular (kaybolan ürün tespiti için)
+        self.last_collected_queries = []
+    
+    @property
+    def analyzer(self):
+        """Ürün analizörü (ilk erişimde oluşturulur)"""
+        if self._analyzer is None:
+            from product_analyzer import ProductAnalyzer
+            self.analyzer = ProductAnalyzer()
+        return self._analyzer
+    
+    @analyzer.setter
+    def analyzer(self, analyzer):
+        analyzer.velocity_tracker = self.velocity_tracker
+        if self.velocity_weight:
+            if self.velocity_tracker is not None:
+                analyzer.set_component_weight('velocity', self.velocity_weight)
+            else:
+                logger.warning("Satış hızı ağırlığı yok sayıldı: geçmiş deposu (history_db) gerekli")
+        self._analyzer = analyzer
     
     def get_random_delay(self, min_delay=1, max_delay=3):
         """Rastgele bekleme süresi"""
         return random.uniform(min_delay, max_delay)
     
+    def build_search_params(self, keyword, limit=50, page=None):
+        """Arama isteği parametrelerini oluştur"""
+        params = {
+            '_nkw': keyword,
+            '_sacat': '0',
+            '_sop': '12',  # En çok satanlar
+            '_ipg': str(limit),
+            '_from': 'R40',
+            'LH_Sold': '1', # Satılan ürünler
+            'LH_Complete': '1' # Tamamlanmış listelemeler
+        }
+        if page is not None:
+            params['_pgn'] = str(page) # Sayfa numarası
+        return params
+    
+    def parse_search_results(self, content, keyword, limit=50):
+        """Arama sonuç sayfasındaki ürünleri çıkar"""
+        # Tüm ürünlerin alanları seçili arka uçla tek geçişte çıkarılır
+        start = time.perf_counter()
+        products = self.parser.parse(content, limit)
+        elapsed = time.perf_counter() - start
+        
+        for product in products:
+            product.search_keyword = keyword # Arama bilgisini ekle
+        
+        # Sayfa başına ayrıştırma süresi, ürün/sn ve alan bazında eksik değerler
+        backend = self.parser.name
+        self.metrics.observe('parse_seconds', elapsed, backend=backend)
+        if elapsed > 0 and products:
+            self.metrics.observe('parse_items_per_second', len(products) / elapsed, buckets=RATE_BUCKETS, backend=backend)
+        self.metrics.inc('parse_items_total', len(products), backend=backend)
+        self.metrics.record_products(products)
+        
+        return products
+    
     def search_category_products(self, category, sort_by="BestMatch", limit=50):
         """Belirli bir kategoride ürün arama"""
         try:
-            # URL oluştur
-            base_url = "https://www.ebay.com/sch/i.html"
-            params = {
-                '_nkw': category,
-                '_sacat': '0',
-                '_sop': '12',  # En çok satanlar
-                '_ipg': str(limit),
-                '_from': 'R40',
-                'LH_Sold': '1', # Satılan ürünler
-                'LH_Complete': '1' # Tamamlanmış listelemeler
-            }
-            
-            # İstek gönder
-            response = self.session.get(base_url, params=params)
-            response.raise_for_status()
-            
-            # HTML parse et
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            products = []
+            # İstek gönder (hız sınırı motor tarafından uygulanır)
+            content = self.fetch_engine.fetch(self.base_url, params=self.build_search_params(category, limit))
             
-            # Ürün listelerini bul
-            items = soup.select('li.s-item:not(.s-item__pl-on-bottom)') # li etiketini kullan
-            
-            for item in items[:limit]:
-                try:
-                    product_data = self.extract_product_data(item)
-                    if product_data:
-                        product_data['search_keyword'] = category # Kategori bilgisini ekle
-                        products.append(product_data)
-                except Exception as e:
-                    logger.warning(f"Ürün verisi çıkarılırken hata: {e}")
-                    continue
+            products = self.parse_search_results(content, category, limit)
             
             logger.info(f"{category} kategorisinde {len(products)} ürün bulundu")
             return products
@@ -107,73 +198,11 @@ class EbayScraper:
             return []
     
     def extract_product_data(self, item_element):
-        """Ürün verisini çıkar"""
+        """Ürün verisini çıkar (BeautifulSoup li.s-item öğesinden)"""
         try:
-            product = {}
-            
-            # Başlık
-            title_elem = item_element.find('h3', {'class': 's-item__title'}) 
-            if title_elem:
-                product['title'] = title_elem.get_text(strip=True)
-            else:
-                product['title'] = 'N/A'
-            
-            # Fiyat
-            price_elem = item_element.find('span', {'class': 's-item__price'})
-            if price_elem:
-                price_text = price_elem.get_text(strip=True)
-                product['price'] = self.clean_price(price_text)
-            else:
-                product['price'] = 0.0
-            
-            # Link
-            link_elem = item_element.find('a', {'class': 's-item__link'})
-            if link_elem:
-                product['url'] = link_elem.get('href')
-            else:
-                product['url'] = 'N/A'
-            
-            # Satıcı bilgisi
-            seller_elem = item_element.find('span', {'class': 's-item__seller-info-text'})
-            if seller_elem:
-                product['seller'] = seller_elem.get_text(strip=True)
-            else:
-                product['seller'] = 'N/A'
-            
-            # Kargo bilgisi
-            shipping_elem = item_element.find('span', {'class': 's-item__shipping'})
-            if shipping_elem:
-                product['shipping'] = shipping_elem.get_text(strip=True)
-            else:
-                product['shipping'] = 'N/A'
-            
-            # Satış sayısı (varsa)
-            sold_elem = item_element.find('span', {'class': 's-item__hotness-count'}) or item_element.find('span', {'class': 's-item__quantity-sold'})
-            if sold_elem:
-                sold_text = sold_elem.get_text(strip=True)
-                product['sold_count'] = self.extract_sold_count(sold_text)
-            else:
-                product['sold_count'] = 0
-            
-            # Görüntülenme/izlenme sayısı (varsa)
-            watchers_elem = item_element.find('span', {'class': 's-item__watchers'})
-            if watchers_elem:
-                watchers_text = watchers_elem.get_text(strip=True)
-                product['watchers'] = self.extract_watchers_count(watchers_text)
-            else:
-                product['watchers'] = 0
-            
-            # Resim URL'si
-            img_elem = item_element.find('img', {'class': 's-item__image-img'})
-            if img_elem:
-                product['image_url'] = img_elem.get('src')
-            else:
-                product['image_url'] = 'N/A'
-            
-            # Timestamp
-            product['scraped_at'] = datetime.now().isoformat()
-            
-            return product if product.get('title') != 'N/A' else None
+            if self._bs4_backend is None:
+                self._bs4_backend = BeautifulSoupBackend()
+            return self._bs4_backend.extract_item(item_element)
             
         except Exception as e:
             logger.warning(f"Ürün verisi çıkarma hatası: {e}")
@@ -181,62 +210,22 @@ class EbayScraper:
     
     def clean_price(self, price_text):
         """Fiyat metnini temizle"""
-        try:
-            # Sadece sayıları ve nokta/virgül karakterlerini al
-            price_clean = re.sub(r'[^\d.,]', '', price_text)
-            if price_clean:
-                # Virgülü noktaya çevir ve float'a dönüştür
-                return float(price_clean.replace(',', '.'))
-            return 0.0 # Hata durumunda 0.0 döndür
-        except:
-            return 0.0 # Hata durumunda 0.0 döndür
+        return clean_price(price_text)
     
     def extract_sold_count(self, sold_text):
         """Satış sayısını çıkar"""
-        try:
-            numbers = re.findall(r'\d+', sold_text)
-            return int(numbers[0]) if numbers else 0
-        except:
-            return 0
+        return extract_first_number(sold_text)
     
     def extract_watchers_count(self, watchers_text):
         """İzleyici sayısını çıkar"""
-        try:
-            numbers = re.findall(r'\d+', watchers_text)
-            return int(numbers[0]) if numbers else 0
-        except:
-            return 0
+        return extract_first_number(watchers_text)
     
     def search_trending_products(self, keyword, limit=20):
         """Trend ürünleri ara"""
         try:
-            base_url = "https://www.ebay.com/sch/i.html"
-            params = {
-                '_nkw': keyword,
-                '_sacat': '0',
-                '_sop': '12',  # En çok satanlar
-                '_ipg': str(limit),
-                '_from': 'R40',
-                'LH_Sold': '1', # Satılan ürünler
-                'LH_Complete': '1' # Tamamlanmış listelemeler
-            }
-            
-            response = self.session.get(base_url, params=params)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            content = self.fetch_engine.fetch(self.base_url, params=self.build_search_params(keyword, limit))
             
-            products = []
-            items = soup.select('li.s-item:not(.s-item__pl-on-bottom)')
-            
-            for item in items[:limit]:
-                try:
-                    product_data = self.extract_product_data(item)
-                    if product_data:
-                        product_data['search_keyword'] = keyword
-                        products.append(product_data)
-                except Exception as e:
-                    continue
+            products = self.parse_search_results(content, keyword, limit)
             
             logger.info(f"'{keyword}' için {len(products)} trend ürün bulundu")
             return products
@@ -245,142 +234,547 @@ class EbayScraper:
             logger.error(f"Trend ürün arama hatası ({keyword}): {e}")
             return []
     
-    def run_market_research(self):
-        """Tam piyasa araştırması çalıştır"""
-        logger.info("eBay piyasa araştırması başlatılıyor...")
+    def iter_search_products(self, keyword, max_items=200, page_size=60, prefetch=2) -> Iterator[Dict[str, Any]]:
+        """Sonuç sayfalarını _pgn ile gez ve ürünleri sayfa geldikçe üret
         
-        all_products = []
+        Sonraki `prefetch` sayfa arka planda önceden çekilir; hedef ürün sayısına
+        ulaşıldığında veya sonuçlar bittiğinde tarama durur.
+        """
+        max_pages = max(1, -(-max_items // page_size))
+        executor = ThreadPoolExecutor(max_workers=max(1, prefetch), thread_name_prefix='page')
+        pending = {}
+        next_page = 1
+        yielded = 0
         
-        # Kategorilerde arama yap
-        for category in self.categories:
-            logger.info(f"Kategori araştırılıyor: {category}")
-            products = self.search_category_products(category, limit=20)
-            all_products.extend(products)
+        def submit_next():
+            nonlocal next_page
+            if next_page <= max_pages:
+                params = self.build_search_params(keyword, page_size, page=next_page)
+                pending[next_page] = executor.submit(self.fetch_engine.fetch, self.base_url, params)
+                next_page += 1
+        
+        try:
+            for _ in range(max(1, prefetch)):
+                submit_next()
             
-            # Bekleme süresi
-            time.sleep(self.get_random_delay(2, 4))
+            page = 1
+            while page in pending and yielded < max_items:
+                try:
+                    content = pending.pop(page).result()
+                except Exception as e:
+                    logger.error(f"Sayfa çekme hatası ({keyword}, sayfa {page}): {e}")
+                    break
+                
+                # Bu sayfa işlenirken bir sonraki sayfayı kuyruğa ekle
+                submit_next()
+                
+                products = self.parse_search_results(content, keyword, page_size)
+                for product in products[:max_items - yielded]:
+                    yield product
+                    yielded += 1
+                
+                logger.info(f"'{keyword}' sayfa {page}: {len(products)} ürün (toplam {yielded})")
+                
+                # Eksik sayfa, sonuçların bittiğini gösterir
+                if len(products) < page_size:
+                    break
+                page += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def iter_category_products(self, category, max_items=200, page_size=60, prefetch=2):
+        """Kategori aramasını sayfalı modda çalıştır (generator)"""
+        return self.iter_search_products(category, max_items=max_items, page_size=page_size, prefetch=prefetch)
+    
+    def iter_trending_products(self, keyword, max_items=200, page_size=60, prefetch=2):
+        """Trend aramasını sayfalı modda çalıştır (generator)"""
+        return self.iter_search_products(keyword, max_items=max_items, page_size=page_size, prefetch=prefetch)
+    
+    def collect_products(self, categories=None, keywords=None, category_limit=20, keyword_limit=15):
+        """Kategori ve trend aramalarını eşzamanlı çalıştır, ürünleri sorgu sırasıyla topla"""
+        categories = self.categories if categories is None else categories
+        keywords = self.trending_keywords if keywords is None else keywords
         
-        # Trend anahtar kelimelerle arama yap
-        for keyword in self.trending_keywords:
-            logger.info(f"Trend anahtar kelime araştırılıyor: {keyword}")
-            products = self.search_trending_products(keyword, limit=15)
-            all_products.extend(products)
+        queries = [(category, category_limit, 'category') for category in categories]
+        queries += [(keyword, keyword_limit, 'trending') for keyword in keywords]
+        
+        logger.info(f"{len(queries)} sorgu eşzamanlı çalıştırılıyor "
+                    f"(eşzamanlılık: {self.fetch_engine.max_concurrency}, "
+                    f"hız: {self.fetch_engine.requests_per_second} istek/sn)")
+        
+        if self.parse_workers:
+            # Çok çekirdekli hat: çekilen sayfalar süreç havuzunda ayrıştırılır ve skorlanır
+            with self.metrics.stage('fetch_parse_score'):
+                outcomes = self._get_pipeline().run(
+                    self.fetch_engine,
+                    [(self.base_url, self.build_search_params(query, limit), query, limit) for query, limit, _ in queries]
+                )
+        else:
+            with self.metrics.stage('fetch'):
+                outcomes = self.fetch_engine.run(
+                    [(self.base_url, self.build_search_params(query, limit)) for query, limit, _ in queries]
+                )
+        
+        with self.metrics.stage('parse'):
+            return self._collect_outcomes(queries, outcomes)
+    
+    def _collect_outcomes(self, queries, outcomes):
+        """Sorgu sonuçlarını ayrıştır (gerekirse) ve sorgu sırasıyla birleştir"""
+        all_products = []
+        self.last_collected_queries = []
+        for (query, limit, kind), outcome in zip(queries, outcomes):
+            if outcome is None or isinstance(outcome, Exception):
+                self.metrics.inc('queries_total', kind=kind, result='error')
+                if kind == 'category':
+                    logger.error(f"Kategori arama hatası ({query}): {outcome}")
+                else:
+                    logger.error(f"Trend ürün arama hatası ({query}): {outcome}")
+                continue
             
-            # Bekleme süresi
-            time.sleep(self.get_random_delay(2, 4))
+            if self.parse_workers:
+                products = outcome
+            else:
+                try:
+                    products = self.parse_search_results(outcome, query, limit)
+                except Exception as e:
+                    self.metrics.inc('queries_total', kind=kind, result='parse_error')
+                    logger.error(f"Sayfa ayrıştırma hatası ({query}): {e}")
+                    continue
+            
+            if kind == 'category':
+                logger.info(f"{query} kategorisinde {len(products)} ürün bulundu")
+            else:
+                logger.info(f"'{query}' için {len(products)} trend ürün bulundu")
+            all_products.extend(products)
+            self.last_collected_queries.append(query)
+            self.metrics.inc('queries_total', kind=kind, result='ok')
+        
+        return all_products
+    
+    def _get_pipeline(self):
+        """Ayrıştırma/skorlama süreç havuzunu ilk kullanımda oluştur"""
+        if self._pipeline is None:
+            from pipeline import ParsePipeline
+            self._pipeline = ParsePipeline(workers=self.parse_workers, parser_backend=self.parser_backend)
+        return self._pipeline
+    
+    def close(self):
+        """Süreç havuzunu, veri çekme motorunu ve geçmiş deposunu kapat"""
+        if self._pipeline is not None:
+            self._pipeline.close()
+            self._pipeline = None
+        self.fetch_engine.close()
+        if self.history_store is not None:
+            self.history_store.close()
+    
+    def run_market_research(self, categories=None, keywords=None):
+        """Piyasa araştırması çalıştır; categories/keywords verilirse yalnızca o sorgu alt kümesi çekilir"""
+        logger.info("eBay piyasa araştırması başlatılıyor...")
+        
+        # Kategori ve trend aramalarını eşzamanlı yap (sabit bekleme yerine token-bucket)
+        all_products = self.collect_products(categories=categories, keywords=keywords)
         
-        # Ürünleri analiz et ve skorla
-        analyzed_products = self.analyzer.analyze_products(all_products)
+        # Hat modunda ürünler çalışanlarda zaten skorlanmıştır
+        return self.build_report(all_products, scored=bool(self.parse_workers),
+                                 queried_keywords=self.last_collected_queries)
+    
+    def build_report(self, all_products, scored=False, dedup=True, queried_keywords=None):
+        """Toplanan ürünleri analiz et ve rapor sözlüğünü oluştur"""
+        # Birden fazla sorguda görünen ilanlar tek kayda birleştirilir (her ürün bir kez skorlanır)
+        metrics = self.metrics
+        if dedup:
+            with metrics.stage('dedup'):
+                index = ProductDeduplicator().add_many(all_products)
+                index.log_summary()
+                all_products = index.products()
+            # Hat modunda skorlar birleştirmeden önce hesaplanmıştır; sayaçları veya terimleri değişen kayıtlar yeniden skorlanır
+            updated = index.updated_products()
+            if scored and updated:
+                with metrics.stage('score'):
+                    self.analyzer.analyze_products(updated, vectorized=False, sort_results=False)
         
-        # Kategorilere ayır
-        categorized_products = self.analyzer.categorize_products(analyzed_products)
+        # Satış hızı tüm ürünlerle güncellenir (delta modunda değişmeyen ürünlerin hızı da sönümlenmeli)
+        if self.velocity_tracker is not None:
+            with metrics.stage('velocity'):
+                self.velocity_tracker.update(all_products)
+            # Hat çalışanlarında hız durumu yoktur; hız skora katılıyorsa burada yeniden skorlanır
+            if scored and self.analyzer.score_weights['velocity']:
+                scored = False
         
-        # İçgörüler üret
-        insights = self.analyzer.generate_insights(analyzed_products)
+        # Delta modunda değişmeyen ürünler analizden, geçmişten ve dışa aktarımdan çıkarılır
+        delta = None
+        if self.delta_tracker is not None:
+            with metrics.stage('delta'):
+                delta = self.delta_tracker.diff(all_products, queried_keywords=queried_keywords)
+            all_products = delta.to_analyze
+        
+        # Ürünleri analiz et ve skorla (tam sıralama gerekmez)
+        if scored:
+            analyzed_products = all_products
+        else:
+            with metrics.stage('score'):
+                analyzed_products = self.analyzer.analyze_products(all_products, sort_results=False)
+        
+        with metrics.stage('insights'):
+            # Kategorilere ayır
+            categorized_products = self.analyzer.categorize_products(analyzed_products)
+            
+            # İçgörüler üret
+            insights = self.analyzer.generate_insights(analyzed_products)
         
         logger.info(f"Toplam {len(analyzed_products)} ürün analiz edildi")
+        metrics.inc('products_analyzed_total', len(analyzed_products))
+        self.last_analyzed_products = analyzed_products
         
-        # En çok satan ve yüksek potansiyelli ürünleri al
-        # Burada 'top_selling_products' ve 'high_potential_products' listelerini doldurmak için
-        # skorlama algoritmasından gelen 'high_potential' ve 'medium_potential' kategorilerini kullanıyorum.
-        # Ayrıca, en çok satanlar için genel sıralamayı da dikkate alıyorum.
+        # Tüm analiz edilen ürünleri geçmiş deposuna tek işlemde yaz
+        if self.history_store is not None:
+            with metrics.stage('history'):
+                self.history_store.upsert_products(analyzed_products)
+                # Son 7 günde satışı en çok artan ürünler (geçmiş belleğe yüklenmeden SQL ile)
+                insights['sales_momentum'] = list(self.history_store.sold_count_deltas(days=7, limit=10))
+        if self.velocity_tracker is not None:
+            insights['sales_velocity'] = self.velocity_tracker.top(10)
         
-        top_selling = []
-        high_potential = []
-
-        # Tüm analiz edilmiş ürünleri skora göre sırala
-        sorted_all_products = sorted(analyzed_products, key=lambda x: x.get('advanced_score', 0), reverse=True)
-
-        # En çok satanlar (genel olarak en yüksek skorlular)
-        top_selling = sorted_all_products[:10]
-
-        # Yüksek potansiyelliler (belirli bir eşiğin üzerindeki ürünler)
-        high_potential = [p for p in sorted_all_products if p.get('advanced_score', 0) >= 70][:10]
-
-        return {
+        # Anlık görüntü skorlarla birlikte analizden sonra güncellenir
+        self.last_delta = delta
+        if delta is not None:
+            with metrics.stage('delta'):
+                self.delta_tracker.commit(delta)
+        
+        # En çok satanlar (genel olarak en yüksek skorlular) ve yüksek potansiyelliler
+        # (belirli bir eşiğin üzerindeki ürünler) skorlanan ürünler akarken heap ile seçilir
+        with metrics.stage('top_k'):
+            top_selling = TopKSelector(10)
+            high_potential = TopKSelector(10, min_score=70)
+            for product in analyzed_products:
+                top_selling.push(product)
+                high_potential.push(product)
+        
+        report = {
             'timestamp': datetime.now().isoformat(),
             'total_products_analyzed': len(analyzed_products),
-            'top_selling_products': top_selling,
-            'high_potential_products': high_potential,
+            # Sınır: raporda ürünler sözlük olarak yer alır
+            'top_selling_products': to_dicts(top_selling.results()),
+            'high_potential_products': to_dicts(high_potential.results()),
             'insights': insights
         }
+        if delta is not None:
+            report['delta'] = delta.summary()
+        return report
+    
+    def _write_csv(self, filename, rows):
+        """Ürün satırlarını sabit alan sırasıyla CSV'ye yaz"""
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            if rows:
+                writer = csv.DictWriter(f, fieldnames=PRODUCT_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(rows)
     
-    def save_results(self, results, filename_prefix="ebay_market_research"):
-        """Sonuçları kaydet"""
+    def save_results(self, results, filename_prefix="ebay_market_research", products=None, parquet_dir=None,
+                     snapshot=True):
+        """Sonuçları kaydet; parquet_dir verilirse analiz edilen tüm ürünler Parquet olarak da yazılır
+        
+        snapshot açıksa tüm ürünler bellek eşlemeli ikili anlık görüntüye (`*.snap`) de yazılır;
+        geçmiş çalıştırmalar bu dosyalardan JSON ayrıştırmadan karşılaştırılır.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # JSON formatında kaydet
-        json_filename = f"{filename_prefix}_{timestamp}.json"
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        
-        # CSV formatında kaydet (top_selling_products)
-        csv_filename_top_selling = f"{filename_prefix}_top_selling_{timestamp}.csv"
-        with open(csv_filename_top_selling, 'w', newline='', encoding='utf-8') as f:
-            if results['top_selling_products']:
-                fieldnames = results['top_selling_products'][0].keys()
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(results['top_selling_products'])
-        
-        # CSV formatında kaydet (high_potential_products)
-        csv_filename_high_potential = f"{filename_prefix}_high_potential_{timestamp}.csv"
-        with open(csv_filename_high_potential, 'w', newline='', encoding='utf-8') as f:
-            if results['high_potential_products']:
-                fieldnames = results['high_potential_products'][0].keys()
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(results['high_potential_products'])
+        metrics = self.metrics
+        
+        with metrics.stage('export_report'):
+            # JSON formatında kaydet
+            json_filename = f"{filename_prefix}_{timestamp}.json"
+            with open(json_filename, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            
+            # CSV formatında kaydet (top_selling_products)
+            csv_filename_top_selling = f"{filename_prefix}_top_selling_{timestamp}.csv"
+            self._write_csv(csv_filename_top_selling, results['top_selling_products'])
+            
+            # CSV formatında kaydet (high_potential_products)
+            csv_filename_high_potential = f"{filename_prefix}_high_potential_{timestamp}.csv"
+            self._write_csv(csv_filename_high_potential, results['high_potential_products'])
+        
+        # İkili anlık görüntü: sabit genişlikli sayısal sütunlar + metin tabloları (np.memmap ile açılır)
+        if snapshot:
+            snapshot_filename = f"{filename_prefix}_{timestamp}.snap"
+            with metrics.stage('export_snapshot'):
+                from run_snapshot import write_snapshot
+                write_snapshot(products if products is not None else self.last_analyzed_products,
+                               snapshot_filename, run_id=timestamp)
+        
+        # Sütunsal dışa aktarım: tüm ürünler, tarih ve arama terimine göre bölümlenmiş Parquet
+        if parquet_dir:
+            try:
+                with metrics.stage('export_parquet'):
+                    from parquet_export import ParquetExporter
+                    exporter = ParquetExporter(parquet_dir, run_id=timestamp)
+                    exporter.write(products if products is not None else self.last_analyzed_products)
+            except ImportError as e:
+                logger.error(f"Parquet dışa aktarımı atlandı: {e}")
+        
+        # Delta modu: yeni, değişen ve kaybolan ürünlerin kompakt değişiklik günlüğü
+        if self.last_delta is not None:
+            changes_filename = f"{filename_prefix}_changes_{timestamp}.jsonl"
+            with metrics.stage('export_changes'):
+                count = DeltaTracker.write_change_log(self.last_delta, changes_filename)
+            logger.info(f"Değişiklik günlüğü kaydedildi: {changes_filename} ({count} değişiklik)")
+        
+        # Çalıştırma metrikleri: JSON raporu ve (yapılandırıldıysa) Prometheus metin dosyası
+        metrics_filename = f"{filename_prefix}_metrics_{timestamp}.json"
+        metrics.write_json(metrics_filename)
+        if self.metrics_prom_path:
+            metrics.write_prometheus(self.metrics_prom_path)
+        logger.info(f"Çalıştırma metrikleri kaydedildi: {metrics_filename}")
         
         logger.info(f"Sonuçlar kaydedildi: {json_filename}, {csv_filename_top_selling}, {csv_filename_high_potential}")
         return json_filename, csv_filename_top_selling, csv_filename_high_potential
 
-def main():
-    """Ana fonksiyon"""
-    scraper = EbayScraper()
+def print_report(results, files=None):
+    """Rapor özetini konsola yazdır"""
+    print("\n" + "="*50)
+    print("eBay PIYASA ARAŞTIRMASI RAPORU")
+    print("="*50)
+    print(f"Tarih: {results['timestamp']}")
+    print(f"Analiz edilen toplam ürün sayısı: {results['total_products_analyzed']}")
+    print(f"En çok satan ürün sayısı: {len(results['top_selling_products'])}")
+    print(f"Yüksek potansiyelli ürün sayısı: {len(results['high_potential_products'])}")
+    if results.get('delta'):
+        print(f"Değişiklikler: {results['delta']}")
     
-    try:
-        # Piyasa araştırması çalıştır
-        results = scraper.run_market_research()
-        
-        # Sonuçları kaydet
-        json_file, csv_top_selling_file, csv_high_potential_file = scraper.save_results(results)
-        
-        # Özet rapor yazdır
-        print("\n" + "="*50)
-        print("eBay PIYASA ARAŞTIRMASI RAPORU")
-        print("="*50)
-        print(f"Tarih: {results['timestamp']}")
-        print(f"Analiz edilen toplam ürün sayısı: {results['total_products_analyzed']}")
-        print(f"En çok satan ürün sayısı: {len(results['top_selling_products'])}")
-        print(f"Yüksek potansiyelli ürün sayısı: {len(results['high_potential_products'])}")
-        
-        print("\nEN ÇOK SATAN İLK 10 ÜRÜN:")
-        print("-" * 30)
-        for i, product in enumerate(results['top_selling_products'], 1):
-            print(f"{i}. {product.get('title', 'N/A')[:60]}...")
-            print(f"   Fiyat: ${product.get('price', 'N/A')}")
-            print(f"   Skor: {product.get('advanced_score', 'N/A')}")
-            print(f"   Satış: {product.get('sold_count', 'N/A')}")
-            print()
-            
-        print("\nYÜKSEK POTANSİYELLİ İLK 10 ÜRÜN:")
-        print("-" * 30)
-        for i, product in enumerate(results['high_potential_products'], 1):
-            print(f"{i}. {product.get('title', 'N/A')[:60]}...")
-            print(f"   Fiyat: ${product.get('price', 'N/A')}")
-            print(f"   Skor: {product.get('advanced_score', 'N/A')}")
-            print(f"   Satış: {product.get('sold_count', 'N/A')}")
-            print()
+    print("\nEN ÇOK SATAN İLK 10 ÜRÜN:")
+    print("-" * 30)
+    for i, product in enumerate(results['top_selling_products'], 1):
+        print(f"{i}. {product.get('title', 'N/A')[:60]}...")
+        print(f"   Fiyat: ${product.get('price', 'N/A')}")
+        print(f"   Skor: {product.get('advanced_score', 'N/A')}")
+        print(f"   Satış: {product.get('sold_count', 'N/A')}")
+        print()
         
+    print("\nYÜKSEK POTANSİYELLİ İLK 10 ÜRÜN:")
+    print("-" * 30)
+    for i, product in enumerate(results['high_potential_products'], 1):
+        print(f"{i}. {product.get('title', 'N/A')[:60]}...")
+        print(f"   Fiyat: ${product.get('price', 'N/A')}")
+        print(f"   Skor: {product.get('advanced_score', 'N/A')}")
+        print(f"   Satış: {product.get('sold_count', 'N/A')}")
+        print()
+    
+    if files:
+        json_file, csv_top_selling_file, csv_high_potential_file = files
         print(f"\nDetaylı sonuçlar: {json_file}")
         print(f"CSV raporu (En Çok Satanlar): {csv_top_selling_file}")
         print(f"CSV raporu (Yüksek Potansiyelliler): {csv_high_potential_file}")
-        
+
+def _transport_from_args(args):
+    """--record / --replay seçeneklerinden taşıma katmanı (verilmediyse canlı oturum)"""
+    if getattr(args, 'replay', None):
+        from transport import ReplayTransport
+        return ReplayTransport(args.replay, latency=args.replay_latency, jitter=args.replay_jitter)
+    if getattr(args, 'record', None):
+        from transport import RecordingTransport
+        return RecordingTransport(args.record)
+    return None
+
+def _scraper_from_args(args, history_db=None, delta_snapshot=None):
+    """Alt komut seçeneklerinden scraper oluştur (geçmiş/delta depoları yalnızca analiz eden komutlarda)"""
+    transport = _transport_from_args(args)
+    # Kayıt/oynatmada yanıt önbelleği kapalı: önbellekten dönen sorgular arşive girmez/arşivden gelmez
+    scraper = EbayScraper(
+        max_concurrency=args.concurrency,
+        requests_per_second=args.rps,
+        cache_dir=None if transport is not None else args.cache_dir or None,
+        history_db=history_db or None,
+        delta_snapshot=delta_snapshot or None,
+        velocity_weight=getattr(args, 'velocity_weight', 0.0),
+        metrics=RunMetrics(profile=args.profile, profile_stages=args.profile_stage, profile_dir=args.profile_dir),
+        metrics_prom_path=args.metrics_prom,
+        transport=transport
+    )
+    if getattr(args, 'base_url', None):
+        scraper.base_url = args.base_url
+    return scraper
+
+def command_run(args):
+    """Tam çalıştırma: veri çek, analiz et, kaydet ve özetle (varsayılan)
+    
+    Zamanlayıcı servisiyle aynı dosya kilidini alır; cron ile başlatılan
+    çalıştırmalar birbiriyle veya servisle çakışmaz.
+    """
+    lock = RunLock(args.lock) if args.lock else None
+    if lock is not None and not acquire_run_lock(lock, args.overlap):
+        logger.warning(f"Çalıştırma atlandı: başka bir çalıştırma sürüyor ({args.lock})")
+        return
+    try:
+        scraper = _scraper_from_args(args, args.history_db, args.delta_snapshot)
+        try:
+            results = scraper.run_market_research(categories=args.category, keywords=args.keyword)
+            files = scraper.save_results(results, filename_prefix=args.prefix, parquet_dir=args.parquet_dir or None,
+                                         snapshot=not args.no_snapshot)
+            print_report(results, files)
+        finally:
+            scraper.close()
+    finally:
+        if lock is not None:
+            lock.release()
+
+def command_fetch(args):
+    """Yalnızca veri çek ve ayrıştır; ürünleri analiz etmeden JSONL dosyasına yaz (numpy yüklenmez)"""
+    scraper = _scraper_from_args(args)
+    try:
+        products = scraper.collect_products(categories=args.category, keywords=args.keyword)
+    finally:
+        scraper.close()
+    output = args.output or f"ebay_products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    count = write_jsonl(products, output)
+    metrics_filename = f"{os.path.splitext(output)[0]}_metrics.json"
+    scraper.metrics.write_json(metrics_filename)
+    if args.metrics_prom:
+        scraper.metrics.write_prometheus(args.metrics_prom)
+    print(f"{count} ürün kaydedildi: {output} (metrikler: {metrics_filename})")
+
+def command_analyze(args):
+    """fetch çıktısını analiz et, rapor dosyalarını kaydet ve özetle"""
+    products = [product for path in args.products for product in read_jsonl(path)]
+    scraper = _scraper_from_args(args, args.history_db, args.delta_snapshot)
+    try:
+        results = scraper.build_report(products)
+        files = scraper.save_results(results, filename_prefix=args.prefix, parquet_dir=args.parquet_dir or None,
+                                     snapshot=not args.no_snapshot)
+        if args.scored_output:
+            write_jsonl(scraper.last_analyzed_products, args.scored_output)
+        print_report(results, files)
+    finally:
+        scraper.close()
+
+def command_report(args):
+    """Kaydedilmiş sonuç JSON'unun özetini yazdır (veri çekme/analiz yok)"""
+    with open(args.results, 'r', encoding='utf-8') as f:
+        print_report(json.load(f))
+
+def command_compare(args):
+    """Kayıtlı ikili anlık görüntüleri (`*.snap`) karşılaştır: çalıştırma başına özet ve toplu içgörüler"""
+    from run_snapshot import open_snapshots, compare_runs, snapshot_insights
+    snapshots = open_snapshots(args.snapshots)
+    if not snapshots:
+        print("Anlık görüntü bulunamadı")
+        return
+    print(f"{'Çalıştırma':<17} {'Ürün':>9} {'Ort. skor':>10} {'Ort. fiyat':>11} {'Medyan fiyat':>13} {'Toplam satış':>13}")
+    for row in compare_runs(snapshots):
+        print(f"{row['run_id'] or '-':<17} {row['total_products']:>9,} {row['average_score']:>10.2f} "
+              f"{row['average_price']:>11.2f} {row['median_price']:>13.2f} {row['total_sold']:>13,}")
+    insights = snapshot_insights(snapshots)
+    print(f"\nToplam: {insights.get('total_products', 0):,} ürün, {len(snapshots)} çalıştırma")
+    print(json.dumps(insights, ensure_ascii=False, indent=2))
+
+def command_export(args):
+    """JSONL ürün dosyalarını bölümlenmiş Parquet veri setine aktar (yalnızca pyarrow yüklenir)"""
+    from parquet_export import ParquetExporter
+    exporter = ParquetExporter(args.parquet_dir, run_id=datetime.now().strftime("%Y%m%d_%H%M%S"))
+    # Tüm girdiler tek akışta yazılır; write() sonunda dosyaları kapattığı için
+    # dosya başına çağrı aynı bölüm dosyasını yeniden açıp üzerine yazardı
+    exporter.write(product for path in args.products for product in read_jsonl(path))
+    print(f"{exporter.rows_written} ürün Parquet olarak yazıldı: {args.parquet_dir}")
+
+def _option_parsers(suppress_defaults=False):
+    """Ortak seçenek grupları: (veri çekme, metrik, çıktı)
+    
+    Alt komut kopyaları varsayılan değer taşımaz (SUPPRESS); böylece alt
+    komuttan önce verilen seçenekler alt komutun varsayılanlarıyla ezilmez.
+    """
+    def default(value):
+        return argparse.SUPPRESS if suppress_defaults else value
+    
+    fetch_options = argparse.ArgumentParser(add_help=False)
+    fetch_options.add_argument('--cache-dir', default=default('.ebay_cache'), help='Yanıt önbelleği dizini (boş: kapalı)')
+    fetch_options.add_argument('--concurrency', type=int, default=default(4), help='Eşzamanlı istek sayısı')
+    fetch_options.add_argument('--rps', type=float, default=default(1.0), help='Host başına saniyedeki istek')
+    fetch_options.add_argument('--base-url', default=default(None), help='Arama URL\'si (varsayılan: ebay.com)')
+    fetch_options.add_argument('--category', action='append', default=default(None),
+                               help='Yalnızca bu kategori (birden fazla verilebilir)')
+    fetch_options.add_argument('--keyword', action='append', default=default(None),
+                               help='Yalnızca bu trend terimi (birden fazla verilebilir)')
+    transport_options = fetch_options.add_mutually_exclusive_group()
+    transport_options.add_argument('--record', default=default(None), metavar='ARŞİV',
+                                   help='Canlı yanıtları arşive kaydet (.tar.zst veya .tar.gz; önbellek kapalı)')
+    transport_options.add_argument('--replay', default=default(None), metavar='ARŞİV',
+                                   help='Ağa çıkmadan kayıtlı arşivden oynat')
+    fetch_options.add_argument('--replay-latency', type=float, default=default(0.0), help='Oynatmada yanıt başına gecikme (sn)')
+    fetch_options.add_argument('--replay-jitter', type=float, default=default(0.0), help='Oynatmada gecikme sapması (± sn)')
+    
+    # Metrik ve profil seçenekleri hem veri çeken hem analiz eden komutlarda geçerlidir
+    metrics_options = argparse.ArgumentParser(add_help=False)
+    metrics_options.add_argument('--metrics-prom', default=default(None), help='Prometheus metin dosyası (textfile toplayıcısı)')
+    metrics_options.add_argument('--profile', choices=PROFILERS, default=default(None), help='Aşamaları profille')
+    metrics_options.add_argument('--profile-stage', action='append', default=default(None),
+                                 help='Yalnızca bu aşamayı profille (ör. score, fetch)')
+    metrics_options.add_argument('--profile-dir', default=default('profiles'), help='Profil çıktı dizini')
+    
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument('--prefix', default=default('ebay_market_research'), help='Çıktı dosyası öneki')
+    output_options.add_argument('--history-db', default=default('ebay_history.sqlite3'), help='Ürün geçmişi veritabanı (boş: kapalı)')
+    output_options.add_argument('--parquet-dir', default=default('parquet'), help='Parquet dizini (boş: kapalı)')
+    output_options.add_argument('--delta-snapshot', default=default(None), help='Delta modu anlık görüntü dosyası')
+    output_options.add_argument('--no-snapshot', action='store_true', default=default(False),
+                                help='İkili çalıştırma anlık görüntüsünü (.snap) yazma')
+    output_options.add_argument('--velocity-weight', type=float, default=default(0.0),
+                                help='Satış hızı skor ağırlığı (geçmiş deposu gerekir; diğer ağırlıklar orantılı azalır)')
+    
+    return fetch_options, metrics_options, output_options
+
+def build_arg_parser():
+    """Komut satırı: fetch / analyze / report / export (alt komutsuz: tam çalıştırma)
+    
+    Ortak seçenekler alt komuttan önce veya sonra verilebilir; varsayılanlar
+    yalnızca kök ayrıştırıcıda tanımlıdır.
+    """
+    fetch_options, metrics_options, output_options = _option_parsers()
+    sub_fetch_options, sub_metrics_options, sub_output_options = _option_parsers(suppress_defaults=True)
+    
+    # Alt komut verilmezse önceki tek seferlik davranış korunur (veri çek + analiz + kaydet)
+    parser = argparse.ArgumentParser(description="eBay piyasa araştırması", parents=[fetch_options, output_options, metrics_options])
+    parser.add_argument('--lock', default='ebay_scraper.lock',
+                        help='Tam çalıştırma kilidi dosyası; zamanlayıcı servisiyle paylaşılır (boş: kapalı)')
+    parser.add_argument('--overlap', choices=OVERLAP_POLICIES, default='skip',
+                        help='Kilit doluysa: çalıştırmayı atla (skip) veya bekle (queue)')
+    parser.set_defaults(func=command_run)
+    
+    subparsers = parser.add_subparsers(dest='command')
+    
+    fetch = subparsers.add_parser('fetch', parents=[sub_fetch_options, sub_metrics_options], help='Veri çek ve ham ürünleri JSONL olarak kaydet')
+    fetch.add_argument('--output', '-o', default=None, help='Çıktı JSONL dosyası')
+    fetch.set_defaults(func=command_fetch)
+    
+    analyze = subparsers.add_parser('analyze', parents=[sub_output_options, sub_metrics_options], help='JSONL ürünlerini analiz et ve raporla')
+    analyze.add_argument('products', nargs='+', help='fetch çıktısı JSONL dosyaları')
+    analyze.add_argument('--scored-output', default=None, help='Skorlanan ürünlerin yazılacağı JSONL dosyası')
+    analyze.set_defaults(func=command_analyze, cache_dir='', concurrency=1, rps=1.0)
+    
+    report = subparsers.add_parser('report', help='Kaydedilmiş sonuç JSON özetini yazdır')
+    report.add_argument('results', help='save_results ile kaydedilen JSON dosyası')
+    report.set_defaults(func=command_report)
+    
+    compare = subparsers.add_parser('compare', help='Kayıtlı .snap anlık görüntülerini karşılaştır')
+    compare.add_argument('snapshots', nargs='+', help='.snap dosyaları, glob desenleri veya dizinler')
+    compare.set_defaults(func=command_compare)
+    
+    export = subparsers.add_parser('export', help='JSONL ürünlerini Parquet veri setine aktar')
+    export.add_argument('products', nargs='+', help='JSONL ürün dosyaları')
+    export.add_argument('--parquet-dir', default=argparse.SUPPRESS, help='Parquet dizini')
+    export.set_defaults(func=command_export)
+    
+    return parser
+
+def main(argv=None):
+    """Ana fonksiyon"""
+    args = build_arg_parser().parse_args(argv)
+    try:
+        args.func(args)
     except Exception as e:
         logger.error(f"Ana fonksiyon hatası: {e}")
         raise
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Eşzamanlı Veri Çekme Motoru
+Bu modül arama sayfalarını havuzlanmış keep-alive bağlantılarla, sınırlı
+eşzamanlılıkla ve host başına token-bucket hız sınırıyla çeker. İstekler
+zaman aşımı, yeniden deneme, devre kesici ve uyarlanabilir eşzamanlılık
+katmanından (resilience) geçer. İstekler değiştirilebilir bir taşıma
+katmanıyla (transport) gönderilir: canlı, kayıt veya çevrimdışı tekrar oynatma.
+"""
+
+import asyncio
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from response_cache import ResponseCache, make_cache_key
+from resilience import RetryPolicy, CircuitBreaker, AdaptiveLimiter, RetryableStatusError
+from transport import LiveTransport
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Host başına token-bucket hız sınırlayıcı (thread-safe)"""
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = float(rate)
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Bir token ayır ve token hazır olana kadar beklenecek süreyi döndür"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Token yoksa borçlan: sonraki istekler sırayla daha uzun bekler
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Token alınana kadar thread'i beklet"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Token alınana kadar coroutine'i beklet"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class FetchEngine:
+    """Paylaşılan requests.Session üzerinde eşzamanlı ve kibar veri çekme motoru"""
+
+    def __init__(self, session: requests.Session, max_concurrency: int = 4,
+                 requests_per_second: float = 1.0, burst: int = 2,
+                 cache: Optional[ResponseCache] = None, timeout: Tuple[float, float] = (5.0, 20.0),
+                 retry_policy: Optional[RetryPolicy] = None, breaker_threshold: int = 5,
+                 breaker_reset: float = 30.0, latency_target: float = 5.0, metrics=None, transport=None):
+        self.session = session
+        self.cache = cache
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        
+        # Dayanıklılık: (bağlanma, okuma) zaman aşımı, yeniden deneme, devre kesici, AIMD
+        self.timeout = timeout
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self.latency_target = latency_target
+        
+        # İsteğe bağlı RunMetrics: gecikme histogramları, bayt ve yeniden deneme sayaçları
+        self.metrics = metrics
+        
+        # Taşıma katmanı: varsayılan canlı oturum; kayıt/tekrar oynatma için değiştirilebilir
+        self.transport = transport if transport is not None else LiveTransport(session)
+        self.transport.attach(session)
+
+        # Keep-alive bağlantı havuzu eşzamanlılık kadar büyük olmalı
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._buckets_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _per_host(self, registry: Dict[str, Any], url: str, factory):
+        """URL'nin host'una ait nesneyi (yoksa oluşturarak) döndür"""
+        host = urlsplit(url).netloc.lower()
+        with self._buckets_lock:
+            item = registry.get(host)
+            if item is None:
+                item = factory()
+                registry[host] = item
+            return item
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        """URL'nin host'una ait token bucket'ı döndür"""
+        return self._per_host(self._buckets, url, lambda: TokenBucket(self.requests_per_second, self.burst))
+
+    def _breaker_for(self, url: str) -> CircuitBreaker:
+        """URL'nin host'una ait devre kesiciyi döndür"""
+        return self._per_host(self._breakers, url, lambda: CircuitBreaker(self.breaker_threshold, self.breaker_reset))
+
+    def _limiter_for(self, url: str) -> AdaptiveLimiter:
+        """URL'nin host'una ait uyarlanabilir eşzamanlılık sınırlayıcısını döndür"""
+        return self._per_host(self._limiters, url,
+                              lambda: AdaptiveLimiter(self.max_concurrency, latency_target=self.latency_target))
+
+    def _pace(self, url: str):
+        """Host hız sınırına uy (tekrar oynatmada sunucu olmadığı için beklenmez)"""
+        if self.transport.rate_limited:
+            self._bucket_for(url).acquire()
+
+    async def _pace_async(self, url: str):
+        if self.transport.rate_limited:
+            await self._bucket_for(url).acquire_async()
+
+    @staticmethod
+    def _metrics_label(url: str, params: Optional[Dict[str, Any]]) -> str:
+        """Sorgu başına metrik etiketi: arama terimi (_nkw), yoksa host"""
+        if params and params.get('_nkw'):
+            return str(params['_nkw'])
+        return urlsplit(url).netloc.lower()
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]], headers) -> requests.Response:
+        """Tek bir denemeyi devre kesici ve eşzamanlılık sınırı altında gönder"""
+        breaker = self._breaker_for(url)
+        limiter = self._limiter_for(url)
+        breaker.allow()
+        limiter.acquire()
+        start = time.monotonic()
+        ok = False
+        status = 'error'
+        try:
+            response = self.transport.get(url, params=params, headers=headers, timeout=self.timeout)
+            ok = response.status_code not in self.retry_policy.retry_statuses
+            status = response.status_code
+            return response
+        finally:
+            latency = time.monotonic() - start
+            limiter.release(latency, ok)
+            if self.metrics is not None:
+                host = urlsplit(url).netloc.lower()
+                self.metrics.observe('http_request_seconds', latency, host=host)
+                self.metrics.inc('http_requests_total', host=host, status=status)
+            # 404 gibi istemci hataları host sağlığını göstermez; yalnızca 429/5xx ve ağ hataları sayılır
+            if ok:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None, cached=None) -> bytes:
+        """Tek bir GET isteği gönder ve gövdeyi döndür (önbellek varsa koşullu istek)
+
+        Zaman aşımı, bağlantı hataları ve 429/5xx yanıtlarında jitter'lı üstel
+        geri çekilmeyle yeniden denenir; ilk deneme dışındaki denemeler de hız
+        sınırına uyar.
+        """
+        headers = cached.validators() if cached is not None else None
+        policy = self.retry_policy
+        for attempt in range(policy.max_attempts):
+            if attempt:
+                self._pace(url)
+            last_attempt = attempt == policy.max_attempts - 1
+            try:
+                response = self._send(url, params, headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = policy.delay(attempt)
+                if self.metrics is not None:
+                    self.metrics.inc('fetch_retries_total', reason=type(e).__name__)
+                logger.warning(f"İstek hatası, {delay:.2f} sn sonra yeniden denenecek ({attempt + 1}/{policy.max_attempts}): {e}")
+                time.sleep(delay)
+                continue
+
+            if response.status_code in policy.retry_statuses:
+                if last_attempt:
+                    raise RetryableStatusError(response.status_code, url)
+                delay = policy.delay(attempt, response.headers.get('Retry-After'))
+                if policy.exceeds_budget(delay):
+                    # Sunucu bütçeden uzun bekleme istiyor: erken denemek yerine host'un devresi
+                    # o süre boyunca açılır, bu ve sonraki istekler hemen başarısız olur
+                    response.close()
+                    self._breaker_for(url).trip(delay)
+                    if self.metrics is not None:
+                        self.metrics.inc('fetch_retry_after_exceeded_total', host=urlsplit(url).netloc.lower())
+                    logger.warning(f"HTTP {response.status_code}, Retry-After {delay:.0f} sn bütçeyi "
+                                   f"({policy.max_retry_after:.0f} sn) aşıyor, yeniden denenmeyecek: {url}")
+                    raise RetryableStatusError(response.status_code, url, retry_after=delay)
+                if self.metrics is not None:
+                    self.metrics.inc('fetch_retries_total', reason=f"http_{response.status_code}")
+                logger.warning(f"HTTP {response.status_code}, {delay:.2f} sn sonra yeniden denenecek "
+                               f"({attempt + 1}/{policy.max_attempts}): {url}")
+                response.close()
+                time.sleep(delay)
+                continue
+            break
+
+        # 304: sunucudaki içerik değişmemiş, önbellekteki gövde geçerli
+        if cached is not None and response.status_code == 304:
+            self.cache.refresh(cached)
+            if self.metrics is not None:
+                self.metrics.inc('fetch_cache_total', result='revalidated')
+            return cached.content
+
+        response.raise_for_status()
+        if self.metrics is not None:
+            self.metrics.inc('fetch_bytes_total', len(response.content), host=urlsplit(url).netloc.lower())
+        if self.cache is not None:
+            self.cache.put(make_cache_key(url, params), response.content, response.headers)
+        return response.content
+
+    def _lookup(self, url: str, params: Optional[Dict[str, Any]]):
+        """Önbellekte taze girdi varsa (gövde, None), yoksa (None, yeniden doğrulanacak girdi)"""
+        if self.cache is None:
+            return None, None
+        entry, fresh = self.cache.lookup(make_cache_key(url, params))
+        if fresh:
+            return entry.content, None
+        return None, entry
+
+    def fetch(self, url: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+        """Hız sınırına uyarak tek bir sayfayı senkron çek"""
+        start = time.monotonic()
+        content, cached = self._lookup(url, params)
+        if content is None:
+            self._pace(url)
+            content = self._get(url, params, cached)
+        elif self.metrics is not None:
+            self.metrics.inc('fetch_cache_total', result='hit')
+        if self.metrics is not None:
+            self.metrics.observe('fetch_seconds', time.monotonic() - start, query=self._metrics_label(url, params))
+        return content
+
+    async def fetch_async(self, url: str, params: Optional[Dict[str, Any]] = None,
+                          semaphore: Optional[asyncio.Semaphore] = None) -> bytes:
+        """Hız sınırına uyarak tek bir sayfayı asenkron çek"""
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with semaphore:
+            # Sorgu gecikmesi: hız sınırı beklemesi ve yeniden denemeler dahil
+            start = time.monotonic()
+            loop = asyncio.get_running_loop()
+            content, cached = await loop.run_in_executor(self._get_executor(), self._lookup, url, params)
+            if content is None:
+                await self._pace_async(url)
+                content = await loop.run_in_executor(self._get_executor(), self._get, url, params, cached)
+            elif self.metrics is not None:
+                self.metrics.inc('fetch_cache_total', result='hit')
+            if self.metrics is not None:
+                self.metrics.observe('fetch_seconds', time.monotonic() - start, query=self._metrics_label(url, params))
+            return content
+
+    async def fetch_all(self, requests_list: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Union[bytes, Exception]]:
+        """İstek listesini eşzamanlı çek; sonuçlar giriş sırasıyla döner, hatalar istisna nesnesi olarak"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [self.fetch_async(url, params, semaphore) for url, params in requests_list]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self, requests_list: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Union[bytes, Exception]]:
+        """fetch_all için senkron sarmalayıcı"""
+        return asyncio.run(self.fetch_all(requests_list))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Bloklayan HTTP çağrıları için thread havuzu"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='fetch')
+        return self._executor
+
+    def close(self):
+        """Thread havuzunu, taşıma katmanını (kayıt arşivi burada yazılır) ve HTTP oturumunu kapat"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.transport.close()
+        self.session.close()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Ürün Geçmişi Deposu
+Bu modül analiz edilen tüm ürünleri gömülü, indeksli bir SQLite
+veritabanında saklar. Her çalıştırma tek bir işlemde (transaction) toplu
+upsert yapar; geçmiş sorguları imleç üzerinden akış halinde döner, böylece
+analizör tüm geçmişi belleğe yüklemeden kullanabilir.
+"""
+
+import sqlite3
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+from product_record import extract_item_id
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id     TEXT PRIMARY KEY,
+    url         TEXT,
+    title       TEXT,
+    seller      TEXT,
+    image_url   TEXT,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    item_id         TEXT NOT NULL,
+    scraped_at      TEXT NOT NULL,
+    search_keyword  TEXT NOT NULL DEFAULT '',
+    price           REAL,
+    sold_count      INTEGER,
+    watchers        INTEGER,
+    shipping        TEXT,
+    advanced_score  REAL,
+    run_id          TEXT,
+    PRIMARY KEY (item_id, scraped_at, search_keyword)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_snapshots_keyword_time ON snapshots (search_keyword, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots (scraped_at);
+CREATE INDEX IF NOT EXISTS idx_items_url ON items (url);
+"""
+
+class ProductHistoryStore:
+    """Ürün anlık görüntülerinin (snapshot) kalıcı SQLite deposu"""
+
+    def __init__(self, db_path: str = 'ebay_history.sqlite3'):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def upsert_products(self, products: Iterable[Any], run_id: Optional[str] = None) -> int:
+        """Analiz edilen ürünleri tek bir işlemde toplu olarak ekle/güncelle"""
+        run_id = run_id or datetime.now().isoformat()
+        item_rows = []
+        snapshot_rows = []
+        for product in products:
+            url = product.get('url')
+            item_id = extract_item_id(url, fallback=f"{product.get('title')}|{product.get('image_url')}")
+            scraped_at = product.get('scraped_at') or run_id
+            item_rows.append((item_id, url, product.get('title'), product.get('seller'),
+                              product.get('image_url'), scraped_at, scraped_at))
+            snapshot_rows.append((item_id, scraped_at, product.get('search_keyword') or '',
+                                  product.get('price'), product.get('sold_count'), product.get('watchers'),
+                                  product.get('shipping'), product.get('advanced_score'), run_id))
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO items (item_id, url, title, seller, image_url, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (item_id) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    seller = excluded.seller,
+                    image_url = excluded.image_url,
+                    first_seen = MIN(items.first_seen, excluded.first_seen),
+                    last_seen = MAX(items.last_seen, excluded.last_seen)
+            """, item_rows)
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO snapshots
+                    (item_id, scraped_at, search_keyword, price, sold_count, watchers, shipping, advanced_score, run_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, snapshot_rows)
+
+        logger.info(f"Geçmiş deposuna {len(snapshot_rows)} ürün anlık görüntüsü yazıldı")
+        return len(snapshot_rows)
+
+    @staticmethod
+    def _since(days: float) -> str:
+        return (datetime.now() - timedelta(days=days)).isoformat()
+
+    def sold_count_deltas(self, days: float = 7, limit: Optional[int] = None,
+                          keyword: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Son `days` gün içindeki ilk ve son anlık görüntü arasındaki satış artışı (ürün başına)
+
+        keyword verilirse ilk/son anlık görüntüler de yalnızca o terimin
+        satırlarından seçilir. Aynı anda birden fazla terimde görülen ürünün o
+        andaki satış sayısı, terim satırlarının en büyüğüdür.
+        """
+        keyword_filter = 'AND search_keyword = :keyword' if keyword is not None else ''
+        # İlk/son satış sayıları birincil anahtar (item_id, scraped_at) önekiyle okunur
+        query = f"""
+            SELECT item_id, first_sold, last_sold, last_sold - first_sold AS sold_delta,
+                   first_at, last_at, snapshot_count
+            FROM (
+                SELECT b.item_id,
+                       (SELECT MAX(sold_count) FROM snapshots
+                        WHERE item_id = b.item_id AND scraped_at = b.first_at {keyword_filter}) AS first_sold,
+                       (SELECT MAX(sold_count) FROM snapshots
+                        WHERE item_id = b.item_id AND scraped_at = b.last_at {keyword_filter}) AS last_sold,
+                       b.first_at,
+                       b.last_at,
+                       b.snapshot_count
+                FROM (
+                    SELECT item_id, MIN(scraped_at) AS first_at, MAX(scraped_at) AS last_at,
+                           COUNT(DISTINCT scraped_at) AS snapshot_count
+                    FROM snapshots
+                    WHERE scraped_at >= :since {keyword_filter}
+                    GROUP BY item_id
+                ) AS b
+            )
+            ORDER BY sold_delta DESC, item_id
+            {'LIMIT :limit' if limit is not None else ''}
+        """
+        cursor = self.conn.execute(query, {'since': self._since(days), 'keyword': keyword, 'limit': limit})
+        for row in cursor:
+            yield dict(row)
+
+    def item_history(self, item_id: str) -> Iterator[Dict[str, Any]]:
+        """Bir ürünün tüm anlık görüntüleri (zamana göre sıralı)"""
+        cursor = self.conn.execute(
+            "SELECT * FROM snapshots WHERE item_id = ? ORDER BY scraped_at", (item_id,)
+        )
+        for row in cursor:
+            yield dict(row)
+
+    def keyword_history(self, keyword: str, days: float = 7) -> Iterator[Dict[str, Any]]:
+        """Bir arama teriminin son `days` gündeki anlık görüntüleri"""
+        cursor = self.conn.execute(
+            "SELECT * FROM snapshots WHERE search_keyword = ? AND scraped_at >= ? ORDER BY scraped_at",
+            (keyword, self._since(days))
+        )
+        for row in cursor:
+            yield dict(row)
+
+    def stats(self) -> Dict[str, int]:
+        """Depo özet sayıları"""
+        items = self.conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        snapshots = self.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+        return {'items': items, 'snapshots': snapshots}
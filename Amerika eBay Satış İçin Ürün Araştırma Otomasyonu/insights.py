@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Akış Halinde İçgörü Toplayıcı
+Bu modül generate_insights çıktısını ürünleri tek tek (veya parça parça)
+tüketerek, veri setini bellekte tutmadan tek geçişte üretir. Paralel
+çalışanların kısmi toplayıcıları merge() ile birleştirilebilir.
+"""
+
+import math
+from typing import List, Dict, Any, Iterable, Optional
+
+from term_sketch import TrendTermTracker
+
+# Fiyat histogramı kovaları: (etiket, üst sınır)
+PRICE_BUCKETS = (
+    ('$0-$25', 25),
+    ('$25-$50', 50),
+    ('$50-$100', 100),
+    ('$100-$250', 250),
+    ('$250-$500', 500),
+    ('$500+', float('inf')),
+)
+
+# Skor dağılımı kovaları: (etiket, alt sınır)
+SCORE_BUCKETS = (
+    ('high_potential', 80),
+    ('medium_potential', 60),
+    ('low_potential', 40),
+    ('poor_potential', float('-inf')),
+)
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+class RunningSum:
+    """Telafili (Neumaier) toplam; birleştirilebilir"""
+
+    __slots__ = ('total', 'compensation')
+
+    def __init__(self):
+        self.total = 0.0
+        self.compensation = 0.0
+
+    def add(self, value: float):
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    def merge(self, other: 'RunningSum'):
+        self.add(other.total)
+        self.add(other.compensation)
+
+    @property
+    def value(self) -> float:
+        return self.total + self.compensation
+
+class QuantileSketch:
+    """Sınırlı bellekli, birleştirilebilir yaklaşık kantil özeti (KLL tarzı sıkıştırıcı)
+
+    Seviye h'deki her örnek 2**h ağırlık taşır. Tek seviye varken (sayı k'yı
+    aşmadıysa) sonuçlar kesindir ve pandas'ın doğrusal interpolasyonuyla aynıdır.
+    """
+
+    def __init__(self, k: int = 512):
+        self.k = k
+        self.count = 0
+        self.levels: List[List[float]] = [[]]
+        self._offset = 0
+
+    def add(self, value: float):
+        self.levels[0].append(value)
+        self.count += 1
+        if len(self.levels[0]) >= self.k:
+            self._compress()
+
+    def merge(self, other: 'QuantileSketch'):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, values in zip(self.levels, other.levels):
+            level.extend(values)
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        """Dolu seviyeleri sırala, her ikinci örneği bir üst seviyeye taşı"""
+        for height in range(len(self.levels)):
+            level = self.levels[height]
+            if len(level) < self.k:
+                continue
+            level.sort()
+            # Tek sayıda örnek varsa en büyüğü bu seviyede kalır (ağırlık korunur)
+            leftover = [level.pop()] if len(level) % 2 else []
+            # Seçim ofseti sırayla değişir; sistematik sapmayı önler
+            promoted = level[self._offset::2]
+            self._offset ^= 1
+            if height + 1 == len(self.levels):
+                self.levels.append([])
+            self.levels[height + 1].extend(promoted)
+            self.levels[height] = leftover
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.levels) == 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q kantilini döndür (0 <= q <= 1)"""
+        if self.count == 0:
+            return None
+
+        if self.is_exact:
+            values = sorted(self.levels[0])
+            position = q * (len(values) - 1)
+            lower = math.floor(position)
+            upper = min(lower + 1, len(values) - 1)
+            fraction = position - lower
+            if fraction == 0:
+                return float(values[lower])
+            return float(values[lower] + (values[upper] - values[lower]) * fraction)
+
+        weighted = sorted((value, 1 << height) for height, level in enumerate(self.levels) for value in level)
+        total_weight = sum(weight for _, weight in weighted)
+        target = q * total_weight
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return float(value)
+        return float(weighted[-1][0])
+
+    def median(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+class InsightsAggregator:
+    """generate_insights ile aynı yapıda içgörüleri artımlı olarak toplayan nesne"""
+
+    def __init__(self, sketch_k: int = 512, term_capacity: int = 2000):
+        self.total_products = 0
+
+        # Skor istatistikleri
+        self.score_count = 0
+        self.score_sum = RunningSum()
+        self.score_distribution = {label: 0 for label, _ in SCORE_BUCKETS}
+
+        # Fiyat istatistikleri
+        self.price_count = 0
+        self.price_sum = RunningSum()
+        self.price_min = math.inf
+        self.price_max = -math.inf
+        self.price_sketch = QuantileSketch(sketch_k)
+        self.price_ranges = {label: 0 for label, _ in PRICE_BUCKETS}
+
+        # Arama terimi başına skor toplamı ve sayısı
+        self.keyword_scores: Dict[str, List[float]] = {}
+
+        # Başlık kelime ve bigram sıklıkları (sınırlı bellekli heavy-hitters özeti)
+        self.terms = TrendTermTracker(term_capacity)
+
+    def add(self, product: Any):
+        """Tek bir ürünü tüket"""
+        self.total_products += 1
+
+        score = product.get('advanced_score')
+        if not _is_missing(score):
+            self.score_count += 1
+            self.score_sum.add(score)
+            for label, lower_bound in SCORE_BUCKETS:
+                if score >= lower_bound:
+                    self.score_distribution[label] += 1
+                    break
+
+            keyword = product.get('search_keyword')
+            if keyword is not None:
+                stats = self.keyword_scores.get(keyword)
+                if stats is None:
+                    self.keyword_scores[keyword] = [score, 1]
+                else:
+                    stats[0] += score
+                    stats[1] += 1
+
+        price = product.get('price')
+        if not _is_missing(price):
+            self.price_count += 1
+            self.price_sum.add(price)
+            if price < self.price_min:
+                self.price_min = price
+            if price > self.price_max:
+                self.price_max = price
+            self.price_sketch.add(price)
+            for label, upper_bound in PRICE_BUCKETS:
+                if price < upper_bound:
+                    self.price_ranges[label] += 1
+                    break
+
+        title = product.get('title')
+        if title:
+            self.add_title(title)
+
+    def add_title(self, title: str):
+        """Başlıktaki kelimeleri ve bigramları say"""
+        self.terms.add_title(title)
+
+    def add_many(self, products: Iterable[Any]) -> 'InsightsAggregator':
+        """Bir ürün parçasını (batch) tüket"""
+        for product in products:
+            self.add(product)
+        return self
+
+    def merge(self, other: 'InsightsAggregator') -> 'InsightsAggregator':
+        """Başka bir çalışanın kısmi toplayıcısını bu toplayıcıya ekle"""
+        self.total_products += other.total_products
+
+        self.score_count += other.score_count
+        self.score_sum.merge(other.score_sum)
+        for label, count in other.score_distribution.items():
+            self.score_distribution[label] += count
+
+        self.price_count += other.price_count
+        self.price_sum.merge(other.price_sum)
+        self.price_min = min(self.price_min, other.price_min)
+        self.price_max = max(self.price_max, other.price_max)
+        self.price_sketch.merge(other.price_sketch)
+        for label, count in other.price_ranges.items():
+            self.price_ranges[label] += count
+
+        for keyword, (score_total, count) in other.keyword_scores.items():
+            stats = self.keyword_scores.setdefault(keyword, [0.0, 0])
+            stats[0] += score_total
+            stats[1] += count
+
+        self.terms.merge(other.terms)
+        return self
+
+    def top_trends(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """En sık geçen başlık kelimeleri"""
+        return self.terms.top_terms(limit)
+
+    def result(self) -> Dict[str, Any]:
+        """Toplanan durumdan içgörü sözlüğünü üret"""
+        if self.total_products == 0:
+            return {}
+
+        insights = {
+            'total_products': self.total_products,
+            'average_score': self.score_sum.value / self.score_count if self.score_count else 0,
+            'score_distribution': dict(self.score_distribution) if self.score_count else {},
+            'price_analysis': {},
+            'category_performance': {
+                keyword: float(score_total / count)
+                for keyword, (score_total, count) in sorted(self.keyword_scores.items())
+            },
+            'top_trends': self.top_trends(),
+            'top_phrases': self.terms.top_phrases()
+        }
+
+        if self.price_count:
+            insights['price_analysis'] = {
+                'average_price': float(self.price_sum.value / self.price_count),
+                'median_price': self.price_sketch.median(),
+                'min_price': float(self.price_min),
+                'max_price': float(self.price_max),
+                'price_ranges': dict(self.price_ranges)
+            }
+
+        return insights
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Çok Desenli Anahtar Kelime Eşleştirici
+Bu modül trend ve kategori skorlamasında kullanılan, analizör yapılandırması
+başına bir kez derlenen eşleştiriciyi içerir. Büyük sözlüklerde Aho-Corasick
+otomatı her metni tek geçişte tarar; küçük sözlüklerde (C hızındaki `in`
+araması daha hızlı olduğu için) sıralı tarama kullanılır. Her iki yol da en
+iyi sıradaki (rank) eşleşmeyi döndürür.
+"""
+
+from collections import deque
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+
+# Bu sayıya kadar desen sıralı `in` taramasıyla eşleştirilir
+SCAN_THRESHOLD = 32
+
+class VersionedDict(dict):
+    """Her değişiklikte sürüm numarasını artıran sözlük (derlenmiş eşleştiricileri geçersiz kılmak için)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _touch(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._touch()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._touch()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._touch()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._touch()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._touch()
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._touch()
+
+class KeywordMatcher:
+    """(desen, sıra, değer) girdilerinden derlenen eşleştirici; en düşük sıralı eşleşmenin değerini döndürür"""
+
+    def __init__(self, entries: Iterable[Tuple[str, Any, Any]], scan_threshold: int = SCAN_THRESHOLD):
+        # Aynı desen birden fazla kez verilirse en iyi sıralı girdi geçerlidir
+        best: Dict[str, Tuple[Any, Any]] = {}
+        for pattern, rank, value in entries:
+            current = best.get(pattern)
+            if current is None or rank < current[0]:
+                best[pattern] = (rank, value)
+
+        # Sıraya göre dizili desenler: sıralı taramada ilk eşleşme en iyisidir
+        self.patterns: List[Tuple[str, Any, Any]] = sorted(
+            ((pattern, rank, value) for pattern, (rank, value) in best.items()), key=lambda entry: entry[1]
+        )
+        self.use_automaton = len(self.patterns) > scan_threshold
+        if self.use_automaton:
+            self._build()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _build(self):
+        """Aho-Corasick otomatını kur: trie, başarısızlık bağlantıları ve durum başına en iyi çıktı"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for position, (pattern, _, _) in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(position)
+
+        # Desenler sıraya göre dizili olduğundan en küçük konum en iyi eşleşmedir
+        fail = [0] * len(goto)
+        best = [min(output) if output else None for output in outputs]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                outputs[next_state].extend(outputs[fail[next_state]])
+                inherited = best[fail[next_state]]
+                if inherited is not None and (best[next_state] is None or inherited < best[next_state]):
+                    best[next_state] = inherited
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+        self._best = best
+
+    def _states(self, text: str):
+        """Metin boyunca ziyaret edilen otomat durumları (tek geçiş)"""
+        goto = self._goto
+        fail = self._fail
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            yield state
+
+    def best_position(self, text: str) -> Optional[int]:
+        """Metinde geçen en iyi sıralı desenin konumu; eşleşme yoksa None"""
+        if not self.use_automaton:
+            for position, (pattern, _, _) in enumerate(self.patterns):
+                if pattern in text:
+                    return position
+            return None
+
+        best = self._best
+        found = best[0]
+        for state in self._states(text):
+            candidate = best[state]
+            if candidate is not None and (found is None or candidate < found):
+                found = candidate
+                if found == 0:
+                    break
+        return found
+
+    def best(self, text: str, default: Any = None) -> Any:
+        """Metinde geçen en iyi sıralı desenin değeri"""
+        position = self.best_position(text)
+        return default if position is None else self.patterns[position][2]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Metinde geçen tüm desenler"""
+        if not self.use_automaton:
+            return {pattern for pattern, _, _ in self.patterns if pattern in text}
+
+        outputs = self._outputs
+        positions = set(outputs[0])
+        for state in self._states(text):
+            if outputs[state]:
+                positions.update(outputs[state])
+        return {self.patterns[position][0] for position in positions}
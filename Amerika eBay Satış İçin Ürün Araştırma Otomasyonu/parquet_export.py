@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Sütunsal Parquet Dışa Aktarımı
+Bu modül analiz edilen tüm ürünleri tarih ve arama terimine göre
+bölümlenmiş (Hive tarzı) Parquet dosyalarına sabit şema ve sıkıştırmayla
+yazar. Yazım akış halindedir: her bölüm için yalnızca küçük bir satır
+tamponu tutulur, dolan tampon kayıt grubu (row group) olarak diske yazılır.
+"""
+
+import os
+import logging
+from datetime import datetime
+from urllib.parse import quote
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from product_record import extract_item_id
+
+logger = logging.getLogger(__name__)
+
+# Bölüm sütunları dosyaya yazılmaz, dizin adından okunur
+PARTITION_FIELDS = ('date', 'search_keyword')
+
+# Dosyaya yazılan sütunlar (sabit sıra)
+PARQUET_FIELDS = (
+    'item_id', 'title', 'price', 'url', 'seller', 'shipping', 'sold_count', 'watchers',
+    'image_url', 'scraped_at', 'advanced_score', 'analysis_timestamp'
+)
+
+_TIMESTAMP_FIELDS = frozenset(('scraped_at', 'analysis_timestamp'))
+
+def _import_pyarrow():
+    """pyarrow'u yalnızca Parquet yazımı istendiğinde yükle"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet dışa aktarımı için pyarrow gerekli: pip install pyarrow") from e
+    return pyarrow, pyarrow.parquet
+
+def product_schema():
+    """Parquet dosyalarının sabit şeması"""
+    pa, _ = _import_pyarrow()
+    return pa.schema([
+        ('item_id', pa.string()),
+        ('title', pa.string()),
+        ('price', pa.float64()),
+        ('url', pa.string()),
+        ('seller', pa.string()),
+        ('shipping', pa.string()),
+        ('sold_count', pa.int64()),
+        ('watchers', pa.int64()),
+        ('image_url', pa.string()),
+        ('scraped_at', pa.timestamp('us')),
+        ('advanced_score', pa.float64()),
+        ('analysis_timestamp', pa.timestamp('us')),
+    ])
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+def partition_for(product: Any, default_date: str) -> Tuple[str, str]:
+    """Ürünün (tarih, arama terimi) bölümü"""
+    scraped_at = product.get('scraped_at')
+    date = scraped_at[:10] if scraped_at else default_date
+    return date, product.get('search_keyword') or '__none__'
+
+class ParquetExporter:
+    """Ürünleri bölüm başına açık tutulan ParquetWriter'larla akış halinde yazar"""
+
+    def __init__(self, base_dir: str = 'parquet', compression: str = 'zstd',
+                 batch_size: int = 10000, run_id: Optional[str] = None):
+        self.pa, self.pq = _import_pyarrow()
+        self.base_dir = base_dir
+        self.compression = compression
+        self.batch_size = max(1, int(batch_size))
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.schema = product_schema()
+
+        self._writers: Dict[Tuple[str, str], Any] = {}
+        self._buffers: Dict[Tuple[str, str], Dict[str, List[Any]]] = {}
+        self.files: List[str] = []
+        self.rows_written = 0
+
+    def _partition_path(self, partition: Tuple[str, str]) -> str:
+        date, keyword = partition
+        directory = os.path.join(self.base_dir, f"date={date}", f"search_keyword={quote(keyword, safe='')}")
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"part-{self.run_id}.parquet")
+
+    def _flush(self, partition: Tuple[str, str]):
+        """Bölüm tamponunu bir kayıt grubu olarak yaz ve boşalt"""
+        buffer = self._buffers.get(partition)
+        if not buffer or not buffer['item_id']:
+            return
+
+        writer = self._writers.get(partition)
+        if writer is None:
+            path = self._partition_path(partition)
+            writer = self.pq.ParquetWriter(path, self.schema, compression=self.compression)
+            self._writers[partition] = writer
+            self.files.append(path)
+
+        batch = self.pa.record_batch([buffer[field] for field in PARQUET_FIELDS], schema=self.schema)
+        writer.write_batch(batch)
+        self.rows_written += batch.num_rows
+        for values in buffer.values():
+            values.clear()
+
+    def add(self, product: Any, default_date: Optional[str] = None):
+        """Tek bir ürünü bölüm tamponuna ekle"""
+        partition = partition_for(product, default_date or datetime.now().strftime("%Y-%m-%d"))
+        buffer = self._buffers.get(partition)
+        if buffer is None:
+            buffer = self._buffers[partition] = {field: [] for field in PARQUET_FIELDS}
+
+        buffer['item_id'].append(extract_item_id(
+            product.get('url'), fallback=f"{product.get('title')}|{product.get('image_url')}"
+        ))
+        for field in PARQUET_FIELDS[1:]:
+            value = product.get(field)
+            if field in _TIMESTAMP_FIELDS:
+                value = _parse_timestamp(value)
+            buffer[field].append(value)
+
+        if len(buffer['item_id']) >= self.batch_size:
+            self._flush(partition)
+
+    def write(self, products: Iterable[Any]) -> List[str]:
+        """Ürün akışını yaz ve tüm dosyaları kapat; yazılan dosya yollarını döndür"""
+        default_date = datetime.now().strftime("%Y-%m-%d")
+        try:
+            for product in products:
+                self.add(product, default_date)
+        finally:
+            self.close()
+        return self.files
+
+    def close(self):
+        """Kalan tamponları yaz ve açık dosyaları kapat"""
+        for partition in list(self._buffers):
+            self._flush(partition)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+        self._buffers.clear()
+        logger.info(f"Parquet dışa aktarımı: {self.rows_written} satır, {len(self.files)} dosya ({self.base_dir})")
+
+def export_parquet(products: Iterable[Any], base_dir: str = 'parquet', compression: str = 'zstd',
+                   batch_size: int = 10000) -> List[str]:
+    """Ürünleri bölümlenmiş Parquet veri setine yaz"""
+    return ParquetExporter(base_dir, compression=compression, batch_size=batch_size).write(products)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Çok Çekirdekli Ayrıştırma/Skorlama Hattı
+Bu modül çekilen ham HTML sayfalarını bir ProcessPoolExecutor'a gönderir;
+her çalışan sayfayı ayrıştırıp skorlar ve kompakt kayıtlar (demetler)
+döndürür. Aşamalar arasındaki sınırlı kuyruklar geri basınç (backpressure)
+sağlar: ayrıştırma geride kalırsa veri çekme aşaması bekler.
+"""
+
+import asyncio
+import queue
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import List, Iterable, Iterator, Optional, Tuple, Union
+
+from product_record import PRODUCT_FIELDS, Product
+
+logger = logging.getLogger(__name__)
+
+# Çalışan süreç durumu (initializer ile bir kez kurulur)
+_WORKER_PARSER = None
+_WORKER_ANALYZER = None
+
+_DONE = object()
+
+def _init_worker(parser_backend: str):
+    """Her çalışan süreçte ayrıştırıcıyı ve analizörü bir kez oluştur"""
+    global _WORKER_PARSER, _WORKER_ANALYZER
+    from product_parser import get_parser_backend
+    from product_analyzer import ProductAnalyzer
+    _WORKER_PARSER = get_parser_backend(parser_backend)
+    _WORKER_ANALYZER = ProductAnalyzer()
+
+def parse_and_score(content: bytes, keyword: str, limit: Optional[int] = None) -> List[tuple]:
+    """Bir sayfayı ayrıştır, skorla ve PRODUCT_FIELDS sırasında demetler döndür"""
+    products = _WORKER_PARSER.parse(content, limit)
+    for product in products:
+        product.search_keyword = keyword
+    _WORKER_ANALYZER.analyze_products(products, sort_results=False)
+    return [tuple(getattr(product, field) for field in PRODUCT_FIELDS) for product in products]
+
+def records_to_products(records: List[tuple]) -> List[Product]:
+    """Çalışandan dönen demetleri Product kayıtlarına dönüştür"""
+    return [Product(*record) for record in records]
+
+class ParsePipeline:
+    """Ham sayfa -> (süreç havuzu) ayrıştır + skorla -> Product kayıtları"""
+
+    def __init__(self, workers: Optional[int] = None, parser_backend: str = 'auto',
+                 max_pending: Optional[int] = None, queue_size: Optional[int] = None):
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(parser_backend,))
+        self.workers = self.executor._max_workers
+        # Havuzda aynı anda bekleyebilecek sayfa sayısı (ayrıştırma aşaması kuyruğu)
+        self.max_pending = max_pending or self.workers * 2
+        # Veri çekme ile ayrıştırma arasındaki kuyruk boyutu
+        self.queue_size = queue_size or self.max_pending
+
+    def process_pages(self, pages: Iterable[Tuple[Union[bytes, Exception], str, Optional[int]]]
+                      ) -> Iterator[Tuple[int, Union[List[Product], Exception]]]:
+        """(içerik, arama terimi, limit) akışını işle; (sıra, ürünler veya hata) üret
+
+        Girdi tembel olarak tüketilir: havuzda max_pending sayfa varken yeni
+        sayfa alınmaz. Sonuçlar tamamlanma sırasıyla döner.
+        """
+        pending = {}
+        pages = iter(enumerate(pages))
+        exhausted = False
+
+        while True:
+            # Havuz dolana kadar yeni sayfa gönder
+            while not exhausted and len(pending) < self.max_pending:
+                try:
+                    index, (content, keyword, limit) = next(pages)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if isinstance(content, Exception):
+                    yield index, content
+                    continue
+                pending[self.executor.submit(parse_and_score, content, keyword, limit)] = index
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    yield index, records_to_products(future.result())
+                except Exception as e:
+                    yield index, e
+
+    def _fetch_stage(self, fetch_engine, requests_list, out_queue: queue.Queue):
+        """Sayfaları eşzamanlı çek ve tamamlanan her sayfayı sınırlı kuyruğa koy"""
+        async def produce():
+            semaphore = asyncio.Semaphore(fetch_engine.max_concurrency)
+            loop = asyncio.get_running_loop()
+
+            async def fetch_one(index, url, params, keyword, limit):
+                try:
+                    content = await fetch_engine.fetch_async(url, params, semaphore)
+                except Exception as e:
+                    content = e
+                # Kuyruk doluysa bu görev bekler (geri basınç)
+                await loop.run_in_executor(None, out_queue.put, (index, content, keyword, limit))
+
+            await asyncio.gather(*(fetch_one(index, *request) for index, request in enumerate(requests_list)))
+
+        try:
+            asyncio.run(produce())
+        except Exception as e:
+            logger.error(f"Veri çekme aşaması hatası: {e}")
+        finally:
+            out_queue.put(_DONE)
+
+    def run(self, fetch_engine, requests_list: List[Tuple[str, dict, str, Optional[int]]]
+            ) -> List[Union[List[Product], Exception]]:
+        """(url, params, arama terimi, limit) isteklerini çek, ayrıştır ve skorla
+
+        Sonuçlar istek sırasıyla döner; hatalar istisna nesnesi olarak.
+        """
+        fetched: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        fetcher = threading.Thread(target=self._fetch_stage, args=(fetch_engine, requests_list, fetched),
+                                   name='pipeline-fetch', daemon=True)
+        fetcher.start()
+
+        order = []
+
+        def pages():
+            while True:
+                item = fetched.get()
+                if item is _DONE:
+                    return
+                index, content, keyword, limit = item
+                order.append(index)
+                yield content, keyword, limit
+
+        results: List[Union[List[Product], Exception]] = [None] * len(requests_list)
+        for position, outcome in self.process_pages(pages()):
+            results[order[position]] = outcome
+        fetcher.join()
+
+        # Tüm ürünler aynı analiz zaman damgasını paylaşır (tek süreçli yol ile aynı)
+        analysis_timestamp = datetime.now().isoformat()
+        for outcome in results:
+            if isinstance(outcome, list):
+                for product in outcome:
+                    product.analysis_timestamp = analysis_timestamp
+        return results
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
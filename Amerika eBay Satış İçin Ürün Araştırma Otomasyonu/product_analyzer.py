@@ -5,18 +5,114 @@ Bu modül eBay ürünlerini analiz eder ve satış potansiyelini skorlar.
 """
 
 import json
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
 import re
-from typing import List, Dict, Any
+import hashlib
+from typing import List, Dict, Any, Iterable, Optional
+
+from product_record import Product, extract_item_id
+from insights import InsightsAggregator
+from keyword_matcher import KeywordMatcher, VersionedDict
 
 logger = logging.getLogger(__name__)
 
+# Satıcı geri bildirim yüzdesi deseni
+SELLER_FEEDBACK_PATTERN = r'(\d+(?:\.\d+)?)%\s+positive'
+
+# Alt skor bileşenleri (ağırlıklı toplamdaki sırayla)
+SCORE_COMPONENTS = ('price', 'sales', 'interest', 'category', 'trend', 'shipping', 'seller', 'velocity')
+
+# Her bileşenin ihtiyaç duyduğu ürün alanları
+COMPONENT_FIELDS = {
+    'price': ('price',),
+    'sales': ('sold_count',),
+    'interest': ('watchers',),
+    'category': ('search_keywords',),
+    'trend': ('title', 'search_keywords'),
+    'shipping': ('shipping',),
+    'seller': ('seller',),
+    'velocity': ('url', 'title', 'image_url'),
+}
+
+# Satış hızı (satış/gün) bantları ve skorları; geçmişi olmayan ürünler nötr skor alır
+VELOCITY_BANDS = ((50, 100), (20, 90), (10, 80), (5, 70), (2, 60), (1, 50), (0.5, 40))
+VELOCITY_NEUTRAL_SCORE = 50.0
+
+def round_scores(scores: np.ndarray) -> np.ndarray:
+    """Python round(x, 2) ile bit düzeyinde aynı sonucu veren vektörel yuvarlama
+    
+    np.round(x, 2) x*100 çarpımındaki yuvarlama hatası yüzünden tam .5 sınırına
+    çok yakın değerlerde farklı sonuç verebilir; yalnızca bu belirsiz değerler
+    Python round ile yeniden hesaplanır.
+    """
+    rounded = np.round(scores, 2)
+    scaled = scores * 100
+    ambiguous = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ambiguous.tolist():
+        rounded[i] = round(float(scores[i]), 2)
+    return rounded
+
+class ScoreComponents:
+    """Ürün başına alt skorların sütunlu önbelleği
+    
+    Her bileşen, hesaplandığı andaki yapılandırmanın özetiyle (fingerprint)
+    saklanır; yapılandırması değişmeyen bileşenler yeniden hesaplanmaz. Trend
+    bileşeni için her anahtar kelimenin eşleştiği ürün indeksleri de tutulur;
+    trend tablosuna kelime eklenince yalnızca yeni kelime taranır. Önbellek,
+    hesaplandığı ürün listesinin kimlik özetiyle (items_key) eşleşmedikçe
+    yeniden kullanılmaz.
+    """
+    
+    def __init__(self, size: int, items_key: Optional[str] = None):
+        self.size = size
+        self.items_key = items_key
+        self.arrays: Dict[str, np.ndarray] = {}
+        self.fingerprints: Dict[str, str] = {}
+        self.trend_hits: Dict[str, np.ndarray] = {}
+    
+    def save(self, path: str):
+        """Bileşenleri .npz dosyasına kaydet"""
+        hit_keywords = list(self.trend_hits)
+        meta = {'size': self.size, 'items_key': self.items_key, 'fingerprints': self.fingerprints, 'trend_keywords': hit_keywords}
+        arrays = {f"component_{name}": values for name, values in self.arrays.items()}
+        arrays.update({f"trend_hit_{i}": self.trend_hits[keyword] for i, keyword in enumerate(hit_keywords)})
+        np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+    
+    @classmethod
+    def load(cls, path: str) -> 'ScoreComponents':
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            components = cls(meta['size'], meta.get('items_key'))
+            components.fingerprints = meta['fingerprints']
+            components.arrays = {name: data[f"component_{name}"] for name in meta['fingerprints']}
+            components.trend_hits = {keyword: data[f"trend_hit_{i}"]
+                                     for i, keyword in enumerate(meta['trend_keywords'])}
+        return components
+
 class ProductAnalyzer:
     def __init__(self):
         """Ürün analizörünü başlat"""
+        # Derlenmiş eşleştiriciler (yapılandırma sözlüğü değiştikçe yeniden kurulur)
+        self._trend_matcher_cache = (None, None)
+        self._category_matcher_cache = (None, None)
+        
+        # Satış hızı durumları (velocity.VelocityTracker); geçmiş deposu yoksa None
+        self.velocity_tracker = None
+        
+        # Alt skor ağırlıkları (toplam 1.0); satış hızı varsayılan olarak skora katılmaz
+        self.score_weights = {
+            'price': 0.30,
+            'sales': 0.25,
+            'interest': 0.15,
+            'category': 0.10,
+            'trend': 0.10,
+            'shipping': 0.05,
+            'seller': 0.05,
+            'velocity': 0.0
+        }
+        
         self.category_weights = {
             "Clothing, Shoes & Accessories": 1.2,
             "Home & Garden": 1.1,
@@ -54,38 +150,95 @@ class ProductAnalyzer:
             (500, 1000, 0.8),  # Çok yüksek fiyat
             (1000, float('inf'), 0.5)  # Lüks fiyat
         ]
+        
+        # Son analizde hesaplanan alt skorlar (rescore için)
+        self.last_components: Optional[ScoreComponents] = None
+    
+    @property
+    def category_weights(self) -> Dict[str, float]:
+        return self._category_weights
+    
+    @category_weights.setter
+    def category_weights(self, value: Dict[str, float]):
+        # Yerinde değişiklikler sürüm numarasıyla izlenir
+        self._category_weights = VersionedDict(value)
+        self._category_matcher_cache = (None, None)
+    
+    @property
+    def trend_keywords(self) -> Dict[str, float]:
+        return self._trend_keywords
+    
+    @trend_keywords.setter
+    def trend_keywords(self, value: Dict[str, float]):
+        self._trend_keywords = VersionedDict(value)
+        self._trend_matcher_cache = (None, None)
+    
+    def set_component_weight(self, name: str, weight: float):
+        """Bileşen ağırlığını ayarla; diğer ağırlıklar toplam korunacak şekilde orantılı ölçeklenir"""
+        if name not in SCORE_COMPONENTS:
+            raise ValueError(f"Bilinmeyen skor bileşeni: {name}")
+        total = sum(self.score_weights.values())
+        if not 0 <= weight <= total:
+            raise ValueError(f"Ağırlık 0 ile {total:g} arasında olmalı")
+        others = total - self.score_weights[name]
+        scale = (total - weight) / others if others else 0.0
+        self.score_weights = {component: weight if component == name else value * scale
+                              for component, value in self.score_weights.items()}
+    
+    def _trend_matcher(self) -> KeywordMatcher:
+        """Trend kelimelerinin derlenmiş eşleştiricisi (en yüksek ağırlıklı eşleşme kazanır)"""
+        version, matcher = self._trend_matcher_cache
+        if version != self._trend_keywords.version or matcher is None:
+            matcher = KeywordMatcher((keyword, -100 * weight, 100 * weight)
+                                     for keyword, weight in self._trend_keywords.items())
+            self._trend_matcher_cache = (self._trend_keywords.version, matcher)
+        return matcher
+    
+    def _category_matcher(self) -> KeywordMatcher:
+        """Kategorilerin derlenmiş eşleştiricisi (sözlükteki ilk eşleşen kategori kazanır)"""
+        version, matcher = self._category_matcher_cache
+        if version != self._category_weights.version or matcher is None:
+            matcher = KeywordMatcher((category.lower(), index, 100 * weight)
+                                     for index, (category, weight) in enumerate(self._category_weights.items()))
+            self._category_matcher_cache = (self._category_weights.version, matcher)
+        return matcher
     
     def calculate_advanced_score(self, product: Dict[str, Any]) -> float:
         """Gelişmiş skorlama algoritması"""
         score = 0.0
         
-        # 1. Fiyat skoru (30% ağırlık)
+        # 1. Fiyat skoru (varsayılan 30% ağırlık)
         price_score = self._calculate_price_score(product.get('price', 0))
-        score += price_score * 0.30
+        score += price_score * self.score_weights['price']
         
-        # 2. Satış performansı skoru (25% ağırlık)
+        # 2. Satış performansı skoru (varsayılan 25% ağırlık)
         sales_score = self._calculate_sales_score(product.get('sold_count', 0))
-        score += sales_score * 0.25
+        score += sales_score * self.score_weights['sales']
         
-        # 3. İlgi skoru (15% ağırlık)
+        # 3. İlgi skoru (varsayılan 15% ağırlık)
         interest_score = self._calculate_interest_score(product.get('watchers', 0))
-        score += interest_score * 0.15
+        score += interest_score * self.score_weights['interest']
         
-        # 4. Kategori skoru (10% ağırlık)
-        category_score = self._calculate_category_score(product.get('search_keyword', ''))
-        score += category_score * 0.10
+        # 4. Kategori skoru (varsayılan 10% ağırlık)
+        keywords_text = self._keywords_text(product)
+        category_score = self._calculate_category_score(keywords_text)
+        score += category_score * self.score_weights['category']
         
-        # 5. Trend skoru (10% ağırlık)
-        trend_score = self._calculate_trend_score(product.get('title', ''), product.get('search_keyword', ''))
-        score += trend_score * 0.10
+        # 5. Trend skoru (varsayılan 10% ağırlık)
+        trend_score = self._calculate_trend_score(product.get('title', ''), keywords_text)
+        score += trend_score * self.score_weights['trend']
         
-        # 6. Kargo skoru (5% ağırlık)
+        # 6. Kargo skoru (varsayılan 5% ağırlık)
         shipping_score = self._calculate_shipping_score(product.get('shipping', ''))
-        score += shipping_score * 0.05
+        score += shipping_score * self.score_weights['shipping']
         
-        # 7. Satıcı güvenilirlik skoru (5% ağırlık)
+        # 7. Satıcı güvenilirlik skoru (varsayılan 5% ağırlık)
         seller_score = self._calculate_seller_score(product.get('seller', ''))
-        score += seller_score * 0.05
+        score += seller_score * self.score_weights['seller']
+        
+        # 8. Satış hızı skoru (varsayılan 0% ağırlık; geçmiş deposu gerekir)
+        velocity_score = self._calculate_velocity_score(product)
+        score += velocity_score * self.score_weights['velocity']
         
         return round(score, 2)
     
@@ -138,23 +291,38 @@ class ProductAnalyzer:
         else:
             return 20
     
+    @staticmethod
+    def _keywords_text(product: Any) -> str:
+        """Ürünün bulunduğu tüm arama terimleri, sıralı ve satır sonuyla ayrılmış tek metin
+        
+        Tekilleştirmede birleşen ürün, ilk görüldüğü terime değil bulunduğu
+        tüm terimlere göre skorlanır; birleşme sırası skoru değiştirmez.
+        """
+        keyword = product.get('search_keyword')
+        keywords = product.search_keywords if isinstance(product, Product) else product.get('search_keywords')
+        if not keywords:
+            return keyword or ''
+        keywords = set(keywords)
+        if keyword is not None:
+            keywords.add(keyword)
+        return '\n'.join(sorted(keywords))
+    
+    @classmethod
+    def _keywords_texts(cls, products: List[Product]) -> List[str]:
+        """_keywords_text sütunu (tek terimli ürünlerde terimin kendisi)"""
+        return [cls._keywords_text(p) if p.search_keywords else (p.search_keyword or '') for p in products]
+    
     def _calculate_category_score(self, search_keyword: str) -> float:
-        """Kategori bazlı skor hesaplama"""
-        for category, weight in self.category_weights.items():
-            if category.lower() in search_keyword.lower():
-                return 100 * weight
-        return 50  # Varsayılan skor
+        """Kategori bazlı skor hesaplama (satır sonuyla ayrılmış birden fazla terimde en yüksek skor)"""
+        # Tüm kategoriler tek geçişte; sözlük sırasında ilk eşleşen kazanır
+        matcher = self._category_matcher()
+        return max(matcher.best(keyword, 50) for keyword in search_keyword.lower().split('\n'))  # Varsayılan skor: 50
     
     def _calculate_trend_score(self, title: str, search_keyword: str) -> float:
         """Trend anahtar kelimesi bazlı skor hesaplama"""
-        title_lower = title.lower()
-        keyword_lower = search_keyword.lower()
-        
-        max_score = 0
-        for keyword, weight in self.trend_keywords.items():
-            if keyword in title_lower or keyword in keyword_lower:
-                score = 100 * weight
-                max_score = max(max_score, score)
+        # Her metin tek geçişte taranır; en yüksek ağırlıklı eşleşme kazanır
+        matcher = self._trend_matcher()
+        max_score = max(matcher.best(title.lower(), 0), matcher.best(search_keyword.lower(), 0))
         
         return max_score if max_score > 0 else 50
     
@@ -177,7 +345,7 @@ class ProductAnalyzer:
             return 50
         
         # Pozitif feedback yüzdesi çıkarma
-        feedback_match = re.search(r'(\d+(?:\.\d+)?)%\s+positive', seller.lower())
+        feedback_match = re.search(SELLER_FEEDBACK_PATTERN, seller.lower())
         if feedback_match:
             feedback_percent = float(feedback_match.group(1))
             if feedback_percent >= 99:
@@ -193,27 +361,294 @@ class ProductAnalyzer:
         
         return 50  # Varsayılan skor
     
-    def analyze_products(self, products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Ürün listesini analiz et ve skorla"""
-        analyzed_products = []
+    def _calculate_velocity_score(self, product: Dict[str, Any]) -> float:
+        """Satış hızı bazlı skor: satış/gün bandı, ivmelenme, izleyici büyümesi ve fiyat eğilimi"""
+        if self.velocity_tracker is None:
+            return 0.0
+        url = product.get('url')
+        state = self.velocity_tracker.get(
+            extract_item_id(url, fallback=f"{product.get('title')}|{product.get('image_url')}"))
+        if state is None or state.snapshots < 2:
+            return VELOCITY_NEUTRAL_SCORE
+        
+        rate = state.sold_rate_long
+        score = next((band_score for threshold, band_score in VELOCITY_BANDS if rate >= threshold),
+                     30 if rate > 0 else 0)
+        # Kısa pencere uzun pencereden belirgin hızlıysa satışlar ivmeleniyor, yavaşsa sönümleniyor
+        if state.sold_rate_short > rate * 1.5:
+            score += 10
+        elif state.sold_rate_short < rate * 0.5:
+            score -= 10
+        if state.watcher_rate >= 5:
+            score += 10
+        elif state.watcher_rate >= 1:
+            score += 5
+        price_ratio = state.price_ratio
+        if price_ratio < 0.95:
+            score += 5
+        elif price_ratio > 1.05:
+            score -= 5
+        return float(min(max(score, 0), 100))
+    
+    def _to_columns(self, products: List[Product], fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Ürün listesini bir kez sütunlu dizilere dönüştür (yalnızca istenen alanlar)"""
+        n = len(products)
+        numeric = ('price', 'sold_count', 'watchers')
+        columns = {}
+        for field in fields or ('price', 'sold_count', 'watchers', 'search_keywords', 'title', 'shipping', 'seller'):
+            if field in numeric:
+                columns[field] = np.fromiter((getattr(p, field) for p in products), dtype=np.float64, count=n)
+            elif field == 'search_keywords':
+                columns[field] = np.array(self._keywords_texts(products), dtype=object)
+            else:
+                columns[field] = np.array([getattr(p, field) or '' for p in products], dtype=object)
+        return columns
+    
+    @staticmethod
+    def _map_unique(values: np.ndarray, func) -> np.ndarray:
+        """Metin sütununu çarpanlara ayır (factorize), fonksiyonu yalnızca benzersiz değerlere uygula"""
+        # pandas yalnızca bu yolda gerekir; modül yüklenirken içe aktarılmaz
+        import pandas as pd
+        codes, uniques = pd.factorize(values)
+        unique_scores = np.fromiter((func(value) for value in uniques), dtype=np.float64, count=len(uniques))
+        return unique_scores[codes]
+    
+    def _price_scores(self, prices: np.ndarray) -> np.ndarray:
+        """Fiyat skorları (vektörel, ilk eşleşen aralık kazanır)"""
+        conditions = [(prices >= min_price) & (prices < max_price) for min_price, max_price, _ in self.price_ranges]
+        choices = [100 * multiplier for _, _, multiplier in self.price_ranges]
+        scores = np.select(conditions, choices, default=50.0)
+        return np.where(prices <= 0, 0.0, scores)
+    
+    def _sales_scores(self, sold_counts: np.ndarray) -> np.ndarray:
+        """Satış sayısı skorları (vektörel)"""
+        return np.select(
+            [sold_counts <= 0, sold_counts >= 1000, sold_counts >= 500, sold_counts >= 100,
+             sold_counts >= 50, sold_counts >= 20, sold_counts >= 10, sold_counts >= 5],
+            [0, 100, 90, 80, 70, 60, 50, 40],
+            default=30
+        ).astype(np.float64)
+    
+    def _interest_scores(self, watchers: np.ndarray) -> np.ndarray:
+        """İzleyici sayısı skorları (vektörel)"""
+        return np.select(
+            [watchers <= 0, watchers >= 100, watchers >= 50, watchers >= 20, watchers >= 10, watchers >= 5],
+            [0, 100, 80, 60, 40, 30],
+            default=20
+        ).astype(np.float64)
+    
+    def _category_scores(self, search_keywords: np.ndarray) -> np.ndarray:
+        """Kategori skorları (benzersiz arama terimleri üzerinden)"""
+        return self._map_unique(search_keywords, self._calculate_category_score)
+    
+    @staticmethod
+    def _trend_texts(titles: Iterable[str], search_keywords: Iterable[str]) -> List[str]:
+        """Başlık ve arama terimini tek küçük harfli metinde birleştir
+        
+        Trend kelimeleri satır sonu içermediğinden "kelime metinde geçer" ile
+        "kelime başlıkta veya arama teriminde geçer" aynı sonucu verir.
+        """
+        return [f"{title}\n{keyword}".lower() for title, keyword in zip(titles, search_keywords)]
+    
+    def _trend_hits(self, keywords: List[str], texts: List[str]) -> Dict[str, np.ndarray]:
+        """Her trend kelimesinin geçtiği ürün indeksleri"""
+        matcher = KeywordMatcher((keyword, 0, None) for keyword in keywords)
+        if not matcher.use_automaton:
+            return {
+                keyword: np.flatnonzero(np.fromiter((keyword in text for text in texts), dtype=bool, count=len(texts)))
+                for keyword in keywords
+            }
         
+        # Büyük sözlük: her metin otomatla bir kez taranır
+        positions: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            for keyword in matcher.find_all(text):
+                positions.setdefault(keyword, []).append(index)
+        empty = np.zeros(0, dtype=np.int64)
+        return {keyword: np.array(positions[keyword], dtype=np.int64) if keyword in positions else empty
+                for keyword in keywords}
+    
+    def _combine_trend_hits(self, size: int, hits: Dict[str, np.ndarray]) -> np.ndarray:
+        """Eşleşen kelimelerin en yüksek skoru; eşleşme yoksa 50"""
+        max_scores = np.zeros(size, dtype=np.float64)
+        for keyword, weight in self.trend_keywords.items():
+            indices = hits[keyword]
+            if len(indices):
+                max_scores[indices] = np.maximum(max_scores[indices], 100 * weight)
+        return np.where(max_scores > 0, max_scores, 50.0)
+    
+    def _trend_scores(self, titles: np.ndarray, search_keywords: np.ndarray) -> np.ndarray:
+        """Trend skorları (başlık ve arama terimi eşleşmelerinin en yükseği)"""
+        hits = self._trend_hits(list(self.trend_keywords), self._trend_texts(titles, search_keywords))
+        return self._combine_trend_hits(len(titles), hits)
+    
+    def _shipping_scores(self, shipping: np.ndarray) -> np.ndarray:
+        """Kargo skorları (benzersiz kargo metinleri üzerinden)"""
+        return self._map_unique(shipping, self._calculate_shipping_score)
+    
+    def _seller_scores(self, sellers: np.ndarray) -> np.ndarray:
+        """Satıcı güvenilirlik skorları (benzersiz satıcı metinleri üzerinden)"""
+        return self._map_unique(sellers, self._calculate_seller_score)
+    
+    def _velocity_scores(self, products: List[Product]) -> np.ndarray:
+        """Satış hızı skorları (vektörel; _calculate_velocity_score ile aynı kurallar)"""
+        if self.velocity_tracker is None:
+            return np.zeros(len(products), dtype=np.float64)
+        features = self.velocity_tracker.feature_arrays([product.item_id for product in products])
+        rate = features['sold_rate_long']
+        short = features['sold_rate_short']
+        watchers = features['watcher_rate']
+        price_ratio = features['price_ratio']
+        
+        score = np.select([rate >= threshold for threshold, _ in VELOCITY_BANDS],
+                          [band_score for _, band_score in VELOCITY_BANDS],
+                          default=0).astype(np.float64)
+        score = np.where((score == 0) & (rate > 0), 30.0, score)
+        score += np.where(short > rate * 1.5, 10, np.where(short < rate * 0.5, -10, 0))
+        score += np.where(watchers >= 5, 10, np.where(watchers >= 1, 5, 0))
+        score += np.where(price_ratio < 0.95, 5, np.where(price_ratio > 1.05, -5, 0))
+        score = np.clip(score, 0, 100)
+        return np.where(features['snapshots'] < 2, VELOCITY_NEUTRAL_SCORE, score)
+    
+    def component_fingerprint(self, name: str) -> str:
+        """Bileşenin bağlı olduğu yapılandırmanın özeti (ağırlıklar hariç)"""
+        config = {
+            'price': self.price_ranges,
+            'category': list(self.category_weights.items()),
+            'trend': list(self.trend_keywords.items()),
+            # Hız durumları her güncellemede değişir
+            'velocity': [id(self.velocity_tracker), self.velocity_tracker.version] if self.velocity_tracker else None,
+        }.get(name)
+        return hashlib.sha1(json.dumps([name, config]).encode('utf-8')).hexdigest()[:16]
+    
+    def _component_scores(self, name: str, columns: Dict[str, Any]) -> np.ndarray:
+        """Tek bir alt skor bileşenini vektörel hesapla"""
+        if name == 'price':
+            return self._price_scores(columns['price'])
+        if name == 'sales':
+            return self._sales_scores(columns['sold_count'])
+        if name == 'interest':
+            return self._interest_scores(columns['watchers'])
+        if name == 'category':
+            return self._category_scores(columns['search_keywords'])
+        if name == 'trend':
+            return self._trend_scores(columns['title'], columns['search_keywords'])
+        if name == 'shipping':
+            return self._shipping_scores(columns['shipping'])
+        return self._seller_scores(columns['seller'])
+    
+    @staticmethod
+    def items_key(products: List[Product]) -> str:
+        """Ürün listesinin sıralı kimlik özeti (ürün kimliğinin türetildiği url/başlık/görsel alanlarından)"""
+        digest = hashlib.blake2b(digest_size=16)
         for product in products:
-            # Gelişmiş skor hesapla
-            advanced_score = self.calculate_advanced_score(product)
-            
-            # Ürün kopyasını oluştur ve skoru ekle
-            analyzed_product = product.copy()
-            analyzed_product['advanced_score'] = advanced_score
-            analyzed_product['analysis_timestamp'] = datetime.now().isoformat()
-            
-            analyzed_products.append(analyzed_product)
+            digest.update(f"{product.url}\x1f{product.title}\x1f{product.image_url}\x1e".encode('utf-8'))
+        return digest.hexdigest()
+    
+    def compute_components(self, products: List[Any], components: Optional[ScoreComponents] = None) -> ScoreComponents:
+        """Alt skorları hesapla; verilen önbellekte yapılandırması değişmemiş bileşenler korunur
+        
+        Önbellek başka bir ürün listesi için hesaplandıysa (uzunluk aynı olsa da) kullanılmaz.
+        """
+        products = [Product.coerce(product) for product in products]
+        items_key = self.items_key(products)
+        if components is None or components.size != len(products) or components.items_key != items_key:
+            components = ScoreComponents(len(products), items_key)
+        
+        fingerprints = {name: self.component_fingerprint(name) for name in SCORE_COMPONENTS}
+        stale = [name for name in SCORE_COMPONENTS
+                 if name not in components.arrays or components.fingerprints.get(name) != fingerprints[name]]
+        if not stale:
+            return components
+        
+        # Trend: yalnızca eşleşme indeksi olmayan (yeni) kelimeler taranır
+        hits = components.trend_hits
+        for keyword in [keyword for keyword in hits if keyword not in self.trend_keywords]:
+            del hits[keyword]
+        missing_keywords = [keyword for keyword in self.trend_keywords if keyword not in hits]
+        
+        # Yalnızca eskiyen bileşenlerin ihtiyaç duyduğu sütunlar çıkarılır
+        fields = dict.fromkeys(field for name in stale if name not in ('trend', 'velocity')
+                               for field in COMPONENT_FIELDS[name])
+        columns = self._to_columns(products, fields) if products and fields else {}
+        for name in stale:
+            if not products:
+                components.arrays[name] = np.zeros(0, dtype=np.float64)
+            elif name == 'velocity':
+                components.arrays[name] = self._velocity_scores(products)
+            elif name == 'trend':
+                if missing_keywords:
+                    texts = self._trend_texts((p.title or '' for p in products), self._keywords_texts(products))
+                    hits.update(self._trend_hits(missing_keywords, texts))
+                components.arrays[name] = self._combine_trend_hits(len(products), hits)
+            else:
+                components.arrays[name] = self._component_scores(name, columns)
+            components.fingerprints[name] = fingerprints[name]
+        return components
+    
+    def combine_components(self, components: ScoreComponents) -> np.ndarray:
+        """Alt skorların ağırlıklı toplamı (skaler yoldakiyle aynı sırada biriktirilir)"""
+        score = np.zeros(components.size, dtype=np.float64)
+        for name in SCORE_COMPONENTS:
+            score += components.arrays[name] * self.score_weights[name]
+        return round_scores(score)
+    
+    def calculate_scores_batch(self, products: List[Any]) -> np.ndarray:
+        """Toplu skorlama: calculate_advanced_score ile bit düzeyinde aynı sonuçları verir"""
+        if not products:
+            return np.zeros(0, dtype=np.float64)
+        return self.combine_components(self.compute_components(products))
+    
+    def rescore(self, products: List[Product], components: Optional[ScoreComponents] = None) -> List[Product]:
+        """Ağırlık veya tablo değişikliğinden sonra yalnızca etkilenen bileşenleri yeniden hesaplayıp skorla
+        
+        components verilmezse son analyze_products çağrısının önbelleği kullanılır.
+        Ürünler yerinde güncellenir.
+        """
+        cached = components if components is not None else self.last_components
+        stale = [name for name in SCORE_COMPONENTS
+                 if cached is None or cached.fingerprints.get(name) != self.component_fingerprint(name)]
+        components = self.compute_components(products, cached)
+        if components is not cached:
+            stale = list(SCORE_COMPONENTS)
+        logger.info(f"Yeniden skorlama: {len(products)} ürün, yeniden hesaplanan bileşenler: {stale or 'yok'}")
+        
+        analysis_timestamp = datetime.now().isoformat()
+        for product, advanced_score in zip(products, self.combine_components(components).tolist()):
+            product.advanced_score = advanced_score
+            product.analysis_timestamp = analysis_timestamp
+        
+        self.last_components = components
+        return products
+    
+    def analyze_products(self, products: List[Any], vectorized: bool = True, sort_results: bool = True) -> List[Product]:
+        """Ürün listesini analiz et ve skorla
+        
+        Product kayıtları yerinde skorlanır (kopya oluşturulmaz); sözlük
+        girdileri Product kaydına dönüştürülür.
+        """
+        analyzed_products = [Product.coerce(product) for product in products]
+        
+        if vectorized:
+            # Tüm skorlar tek seferde sütunlu olarak hesaplanır; alt skorlar rescore için saklanır
+            self.last_components = self.compute_components(analyzed_products)
+            scores = self.combine_components(self.last_components).tolist()
+        else:
+            scores = [self.calculate_advanced_score(product) for product in analyzed_products]
         
-        # Skorlara göre sırala
-        analyzed_products.sort(key=lambda x: x.get('advanced_score', 0), reverse=True)
+        # Tüm ürünler aynı analiz zaman damgası nesnesini paylaşır
+        analysis_timestamp = datetime.now().isoformat()
+        for product, advanced_score in zip(analyzed_products, scores):
+            product.advanced_score = advanced_score
+            product.analysis_timestamp = analysis_timestamp
+        
+        # Skorlara göre sırala (en iyi K seçimi yapan çağıranlar için atlanabilir)
+        if sort_results:
+            analyzed_products.sort(key=lambda x: x.get('advanced_score', 0), reverse=True)
         
         return analyzed_products
     
-    def categorize_products(self, products: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def categorize_products(self, products: List[Product]) -> Dict[str, List[Product]]:
         """Ürünleri kategorilere ayır"""
         categories = {
             'high_potential': [],      # Skor >= 80
@@ -236,98 +671,25 @@ class ProductAnalyzer:
         
         return categories
     
-    def generate_insights(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Ürün analizi için içgörüler üret"""
-        if not products:
-            return {}
-        
-        df = pd.DataFrame(products)
-        
-        insights = {
-            'total_products': len(products),
-            'average_score': df['advanced_score'].mean() if 'advanced_score' in df.columns else 0,
-            'score_distribution': {},
-            'price_analysis': {},
-            'category_performance': {},
-            'top_trends': []
-        }
-        
-        # Skor dağılımı
-        if 'advanced_score' in df.columns:
-            insights['score_distribution'] = {
-                'high_potential': len(df[df['advanced_score'] >= 80]),
-                'medium_potential': len(df[(df['advanced_score'] >= 60) & (df['advanced_score'] < 80)]),
-                'low_potential': len(df[(df['advanced_score'] >= 40) & (df['advanced_score'] < 60)]),
-                'poor_potential': len(df[df['advanced_score'] < 40])
-            }
-        
-        # Fiyat analizi
-        if 'price' in df.columns:
-            price_data = df['price'].dropna()
-            if len(price_data) > 0:
-                insights['price_analysis'] = {
-                    'average_price': float(price_data.mean()),
-                    'median_price': float(price_data.median()),
-                    'min_price': float(price_data.min()),
-                    'max_price': float(price_data.max()),
-                    'price_ranges': self._analyze_price_ranges(price_data)
-                }
-        
-        # Kategori performansı
-        if 'search_keyword' in df.columns:
-            category_scores = df.groupby('search_keyword')['advanced_score'].mean().to_dict()
-            insights['category_performance'] = {k: float(v) for k, v in category_scores.items()}
-        
-        # En iyi trendler
-        if 'title' in df.columns:
-            insights['top_trends'] = self._extract_trending_keywords(df['title'].tolist())
-        
-        return insights
-    
-    def _analyze_price_ranges(self, prices: pd.Series) -> Dict[str, int]:
-        """Fiyat aralığı analizi"""
-        ranges = {
-            '$0-$25': 0,
-            '$25-$50': 0,
-            '$50-$100': 0,
-            '$100-$250': 0,
-            '$250-$500': 0,
-            '$500+': 0
-        }
-        
-        for price in prices:
-            if price < 25:
-                ranges['$0-$25'] += 1
-            elif price < 50:
-                ranges['$25-$50'] += 1
-            elif price < 100:
-                ranges['$50-$100'] += 1
-            elif price < 250:
-                ranges['$100-$250'] += 1
-            elif price < 500:
-                ranges['$250-$500'] += 1
-            else:
-                ranges['$500+'] += 1
+    def generate_insights(self, products: Iterable[Any]) -> Dict[str, Any]:
+        """Ürün analizi için içgörüler üret
         
-        return ranges
+        Ürünler tek geçişte akış toplayıcısına beslenir; veri seti DataFrame
+        olarak bellekte tutulmaz.
+        """
+        return self.new_insights_aggregator().add_many(products).result()
     
-    def _extract_trending_keywords(self, titles: List[str]) -> List[Dict[str, Any]]:
-        """Başlıklardan trend anahtar kelimeleri çıkar"""
-        word_counts = {}
-        
-        # Yaygın kelimeleri filtrele
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an'}
-        
-        for title in titles:
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', title.lower())
-            for word in words:
-                if word not in stop_words:
-                    word_counts[word] = word_counts.get(word, 0) + 1
-        
-        # En çok kullanılan 10 kelimeyi al
-        trending = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    def new_insights_aggregator(self) -> InsightsAggregator:
+        """Parça parça veya paralel beslenebilecek boş bir içgörü toplayıcısı"""
+        return InsightsAggregator()
+    
+    def generate_snapshot_insights(self, paths) -> Dict[str, Any]:
+        """Kayıtlı `*.snap` çalıştırmalarından içgörüler (bellek eşlemeli, JSON ayrıştırmadan)
         
-        return [{'keyword': word, 'frequency': count} for word, count in trending]
+        paths: dosya yolları, glob deseni veya dizin. Başlık trendleri hesaplanmaz.
+        """
+        from run_snapshot import open_snapshots, snapshot_insights
+        return snapshot_insights(open_snapshots(paths))
 
 def main():
     """Test fonksiyonu"""
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Arama Sonuç Sayfası Ayrıştırıcıları
+Bu modül eBay arama sayfalarından ürün alanlarını çıkaran değiştirilebilir
+ayrıştırıcı (parser) arka uçlarını içerir. Hızlı yol (selectolax/lxml) her
+ürün için tüm alanları ağaç üzerinde tek geçişte toplar; BeautifulSoup yedek
+arka uç olarak kalır.
+"""
+
+import re
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from product_record import Product
+
+logger = logging.getLogger(__name__)
+
+# Ürün listesi seçicisi (reklam/yerleşim öğeleri hariç)
+ITEM_SELECTOR = 'li.s-item:not(.s-item__pl-on-bottom)'
+
+# (etiket, sınıf) -> alan eşlemesi; tek geçişte eşleştirme için
+FIELD_CLASSES = {
+    ('h3', 's-item__title'): 'title',
+    ('span', 's-item__price'): 'price',
+    ('a', 's-item__link'): 'url',
+    ('span', 's-item__seller-info-text'): 'seller',
+    ('span', 's-item__shipping'): 'shipping',
+    ('span', 's-item__hotness-count'): 'hotness',
+    ('span', 's-item__quantity-sold'): 'quantity_sold',
+    ('span', 's-item__watchers'): 'watchers',
+    ('img', 's-item__image-img'): 'image_url',
+}
+
+# Sınıf adından aday alanlara hızlı erişim
+_CLASS_FIELDS: Dict[str, List[tuple]] = {}
+for (_tag, _cls), _field in FIELD_CLASSES.items():
+    _CLASS_FIELDS.setdefault(_cls, []).append((_tag, _field))
+
+_PRICE_CLEAN_RE = re.compile(r'[^\d.,]')
+_NUMBER_RE = re.compile(r'\d+')
+
+def clean_price(price_text: str) -> float:
+    """Fiyat metnini temizle"""
+    try:
+        # Sadece sayıları ve nokta/virgül karakterlerini al
+        price_clean = _PRICE_CLEAN_RE.sub('', price_text)
+        if price_clean:
+            # Virgülü noktaya çevir ve float'a dönüştür
+            return float(price_clean.replace(',', '.'))
+        return 0.0 # Hata durumunda 0.0 döndür
+    except:
+        return 0.0 # Hata durumunda 0.0 döndür
+
+def extract_first_number(text: str) -> int:
+    """Metindeki ilk tam sayıyı çıkar (satış/izleyici sayısı)"""
+    try:
+        match = _NUMBER_RE.search(text)
+        return int(match.group()) if match else 0
+    except:
+        return 0
+
+def build_product(fields: Dict[str, Any], scraped_at: str) -> Optional[Product]:
+    """Ham alan metinlerinden ürün kaydını oluştur"""
+    title = fields.get('title')
+    if title is None:
+        return None
+
+    sold_text = fields.get('hotness')
+    if sold_text is None:
+        sold_text = fields.get('quantity_sold')
+
+    price_text = fields.get('price')
+    watchers_text = fields.get('watchers')
+
+    return Product(
+        title=title,
+        price=clean_price(price_text) if price_text is not None else 0.0,
+        url=fields['url'] if 'url' in fields else 'N/A',
+        seller=fields.get('seller', 'N/A'),
+        shipping=fields.get('shipping', 'N/A'),
+        sold_count=extract_first_number(sold_text) if sold_text is not None else 0,
+        watchers=extract_first_number(watchers_text) if watchers_text is not None else 0,
+        image_url=fields['image_url'] if 'image_url' in fields else 'N/A',
+        scraped_at=scraped_at,
+    )
+
+class BeautifulSoupBackend:
+    """html.parser + BeautifulSoup yedek arka ucu"""
+
+    name = 'bs4'
+    # İsteğe bağlı RunMetrics: çıkarma hataları ve eksik alanlar sayılır
+    metrics = None
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup_cls = BeautifulSoup
+
+    def iter_items(self, content):
+        soup = self._soup_cls(content, 'html.parser')
+        return soup.select(ITEM_SELECTOR)
+
+    def extract_item(self, item_element, scraped_at: Optional[str] = None) -> Optional[Product]:
+        """Tek bir li.s-item öğesinden ürün verisini çıkar"""
+        fields = {}
+        for (tag, cls), field in FIELD_CLASSES.items():
+            elem = item_element.find(tag, {'class': cls})
+            if elem is None:
+                continue
+            if field == 'url':
+                fields[field] = elem.get('href')
+            elif field == 'image_url':
+                fields[field] = elem.get('src')
+            else:
+                fields[field] = elem.get_text(strip=True)
+        return build_product(fields, scraped_at or datetime.now().isoformat())
+
+    def parse(self, content, limit: Optional[int] = None) -> List[Product]:
+        scraped_at = datetime.now().isoformat()
+        products = []
+        for item in self.iter_items(content)[:limit]:
+            try:
+                product = self.extract_item(item, scraped_at)
+                if product:
+                    products.append(product)
+                elif self.metrics is not None:
+                    # Başlığı olmayan öğe atlanır
+                    self.metrics.inc('extract_missing_total', field='title')
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.inc('extract_errors_total', backend=self.name)
+                logger.warning(f"Ürün verisi çıkarılırken hata: {e}")
+        return products
+
+class LxmlBackend:
+    """lxml + derlenmiş XPath ile tek geçişli hızlı arka uç"""
+
+    name = 'lxml'
+    metrics = None
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._fromstring = lxml.html.fromstring
+        self._items_xpath = etree.XPath(
+            "//li[contains(concat(' ', normalize-space(@class), ' '), ' s-item ')"
+            " and not(contains(concat(' ', normalize-space(@class), ' '), ' s-item__pl-on-bottom '))]"
+        )
+
+    def extract_item(self, item_element, scraped_at: str) -> Optional[Product]:
+        fields = {}
+        # Ürün alt ağacında tek geçiş: her alan için belge sırasındaki ilk eşleşme
+        for elem in item_element.iter():
+            class_attr = elem.get('class')
+            if not class_attr:
+                continue
+            tag = elem.tag
+            for cls in class_attr.split():
+                for field_tag, field in _CLASS_FIELDS.get(cls, ()):
+                    if field_tag != tag or field in fields:
+                        continue
+                    if field == 'url':
+                        fields[field] = elem.get('href')
+                    elif field == 'image_url':
+                        fields[field] = elem.get('src')
+                    else:
+                        fields[field] = ''.join(text.strip() for text in elem.itertext())
+        return build_product(fields, scraped_at)
+
+    def parse(self, content, limit: Optional[int] = None) -> List[Product]:
+        scraped_at = datetime.now().isoformat()
+        tree = self._fromstring(content)
+        products = []
+        for item in self._items_xpath(tree)[:limit]:
+            try:
+                product = self.extract_item(item, scraped_at)
+                if product:
+                    products.append(product)
+                elif self.metrics is not None:
+                    # Başlığı olmayan öğe atlanır
+                    self.metrics.inc('extract_missing_total', field='title')
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.inc('extract_errors_total', backend=self.name)
+                logger.warning(f"Ürün verisi çıkarılırken hata: {e}")
+        return products
+
+class SelectolaxBackend:
+    """selectolax (lexbor) + derlenmiş CSS seçici ile tek geçişli hızlı arka uç"""
+
+    name = 'selectolax'
+    metrics = None
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_cls = LexborHTMLParser
+
+    def extract_item(self, item_node, scraped_at: str) -> Optional[Product]:
+        fields = {}
+        # Ürün alt ağacında tek geçiş: her alan için belge sırasındaki ilk eşleşme
+        for node in item_node.traverse(include_text=False):
+            class_attr = node.attributes.get('class')
+            if not class_attr:
+                continue
+            tag = node.tag
+            for cls in class_attr.split():
+                for field_tag, field in _CLASS_FIELDS.get(cls, ()):
+                    if field_tag != tag or field in fields:
+                        continue
+                    if field == 'url':
+                        fields[field] = node.attributes.get('href')
+                    elif field == 'image_url':
+                        fields[field] = node.attributes.get('src')
+                    else:
+                        fields[field] = node.text(deep=True, separator='', strip=True)
+        return build_product(fields, scraped_at)
+
+    def parse(self, content, limit: Optional[int] = None) -> List[Product]:
+        scraped_at = datetime.now().isoformat()
+        tree = self._parser_cls(content)
+        products = []
+        for item in tree.css(ITEM_SELECTOR)[:limit]:
+            try:
+                product = self.extract_item(item, scraped_at)
+                if product:
+                    products.append(product)
+                elif self.metrics is not None:
+                    # Başlığı olmayan öğe atlanır
+                    self.metrics.inc('extract_missing_total', field='title')
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.inc('extract_errors_total', backend=self.name)
+                logger.warning(f"Ürün verisi çıkarılırken hata: {e}")
+        return products
+
+PARSER_BACKENDS = {
+    'selectolax': SelectolaxBackend,
+    'lxml': LxmlBackend,
+    'bs4': BeautifulSoupBackend,
+}
+
+def get_parser_backend(name: str = 'auto'):
+    """İsimle ayrıştırıcı arka ucu oluştur; 'auto' kurulu en hızlı arka ucu seçer"""
+    if name != 'auto':
+        if name not in PARSER_BACKENDS:
+            raise ValueError(f"Bilinmeyen ayrıştırıcı arka ucu: {name}")
+        return PARSER_BACKENDS[name]()
+
+    for backend_name, backend_cls in PARSER_BACKENDS.items():
+        try:
+            return backend_cls()
+        except ImportError:
+            logger.debug(f"Ayrıştırıcı arka ucu kullanılamıyor: {backend_name}")
+    raise ImportError("Hiçbir HTML ayrıştırıcı arka ucu kurulu değil (selectolax, lxml veya bs4)")
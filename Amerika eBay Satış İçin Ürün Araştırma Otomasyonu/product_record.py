@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Kompakt Ürün Kaydı
+Bu modül scraper'dan analizöre ve dışa aktarıcılara kadar kullanılan,
+__slots__ tabanlı Product kaydını içerir. Tekrarlanan metinler (arama terimi,
+satıcı, kargo, zaman damgası) intern edilerek tek kopya halinde tutulur;
+sözlük dönüşümü yalnızca JSON/CSV çıktısı gibi sınırlarda yapılır.
+"""
+
+import re
+import sys
+import json
+import hashlib
+from typing import List, Dict, Any, Iterable, Optional
+
+# Dışa aktarımda kullanılan sabit alan sırası
+PRODUCT_FIELDS = (
+    'title', 'price', 'url', 'seller', 'shipping', 'sold_count', 'watchers',
+    'image_url', 'scraped_at', 'search_keyword', 'advanced_score', 'analysis_timestamp'
+)
+
+# Yalnızca ayarlandığında dışa aktarılan alanlar
+OPTIONAL_FIELDS = frozenset(('search_keyword', 'advanced_score', 'analysis_timestamp'))
+
+# eBay ürün kimliği: /itm/<id> veya /itm/<slug>/<id>
+_ITEM_ID_RE = re.compile(r'/itm/(?:[^/?#]+/)?(\d{9,})')
+
+def extract_item_id(url: Optional[str], fallback: Optional[str] = None) -> str:
+    """URL'den eBay ürün kimliğini çıkar; bulunamazsa URL'nin (veya yedek metnin) özetini döndür"""
+    if url and url != 'N/A':
+        match = _ITEM_ID_RE.search(url)
+        if match:
+            return match.group(1)
+        return 'h:' + hashlib.sha1(url.split('?', 1)[0].encode('utf-8')).hexdigest()[:16]
+    return 'h:' + hashlib.sha1((fallback or '').encode('utf-8')).hexdigest()[:16]
+
+def _intern(value):
+    """Metinleri intern et; diğer değerleri olduğu gibi döndür"""
+    return sys.intern(value) if type(value) is str else value
+
+class Product:
+    """Tek bir eBay ürünü (sözlük yerine kompakt, sabit alanlı kayıt)"""
+
+    # search_keywords: ürün birden fazla sorguda bulunduysa tüm arama terimleri (tekilleştirmede doldurulur)
+    __slots__ = PRODUCT_FIELDS + ('search_keywords',)
+
+    def __init__(self, title: str = 'N/A', price: float = 0.0, url: Optional[str] = 'N/A',
+                 seller: str = 'N/A', shipping: str = 'N/A', sold_count: int = 0, watchers: int = 0,
+                 image_url: Optional[str] = 'N/A', scraped_at: Optional[str] = None,
+                 search_keyword: Optional[str] = None, advanced_score: Optional[float] = None,
+                 analysis_timestamp: Optional[str] = None, search_keywords: Optional[Iterable[str]] = None):
+        self.title = title
+        self.price = price
+        self.url = url
+        self.seller = _intern(seller)
+        self.shipping = _intern(shipping)
+        self.sold_count = sold_count
+        self.watchers = watchers
+        self.image_url = image_url
+        self.scraped_at = _intern(scraped_at)
+        self.search_keyword = _intern(search_keyword)
+        self.advanced_score = advanced_score
+        self.analysis_timestamp = analysis_timestamp
+        self.search_keywords = {_intern(keyword) for keyword in search_keywords} if search_keywords else None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Product':
+        """Sözlükten Product oluştur (bilinmeyen anahtarlar yok sayılır)"""
+        product = cls(**{key: value for key, value in data.items() if key in PRODUCT_FIELDS})
+        if data.get('search_keywords'):
+            product.search_keywords = {_intern(keyword) for keyword in data['search_keywords']}
+        return product
+
+    @classmethod
+    def coerce(cls, item) -> 'Product':
+        """Product ise olduğu gibi, sözlükse dönüştürerek döndür"""
+        return item if isinstance(item, cls) else cls.from_dict(item)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sabit alan sırasıyla sözlüğe dönüştür (JSON/CSV sınırı için)"""
+        data = {}
+        for field in PRODUCT_FIELDS:
+            value = getattr(self, field)
+            if value is None and field in OPTIONAL_FIELDS:
+                continue
+            data[field] = value
+        if self.search_keywords:
+            data['search_keywords'] = sorted(self.search_keywords)
+        return data
+
+    def all_keywords(self) -> set:
+        """Ürünün bulunduğu tüm arama terimleri"""
+        if self.search_keywords:
+            return set(self.search_keywords)
+        return {self.search_keyword} if self.search_keyword is not None else set()
+
+    @property
+    def item_id(self) -> str:
+        """eBay ürün kimliği (URL'den)"""
+        return extract_item_id(self.url, fallback=f"{self.title}|{self.image_url}")
+
+    # Sözlük benzeri erişim: mevcut product.get(...) kullanımları değişmeden çalışır
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in PRODUCT_FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in PRODUCT_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in PRODUCT_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, _intern(value) if key in ('seller', 'shipping', 'search_keyword', 'scraped_at') else value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in PRODUCT_FIELDS and getattr(self, key) is not None
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def copy(self) -> 'Product':
+        return Product(*(getattr(self, field) for field in PRODUCT_FIELDS), search_keywords=self.search_keywords)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Product):
+            return NotImplemented
+        return (all(getattr(self, field) == getattr(other, field) for field in PRODUCT_FIELDS)
+                and self.search_keywords == other.search_keywords)
+
+    def __repr__(self) -> str:
+        return f"Product(title={self.title!r}, price={self.price!r}, advanced_score={self.advanced_score!r})"
+
+def to_dicts(products: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Ürünleri sınırda sözlük listesine dönüştür"""
+    return [product.to_dict() if isinstance(product, Product) else product for product in products]
+
+def to_columns(products: List[Any], fields: Iterable[str] = PRODUCT_FIELDS) -> Dict[str, List[Any]]:
+    """Ürünleri sütun listelerine dönüştür; hiç değeri olmayan alanlar atlanır"""
+    columns = {}
+    for field in fields:
+        values = [product.get(field) for product in products]
+        if any(value is not None for value in values):
+            columns[field] = values
+    return columns
+
+def write_jsonl(products: Iterable[Any], path: str) -> int:
+    """Ürünleri satır başına bir JSON kaydı olarak yaz; yazılan ürün sayısını döndür"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for product in products:
+            data = product.to_dict() if isinstance(product, Product) else product
+            f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+            f.write('\n')
+            count += 1
+    return count
+
+def read_jsonl(path: str) -> Iterable[Product]:
+    """write_jsonl ile yazılan dosyadan ürünleri akış halinde oku"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield Product.from_dict(json.loads(line))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Dayanıklılık Katmanı
+Bu modül HTTP istekleri etrafında kullanılan yeniden deneme politikasını
+(Retry-After destekli, jitter'lı üstel geri çekilme), host başına devre
+kesiciyi ve gecikme/hata oranına göre eşzamanlılığı ayarlayan AIMD
+sınırlayıcısını içerir.
+"""
+
+import time
+import random
+import threading
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class CircuitOpenError(Exception):
+    """Host'un devre kesicisi açık; istek gönderilmedi"""
+
+class RetryableStatusError(Exception):
+    """Yeniden denenebilir HTTP durumu (429/5xx) deneme hakkı bitene kadar sürdü"""
+
+    def __init__(self, status_code: int, url: str, retry_after: Optional[float] = None):
+        message = f"HTTP {status_code}: {url}"
+        if retry_after is not None:
+            message += f" (Retry-After {retry_after:.0f} sn)"
+        super().__init__(message)
+        self.status_code = status_code
+        self.url = url
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After başlığını saniyeye çevir (saniye veya HTTP tarihi)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RetryPolicy:
+    """Jitter'lı üstel geri çekilme; 429/503'te Retry-After başlığına uyar
+
+    max_delay yalnızca kendi geri çekilmemizi sınırlar. Sunucunun istediği
+    bekleme max_retry_after'a kadar olduğu gibi uygulanır; daha uzunsa
+    beklenmez, istek başarısız sayılır (bkz. exceeds_budget).
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0,
+                 retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504), max_retry_after: float = 600.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """attempt. denemeden (0'dan başlar) sonra beklenecek süre"""
+        # Tam jitter: eşzamanlı istemcilerin aynı anda yeniden denemesini önler
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            # Sunucunun istediği süreden erken denenmez
+            return max(server_delay, backoff)
+        return backoff
+
+    def exceeds_budget(self, delay: float) -> bool:
+        """Sunucunun istediği bekleme yeniden deneme bütçesini aşıyor mu"""
+        return delay > self.max_retry_after
+
+class CircuitBreaker:
+    """Host başına devre kesici: art arda hatalarda açılır, bekleme sonrası tek deneme isteğine izin verir"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """İstek gönderilebilir mi; değilse CircuitOpenError"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN and time.monotonic() >= self.open_until:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(f"Devre açık ({self.failures} ardışık hata)")
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Devre kesici kapandı")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Devre kesici açıldı ({self.failures} ardışık hata)")
+                self.state = self.OPEN
+                self.open_until = time.monotonic() + self.reset_timeout
+                self._probe_in_flight = False
+
+    def trip(self, duration: float):
+        """Devreyi en az duration saniye (ör. sunucunun Retry-After süresi) boyunca aç"""
+        with self._lock:
+            if self.state != self.OPEN:
+                logger.warning(f"Devre kesici {duration:.0f} sn için açıldı (sunucu isteği)")
+            self.state = self.OPEN
+            self.open_until = max(self.open_until, time.monotonic() + max(duration, self.reset_timeout))
+            self._probe_in_flight = False
+
+class AdaptiveLimiter:
+    """AIMD eşzamanlılık sınırı: başarılı ve hızlı yanıtlarda artar, hata/yavaşlıkta yarıya iner"""
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_target: float = 2.0,
+                 backoff_factor: float = 0.5, cooldown: float = 1.0):
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.backoff_factor = backoff_factor
+        self.cooldown = cooldown
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Eşzamanlı istek sayısı sınırın altına inene kadar bekle"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, ok: bool):
+        """İsteğin sonucunu kaydet ve sınırı güncelle"""
+        with self._cond:
+            self.in_flight -= 1
+            if not ok or latency > self.latency_target:
+                # Aynı olay dalgasında sınır tekrar tekrar düşürülmez
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.backoff_factor)
+                    self._last_decrease = now
+                    logger.info(f"Eşzamanlılık sınırı düşürüldü: {int(self.limit)}")
+            else:
+                # Her "limit" başarılı istekte yaklaşık +1
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
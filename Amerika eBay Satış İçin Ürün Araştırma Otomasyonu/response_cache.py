@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Disk Üzerinde HTTP Yanıt Önbelleği
+Bu modül arama sayfası yanıtlarını normalleştirilmiş URL + parametre
+anahtarıyla, sıkıştırılmış olarak diskte saklar. TTL, boyut sınırlı LRU
+tahliyesi ve ETag/Last-Modified ile koşullu yeniden doğrulama destekler.
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dosya formatı: [4 bayt meta uzunluğu][meta JSON][zlib ile sıkıştırılmış gövde]
+_HEADER = struct.Struct('>I')
+_SUFFIX = '.zz'
+
+def normalize_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """URL ve parametreleri sıralı, küçük harfli host'lu kanonik biçime getir"""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query.sort()
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', urlencode(query), ''))
+
+def make_cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """İçerik adresli önbellek anahtarı (normalleştirilmiş URL'nin SHA-256 özeti)"""
+    return hashlib.sha256(normalize_url(url, params).encode('utf-8')).hexdigest()
+
+class CacheEntry:
+    """Önbellekteki tek bir yanıt"""
+
+    __slots__ = ('key', 'content', 'etag', 'last_modified', 'stored_at')
+
+    def __init__(self, key: str, content: bytes, etag: Optional[str], last_modified: Optional[str], stored_at: float):
+        self.key = key
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Koşullu istek başlıkları"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """TTL'li, boyut sınırlı LRU disk önbelleği (thread-safe)"""
+
+    def __init__(self, cache_dir: str = '.ebay_cache', ttl: float = 3600,
+                 max_bytes: int = 256 * 1024 * 1024, compress_level: int = 6):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(path.stat().st_size for path in self._iter_files())
+        if self._total_bytes > self.max_bytes:
+            with self._lock:
+                self._evict()
+
+    def _iter_files(self):
+        return self.cache_dir.glob(f'*/*{_SUFFIX}')
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{_SUFFIX}"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Girdiyi oku (süresi dolmuş olsa bile); yoksa None"""
+        path = self._path(key)
+        try:
+            raw = path.read_bytes()
+            meta_len = _HEADER.unpack_from(raw)[0]
+            meta = json.loads(raw[_HEADER.size:_HEADER.size + meta_len])
+            content = zlib.decompress(raw[_HEADER.size + meta_len:])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Bozuk önbellek girdisi siliniyor ({key[:12]}): {e}")
+            self._remove(path)
+            return None
+
+        # LRU için erişim zamanını güncelle
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return CacheEntry(key, content, meta.get('etag'), meta.get('last_modified'), meta['stored_at'])
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Girdi TTL içinde mi?"""
+        return (time.time() - entry.stored_at) < self.ttl
+
+    def lookup(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """Girdiyi ve tazelik durumunu döndür; isabet/ıska sayaçlarını güncelle"""
+        entry = self.get(key)
+        fresh = entry is not None and self.is_fresh(entry)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry, fresh
+
+    def put(self, key: str, content: bytes, headers: Optional[Dict[str, str]] = None) -> CacheEntry:
+        """Yanıtı sıkıştırarak atomik biçimde yaz"""
+        headers = headers or {}
+        entry = CacheEntry(key, content, headers.get('ETag'), headers.get('Last-Modified'), time.time())
+        self._write(entry)
+        return entry
+
+    def refresh(self, entry: CacheEntry) -> CacheEntry:
+        """304 Not Modified sonrası girdinin tazelik süresini yenile"""
+        entry.stored_at = time.time()
+        self._write(entry)
+        with self._lock:
+            self.revalidated += 1
+        return entry
+
+    def _write(self, entry: CacheEntry):
+        meta = json.dumps({
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'stored_at': entry.stored_at
+        }).encode('utf-8')
+        data = _HEADER.pack(len(meta)) + meta + zlib.compress(entry.content, self.compress_level)
+
+        path = self._path(entry.key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+
+    def _evict(self):
+        """En uzun süredir kullanılmayan girdileri sınırın %90'ına inene kadar sil (kilit altında çağrılır)"""
+        files = []
+        for path in self._iter_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        target = self.max_bytes * 0.9
+        evicted = 0
+        for _, size, path in files:
+            if self._total_bytes <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            self._total_bytes -= size
+            evicted += 1
+        logger.info(f"Önbellekten {evicted} girdi tahliye edildi")
+
+    def clear(self):
+        """Tüm önbelleği temizle"""
+        for path in list(self._iter_files()):
+            self._remove(path)
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Çalıştırma Metrikleri
+Bu modül bir çalıştırmanın zamanının nereye gittiğini ölçen aşama
+zamanlayıcılarını, sayaçları ve histogramları içerir (veri çekme gecikmesi,
+indirilen bayt, sayfa başına ayrıştırma süresi, alan bazında çıkarma
+hataları, skorlama ve dışa aktarma süreleri). Metrikler yapılandırılmış JSON
+raporu ve Prometheus metin biçimi (dosya veya HTTP uç noktası) olarak
+verilir. İsteğe bağlı olarak seçilen aşamalar cProfile veya pyinstrument ile
+profillenir.
+"""
+
+import os
+import time
+import json
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Prometheus metrik adı öneki
+METRIC_PREFIX = 'ebay_scraper_'
+
+# Saniye cinsinden gecikme kovaları (üst sınırlar)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Sayfa başına ürün/sn kovaları
+RATE_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+# Ayrıştırılan üründe bu değeri taşıyan alan çıkarılamamış sayılır
+# (satış/izleyici sayısı 0 olabildiği için hata sayılmaz)
+EXTRACTION_DEFAULTS = (('price', 0.0), ('url', 'N/A'), ('seller', 'N/A'), ('shipping', 'N/A'), ('image_url', 'N/A'))
+
+def _label_key(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _label_text(key: Tuple[Tuple[str, str], ...]) -> str:
+    return ','.join(f"{name}={value}" for name, value in key)
+
+def _prometheus_labels(key: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+class Histogram:
+    """Sabit kovalı histogram (Prometheus biçiminde birikimli kovalar)"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # son kova: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Kova içinde doğrusal interpolasyonla yaklaşık kantil"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index else (self.min or 0.0)
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        buckets = []
+        for bound, bucket_count in zip(self.bounds + (float('inf'),), self.counts):
+            total += bucket_count
+            buckets.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return buckets
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': self.min,
+            'max': self.max,
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+        }
+
+class RunMetrics:
+    """İş parçacığı güvenli aşama zamanlayıcıları, sayaçlar ve histogramlar"""
+
+    def __init__(self, run_id: Optional[str] = None, profile: Optional[str] = None,
+                 profile_stages: Optional[Iterable[str]] = None, profile_dir: str = 'profiles'):
+        if profile is not None and profile not in PROFILERS:
+            raise ValueError(f"Bilinmeyen profil aracı: {profile} ({', '.join(PROFILERS)})")
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.started_at = datetime.now().isoformat()
+        self._start = time.perf_counter()
+        self.counters: Dict[str, Dict[tuple, float]] = {}
+        self.histograms: Dict[str, Dict[tuple, Histogram]] = {}
+        self.stages: Dict[str, List[float]] = {}  # aşama -> [toplam sn, çağrı sayısı]
+        self.profile = profile
+        self.profile_stages = set(profile_stages) if profile_stages else None
+        self.profile_dir = profile_dir
+        self.profiles: List[str] = []
+        self._profiling = False
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Sayaç artır"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Iterable[float] = LATENCY_BUCKETS, **labels):
+        """Histograma gözlem ekle"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Aşama süresini ölç; profil açıksa ve aşama seçiliyse profille"""
+        profiler = self._start_profiler(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                totals = self.stages.setdefault(name, [0.0, 0])
+                totals[0] += elapsed
+                totals[1] += 1
+            if profiler is not None:
+                self._stop_profiler(profiler, name)
+
+    def record_products(self, products: Iterable[Any]):
+        """Ayrıştırılan ürünlerde alan bazında çıkarılamayan değerleri say"""
+        missing = dict.fromkeys((field for field, _ in EXTRACTION_DEFAULTS), 0)
+        for product in products:
+            for field, default in EXTRACTION_DEFAULTS:
+                if getattr(product, field) == default:
+                    missing[field] += 1
+        for field, count in missing.items():
+            if count:
+                self.inc('extract_missing_total', count, field=field)
+
+    # Profil kancası
+
+    def _start_profiler(self, name: str):
+        """Seçili aşama için profil aracını başlat (iç içe aşamalarda yalnızca en dıştaki profillenir)"""
+        if self.profile is None or self._profiling:
+            return None
+        if self.profile_stages is not None and name not in self.profile_stages:
+            return None
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        try:
+            if self.profile == 'pyinstrument':
+                from pyinstrument import Profiler
+                profiler = Profiler()
+                profiler.start()
+            else:
+                import cProfile
+                profiler = cProfile.Profile()
+                profiler.enable()
+        except ImportError as e:
+            logger.error(f"Profil aracı yüklenemedi, profil kapatıldı: {e}")
+            self.profile = None
+            return None
+        self._profiling = True
+        return profiler
+
+    def _stop_profiler(self, profiler, name: str):
+        self._profiling = False
+        os.makedirs(self.profile_dir, exist_ok=True)
+        base = os.path.join(self.profile_dir, f"{self.run_id}_{name}")
+        try:
+            if self.profile == 'pyinstrument':
+                profiler.stop()
+                path = f"{base}.html"
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(profiler.output_html())
+            else:
+                profiler.disable()
+                path = f"{base}.prof"
+                profiler.dump_stats(path)
+        except Exception as e:
+            logger.error(f"Profil kaydedilemedi ({name}): {e}")
+            return
+        self.profiles.append(path)
+        logger.info(f"Profil kaydedildi: {path}")
+
+    # Çıktılar
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Yapılandırılmış çalıştırma raporu"""
+        with self._lock:
+            return {
+                'run_id': self.run_id,
+                'started_at': self.started_at,
+                'elapsed_seconds': round(time.perf_counter() - self._start, 6),
+                'stages': {name: {'seconds': round(total, 6), 'calls': calls}
+                           for name, (total, calls) in self.stages.items()},
+                'counters': {name: {_label_text(key): value for key, value in series.items()}
+                             for name, series in self.counters.items()},
+                'histograms': {name: {_label_text(key): histogram.to_dict() for key, histogram in series.items()}
+                               for name, series in self.histograms.items()},
+                'profiles': list(self.profiles),
+            }
+
+    def to_prometheus(self) -> str:
+        """Prometheus metin biçimi (0.0.4)"""
+        lines = []
+        with self._lock:
+            if self.stages:
+                for suffix, index, kind in (('stage_seconds_total', 0, 'counter'), ('stage_calls_total', 1, 'counter')):
+                    lines.append(f"# TYPE {METRIC_PREFIX}{suffix} {kind}")
+                    for name, totals in self.stages.items():
+                        lines.append(f"{METRIC_PREFIX}{suffix}{_prometheus_labels((('stage', name),))} {totals[index]}")
+            for name, series in self.counters.items():
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+                for key, value in series.items():
+                    lines.append(f"{METRIC_PREFIX}{name}{_prometheus_labels(key)} {value}")
+            for name, series in self.histograms.items():
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} histogram")
+                for key, histogram in series.items():
+                    for bound, count in histogram.cumulative():
+                        lines.append(f"{METRIC_PREFIX}{name}_bucket{_prometheus_labels(key, ('le', bound))} {count}")
+                    lines.append(f"{METRIC_PREFIX}{name}_sum{_prometheus_labels(key)} {histogram.sum}")
+                    lines.append(f"{METRIC_PREFIX}{name}_count{_prometheus_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, path: str):
+        """node_exporter textfile toplayıcısı için atomik yazım"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+    def serve(self, port: int, host: str = '0.0.0.0'):
+        """/metrics uç noktasını arka plan iş parçacığında sun; sunucu nesnesini döndür"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        logger.info(f"Metrik uç noktası: http://{host}:{server.server_address[1]}/metrics")
+        return server
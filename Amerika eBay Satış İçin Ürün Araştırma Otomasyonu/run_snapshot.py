@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Bellek Eşlemeli Çalıştırma Anlık Görüntüsü
+Bu modül bir çalıştırmanın analiz edilen ürünlerini ikili, sütunlu bir
+dosyaya (`*.snap`) yazar: fiyat, satış, izleyici ve skor için sabit
+genişlikli sayısal sütunlar, arama terimi için sözlük kodlu tamsayı sütunu,
+başlık/url/satıcı için ofset dizisi + UTF-8 baytlarından oluşan metin
+tabloları. Dosya `np.memmap` ile açılır; sütunlar kopyalanmadan dosyanın
+üzerine görünüm (view) olarak okunur, böylece çok sayıda geçmiş çalıştırma
+JSON ayrıştırmadan karşılaştırılabilir.
+
+Dosya düzeni:
+    MAGIC (8 bayt) | başlık uzunluğu (<u4) | JSON başlık | dolgu | veri bölümü
+Başlıktaki ofsetler veri bölümünün başına görelidir; her sütun 8 bayta hizalıdır.
+"""
+
+import os
+import glob
+import json
+import struct
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from insights import PRICE_BUCKETS, SCORE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'EBSNAP1\n'
+FORMAT_VERSION = 1
+
+# Sabit genişlikli sayısal sütunlar (küçük endian); eksik fiyat/skor NaN, eksik sayılar 0
+NUMERIC_COLUMNS = (
+    ('price', '<f8'),
+    ('sold_count', '<i8'),
+    ('watchers', '<i8'),
+    ('advanced_score', '<f8'),
+)
+
+# Arama terimi sözlük kodlu tutulur (-1: yok)
+KEYWORD_DTYPE = '<i4'
+
+# Metin tabloları: n+1 elemanlı ofset dizisi ve birleştirilmiş UTF-8 baytları
+STRING_COLUMNS = ('title', 'url', 'seller')
+
+_ALIGNMENT = 8
+_DATA_ALIGNMENT = 64
+_LENGTH = struct.Struct('<I')
+
+def _padding(size: int, alignment: int = _ALIGNMENT) -> int:
+    return -size % alignment
+
+def _number(value, default):
+    """Sayısal alan değeri (None/geçersiz değerler varsayılana düşer)"""
+    if value is None:
+        return default
+    try:
+        return float(value) if isinstance(default, float) else int(value)
+    except (TypeError, ValueError):
+        return default
+
+def write_snapshot(products: Iterable[Any], path: str, run_id: Optional[str] = None) -> int:
+    """Ürünleri ikili anlık görüntü dosyasına yaz; yazılan ürün sayısını döndür
+
+    Dosya önce geçici adla yazılıp yerine taşınır; yarım dosya okunmaz.
+    """
+    columns: Dict[str, list] = {name: [] for name, _ in NUMERIC_COLUMNS}
+    strings: Dict[str, List[bytes]] = {name: [] for name in STRING_COLUMNS}
+    keyword_codes: List[int] = []
+    keywords: Dict[str, int] = {}
+
+    nan = float('nan')
+    for product in products:
+        columns['price'].append(_number(product.get('price'), nan))
+        columns['sold_count'].append(_number(product.get('sold_count'), 0))
+        columns['watchers'].append(_number(product.get('watchers'), 0))
+        columns['advanced_score'].append(_number(product.get('advanced_score'), nan))
+        keyword = product.get('search_keyword')
+        keyword_codes.append(-1 if keyword is None else keywords.setdefault(keyword, len(keywords)))
+        for name in STRING_COLUMNS:
+            strings[name].append((product.get(name) or '').encode('utf-8'))
+
+    count = len(keyword_codes)
+    blocks = []
+    layout: Dict[str, Any] = {'columns': {}, 'strings': {}}
+    offset = 0
+
+    def add_block(data: bytes) -> int:
+        nonlocal offset
+        start = offset
+        blocks.append(data)
+        padding = _padding(len(data))
+        if padding:
+            blocks.append(b'\0' * padding)
+        offset += len(data) + padding
+        return start
+
+    for name, dtype in NUMERIC_COLUMNS:
+        layout['columns'][name] = {'offset': add_block(np.asarray(columns[name], dtype=dtype).tobytes()),
+                                   'dtype': dtype}
+    layout['columns']['search_keyword'] = {
+        'offset': add_block(np.asarray(keyword_codes, dtype=KEYWORD_DTYPE).tobytes()), 'dtype': KEYWORD_DTYPE
+    }
+    for name in STRING_COLUMNS:
+        values = strings[name]
+        offsets = np.zeros(count + 1, dtype='<u8')
+        if values:
+            np.cumsum(np.fromiter(map(len, values), dtype='<u8', count=count), out=offsets[1:])
+        layout['strings'][name] = {
+            'offsets': add_block(offsets.tobytes()),
+            'data': add_block(b''.join(values)),
+            'size': int(offsets[-1]),
+        }
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'run_id': run_id,
+        'created_at': datetime.now().isoformat(),
+        'count': count,
+        'keywords': list(keywords),
+        **layout,
+    }, ensure_ascii=False).encode('utf-8')
+    prefix = MAGIC + _LENGTH.pack(len(header)) + header
+    prefix += b'\0' * _padding(len(prefix), _DATA_ALIGNMENT)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(prefix)
+        for block in blocks:
+            f.write(block)
+    os.replace(temp_path, path)
+    logger.info(f"Anlık görüntü kaydedildi: {path} ({count} ürün, {len(prefix) + offset} bayt)")
+    return count
+
+class StringColumn:
+    """Bellek eşlemeli metin tablosu; yalnızca erişilen satırlar çözülür"""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self.data[int(self.offsets[index]):int(self.offsets[index + 1])].tobytes().decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def take(self, indices: Iterable[int]) -> List[str]:
+        return [self[int(index)] for index in indices]
+
+class RunSnapshot:
+    """Bir `*.snap` dosyasının salt okunur, kopyasız görünümü"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"Geçersiz anlık görüntü dosyası: {path}")
+            (header_length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+            self.header = json.loads(f.read(header_length).decode('utf-8'))
+        if self.header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen anlık görüntü sürümü: {self.header.get('version')}")
+
+        prefix_length = len(MAGIC) + _LENGTH.size + header_length
+        self._data_start = prefix_length + _padding(prefix_length, _DATA_ALIGNMENT)
+        self.count = self.header['count']
+        self.run_id = self.header.get('run_id')
+        self.keywords: List[str] = self.header['keywords']
+        self._mmap = np.memmap(path, dtype=np.uint8, mode='r')
+        self._columns: Dict[str, np.ndarray] = {}
+        self._strings: Dict[str, StringColumn] = {}
+
+    def _view(self, offset: int, dtype: str, count: int) -> np.ndarray:
+        return np.frombuffer(self._mmap, dtype=dtype, count=count, offset=self._data_start + offset)
+
+    def column(self, name: str) -> np.ndarray:
+        """Sayısal sütun (price, sold_count, watchers, advanced_score, search_keyword kodları)"""
+        array = self._columns.get(name)
+        if array is None:
+            spec = self.header['columns'][name]
+            array = self._columns[name] = self._view(spec['offset'], spec['dtype'], self.count)
+        return array
+
+    def strings(self, name: str) -> StringColumn:
+        """Metin tablosu (title, url, seller)"""
+        column = self._strings.get(name)
+        if column is None:
+            spec = self.header['strings'][name]
+            column = self._strings[name] = StringColumn(
+                self._view(spec['offsets'], '<u8', self.count + 1),
+                self._view(spec['data'], np.uint8, spec['size'])
+            )
+        return column
+
+    @property
+    def price(self) -> np.ndarray:
+        return self.column('price')
+
+    @property
+    def sold_count(self) -> np.ndarray:
+        return self.column('sold_count')
+
+    @property
+    def watchers(self) -> np.ndarray:
+        return self.column('watchers')
+
+    @property
+    def advanced_score(self) -> np.ndarray:
+        return self.column('advanced_score')
+
+    @property
+    def keyword_codes(self) -> np.ndarray:
+        return self.column('search_keyword')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Tek bir ürünü sözlük olarak çöz (rapor satırları için)"""
+        code = int(self.keyword_codes[index])
+        row = {name: self.strings(name)[index] for name in STRING_COLUMNS}
+        for name, _ in NUMERIC_COLUMNS:
+            value = self.column(name)[index].item()
+            row[name] = None if isinstance(value, float) and value != value else value
+        row['search_keyword'] = self.keywords[code] if code >= 0 else None
+        return row
+
+    def top(self, column: str = 'advanced_score', limit: int = 10) -> List[Dict[str, Any]]:
+        """Sütuna göre en yüksek ürünler (yalnızca seçilen satırlar çözülür)"""
+        values = self.column(column)
+        if column in ('price', 'advanced_score'):
+            values = np.nan_to_num(values, nan=-np.inf)
+        limit = min(limit, self.count)
+        if limit <= 0:
+            return []
+        candidates = np.argpartition(-values, limit - 1)[:limit]
+        # Eşit değerlerde dosya sırası korunur
+        ordered = candidates[np.lexsort((candidates, -values[candidates]))]
+        return [self.row(int(index)) for index in ordered]
+
+    def close(self):
+        self._columns.clear()
+        self._strings.clear()
+        self._mmap = None
+
+    def __enter__(self) -> 'RunSnapshot':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def snapshot_paths(paths: Union[str, Iterable[str]]) -> List[str]:
+    """Dosya yollarını, glob desenlerini ve dizinleri `.snap` dosyalarına genişlet (tekrarlar bir kez)"""
+    if isinstance(paths, str):
+        paths = [paths]
+    found: Dict[str, str] = {}
+    for path in paths:
+        pattern = os.path.join(path, '*.snap') if os.path.isdir(path) else path
+        for match in sorted(glob.glob(pattern)):
+            found.setdefault(os.path.realpath(match), match)
+    return list(found.values())
+
+def open_snapshots(paths: Union[str, Iterable[str]]) -> List[RunSnapshot]:
+    """Dosya yollarından, glob desenlerinden veya dizinlerden anlık görüntüleri çalıştırma sırasıyla aç"""
+    snapshots = [RunSnapshot(path) for path in snapshot_paths(paths)]
+    snapshots.sort(key=lambda snapshot: (snapshot.header.get('created_at') or '', snapshot.path))
+    return snapshots
+
+def snapshot_insights(snapshots: Union[RunSnapshot, Iterable[RunSnapshot]]) -> Dict[str, Any]:
+    """generate_insights yapısında toplu istatistikler (başlık trendleri hariç), vektörel
+
+    Birden fazla anlık görüntü verilirse tek veri seti gibi toplanır; toplamlar
+    çalıştırma başına hesaplanır, yalnızca medyan için fiyat sütunları birleştirilir.
+    """
+    if isinstance(snapshots, RunSnapshot):
+        snapshots = [snapshots]
+
+    total_products = 0
+    score_count = 0
+    score_sum = 0.0
+    score_distribution = np.zeros(len(SCORE_BUCKETS), dtype=np.int64)
+    price_values = []
+    price_ranges = np.zeros(len(PRICE_BUCKETS), dtype=np.int64)
+    keyword_totals: Dict[str, List[float]] = {}
+
+    score_bounds = np.array([bound for _, bound in SCORE_BUCKETS[:-1]])
+    price_bounds = np.array([bound for _, bound in PRICE_BUCKETS[:-1]])
+
+    for snapshot in snapshots:
+        total_products += snapshot.count
+        scores = snapshot.advanced_score
+        scored = ~np.isnan(scores)
+        valid_scores = scores[scored]
+        score_count += len(valid_scores)
+        score_sum += float(valid_scores.sum())
+        # SCORE_BUCKETS azalan alt sınırlarla sıralı: eşiği geçen ilk kova
+        score_distribution += np.bincount(np.searchsorted(-score_bounds, -valid_scores, side='left'),
+                                          minlength=len(SCORE_BUCKETS))
+
+        codes = snapshot.keyword_codes[scored]
+        keyed = codes >= 0
+        if snapshot.keywords and keyed.any():
+            sums = np.bincount(codes[keyed], weights=valid_scores[keyed], minlength=len(snapshot.keywords))
+            counts = np.bincount(codes[keyed], minlength=len(snapshot.keywords))
+            for code, keyword in enumerate(snapshot.keywords):
+                if counts[code]:
+                    stats = keyword_totals.setdefault(keyword, [0.0, 0])
+                    stats[0] += float(sums[code])
+                    stats[1] += int(counts[code])
+
+        prices = snapshot.price
+        prices = prices[~np.isnan(prices)]
+        price_values.append(prices)
+        price_ranges += np.bincount(np.searchsorted(price_bounds, prices, side='right'),
+                                    minlength=len(PRICE_BUCKETS))
+
+    if total_products == 0:
+        return {}
+
+    insights = {
+        'total_products': total_products,
+        'average_score': score_sum / score_count if score_count else 0,
+        'score_distribution': ({label: int(count) for (label, _), count in zip(SCORE_BUCKETS, score_distribution)}
+                               if score_count else {}),
+        'price_analysis': {},
+        'category_performance': {
+            keyword: float(total / count) for keyword, (total, count) in sorted(keyword_totals.items())
+        },
+    }
+
+    prices = np.concatenate(price_values) if len(price_values) > 1 else price_values[0]
+    if len(prices):
+        insights['price_analysis'] = {
+            'average_price': float(prices.mean()),
+            'median_price': float(np.median(prices)),
+            'min_price': float(prices.min()),
+            'max_price': float(prices.max()),
+            'price_ranges': {label: int(count) for (label, _), count in zip(PRICE_BUCKETS, price_ranges)}
+        }
+
+    return insights
+
+def compare_runs(snapshots: Iterable[RunSnapshot]) -> List[Dict[str, Any]]:
+    """Çalıştırma başına özet satırları (ürün sayısı, ortalama skor/fiyat, medyan fiyat, toplam satış)"""
+    rows = []
+    for snapshot in snapshots:
+        insights = snapshot_insights(snapshot)
+        price_analysis = insights.get('price_analysis') or {}
+        rows.append({
+            'run_id': snapshot.run_id,
+            'path': snapshot.path,
+            'total_products': snapshot.count,
+            'average_score': round(insights.get('average_score', 0), 2),
+            'average_price': round(price_analysis.get('average_price', 0), 2),
+            'median_price': round(price_analysis.get('median_price', 0), 2),
+            'total_sold': int(snapshot.sold_count.sum()),
+            'total_watchers': int(snapshot.watchers.sum()),
+        })
+    return rows
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Zamanlayıcı Servisi (Daemon)
+Bu modül piyasa araştırmasını tek seferlik cron çağrıları yerine sürekli
+çalışan bir süreçte yürütür. Oturum/bağlantı havuzu ve analizör sıcak kalır;
+sorgu grupları (ör. sık yenilenen trend terimleri, seyrek yenilenen
+kategoriler) kendi aralıklarıyla çalışır. Dosya kilidi aynı anda iki
+çalıştırmanın (başka bir daemon veya aynı kilidi alan `ebay_scraper.py`
+tam çalıştırması/cron süreci dahil) çakışmasını önler;
+SIGTERM/SIGINT gelen çalıştırma bittikten sonra temiz kapanış sağlar.
+"""
+
+import os
+import time
+import heapq
+import signal
+import logging
+import argparse
+import threading
+from typing import List, Dict, Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Çakışma politikaları: kilit doluysa bu turu atla ya da kilit boşalana kadar bekle
+OVERLAP_POLICIES = ('skip', 'queue')
+
+class RunLock:
+    """Süreçler arası özel dosya kilidi (süreç ölürse işletim sistemi kilidi bırakır)"""
+
+    def __init__(self, path: str = 'ebay_scraper.lock'):
+        self.path = path
+        self._fd = None
+
+    def acquire(self) -> bool:
+        """Kilidi beklemeden almayı dene; alındıysa True"""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        # Tanılama için kilidi tutan sürecin kimliği
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode('ascii'))
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+def acquire_run_lock(lock: RunLock, overlap: str = 'skip', poll_interval: float = 5.0,
+                     stop: Optional[threading.Event] = None) -> bool:
+    """Politikaya göre kilidi al: skip hemen vazgeçer, queue kilit boşalana (veya stop gelene) kadar bekler"""
+    if overlap not in OVERLAP_POLICIES:
+        raise ValueError(f"Geçersiz çakışma politikası: {overlap} ({', '.join(OVERLAP_POLICIES)})")
+    if lock.acquire():
+        return True
+    if overlap == 'skip':
+        return False
+    logger.info("Başka bir çalıştırma sürüyor, kilit bekleniyor...")
+    stop = stop or threading.Event()
+    while not stop.wait(poll_interval):
+        if lock.acquire():
+            return True
+    return False
+
+class ScheduleGroup:
+    """Kendi çalışma aralığı olan sorgu grubu (boş liste: o türden sorgu yok)"""
+
+    def __init__(self, name: str, interval: float, categories: Optional[List[str]] = None,
+                 keywords: Optional[List[str]] = None):
+        if interval <= 0:
+            raise ValueError("interval pozitif olmalı")
+        self.name = name
+        self.interval = interval
+        self.categories = categories or []
+        self.keywords = keywords or []
+        self.runs = 0
+        self.skipped = 0
+        self.last_run = None
+        self.last_error = None
+
+    def __repr__(self):
+        return (f"ScheduleGroup({self.name!r}, interval={self.interval}, "
+                f"categories={len(self.categories)}, keywords={len(self.keywords)})")
+
+def default_groups(scraper, hot_interval: float = 2 * 3600, cold_interval: float = 12 * 3600) -> List[ScheduleGroup]:
+    """Trend terimleri sık, kategoriler seyrek (varsayılan 12 saat) yenilenir"""
+    return [
+        ScheduleGroup('hot_keywords', hot_interval, keywords=list(scraper.trending_keywords)),
+        ScheduleGroup('categories', cold_interval, categories=list(scraper.categories)),
+    ]
+
+class SchedulerDaemon:
+    """Sorgu gruplarını zamanı geldikçe sıcak bir scraper ile çalıştıran servis"""
+
+    def __init__(self, scraper, groups: List[ScheduleGroup], lock_path: str = 'ebay_scraper.lock',
+                 overlap: str = 'skip', filename_prefix: str = 'ebay_market_research',
+                 parquet_dir: Optional[str] = None, lock_poll_interval: float = 5.0):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Geçersiz çakışma politikası: {overlap} ({', '.join(OVERLAP_POLICIES)})")
+        if not groups:
+            raise ValueError("En az bir sorgu grubu gerekli")
+        self.scraper = scraper
+        self.groups = groups
+        self.lock = RunLock(lock_path)
+        self.overlap = overlap
+        self.filename_prefix = filename_prefix
+        self.parquet_dir = parquet_dir
+        self.lock_poll_interval = lock_poll_interval
+        self._stop = threading.Event()
+
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT: yeni çalıştırma başlatma, süren çalıştırma bitince çık"""
+        def handle(signum, frame):
+            logger.info(f"Sinyal alındı ({signal.Signals(signum).name}), servis kapanıyor...")
+            self.stop()
+        signal.signal(signal.SIGTERM, handle)
+        signal.signal(signal.SIGINT, handle)
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def _acquire_lock(self) -> bool:
+        """Politikaya göre kilidi al: skip hemen vazgeçer, queue kapanış istenene kadar bekler"""
+        return acquire_run_lock(self.lock, self.overlap, self.lock_poll_interval, self._stop)
+
+    def run_group(self, group: ScheduleGroup) -> Optional[Dict[str, Any]]:
+        """Grubu kilit altında bir kez çalıştır ve sonuçları kaydet"""
+        if not self._acquire_lock():
+            group.skipped += 1
+            logger.warning(f"'{group.name}' grubu atlandı: başka bir çalıştırma sürüyor ({self.lock.path})")
+            return None
+
+        start = time.monotonic()
+        try:
+            logger.info(f"'{group.name}' grubu çalıştırılıyor "
+                        f"({len(group.categories)} kategori, {len(group.keywords)} terim)")
+            results = self.scraper.run_market_research(categories=group.categories, keywords=group.keywords)
+            self.scraper.save_results(results, filename_prefix=f"{self.filename_prefix}_{group.name}",
+                                      parquet_dir=self.parquet_dir)
+            group.runs += 1
+            group.last_error = None
+            logger.info(f"'{group.name}' grubu tamamlandı: {results['total_products_analyzed']} ürün, "
+                        f"{time.monotonic() - start:.1f} sn")
+            return results
+        except Exception as e:
+            group.last_error = str(e)
+            logger.error(f"'{group.name}' grubu başarısız: {e}")
+            return None
+        finally:
+            group.last_run = time.time()
+            self.lock.release()
+
+    def run_forever(self, run_immediately: bool = True, max_runs: Optional[int] = None):
+        """Gruplar zamanı geldikçe çalışır; stop() veya sinyal ile çıkar"""
+        now = time.monotonic()
+        # (sonraki çalışma zamanı, sıra, grup) yığını; sıra eşit zamanlarda tanım sırasını korur
+        schedule = [(now if run_immediately else now + group.interval, index, group)
+                    for index, group in enumerate(self.groups)]
+        heapq.heapify(schedule)
+        completed = 0
+
+        logger.info(f"Zamanlayıcı başlatıldı: {', '.join(f'{g.name}={g.interval:g}sn' for g in self.groups)} "
+                    f"(çakışma politikası: {self.overlap})")
+        try:
+            while not self._stop.is_set():
+                due, index, group = schedule[0]
+                wait = due - time.monotonic()
+                if wait > 0 and self._stop.wait(wait):
+                    break
+
+                self.run_group(group)
+                completed += 1
+                if max_runs is not None and completed >= max_runs:
+                    break
+
+                # Kayma birikmez; uzun süren çalıştırmadan sonra kaçırılan turlar art arda koşulmaz
+                next_due = due + group.interval
+                now = time.monotonic()
+                if next_due <= now:
+                    next_due = now + group.interval
+                heapq.heapreplace(schedule, (next_due, index, group))
+        finally:
+            self.lock.release()
+            logger.info("Zamanlayıcı durdu: " + ", ".join(
+                f"{g.name} {g.runs} çalıştırma/{g.skipped} atlama" for g in self.groups))
+
+def main():
+    """Komut satırı: sürekli çalışan zamanlayıcı servisi"""
+    parser = argparse.ArgumentParser(description="eBay piyasa araştırması zamanlayıcı servisi")
+    parser.add_argument('--hot-interval', type=float, default=2 * 3600, help='Trend terimleri aralığı (sn)')
+    parser.add_argument('--cold-interval', type=float, default=12 * 3600, help='Kategoriler aralığı (sn)')
+    parser.add_argument('--overlap', choices=OVERLAP_POLICIES, default='skip',
+                        help='Kilit doluysa: turu atla (skip) veya bekle (queue)')
+    parser.add_argument('--lock', default='ebay_scraper.lock', help='Çalıştırma kilidi dosyası')
+    parser.add_argument('--cache-dir', default='.ebay_cache', help='Yanıt önbelleği dizini')
+    parser.add_argument('--history-db', default='ebay_history.sqlite3', help='Ürün geçmişi veritabanı')
+    parser.add_argument('--parquet-dir', default=None, help='Parquet dışa aktarım dizini')
+    parser.add_argument('--delta-snapshot', default=None, help='Delta modu anlık görüntü dosyası')
+    parser.add_argument('--metrics-port', type=int, default=None, help='Prometheus /metrics uç noktası portu')
+    parser.add_argument('--metrics-prom', default=None, help='Her çalıştırmadan sonra yazılan Prometheus metin dosyası')
+    parser.add_argument('--once', action='store_true', help='Her grubu bir kez çalıştır ve çık')
+    args = parser.parse_args()
+
+    from ebay_scraper import EbayScraper
+
+    scraper = EbayScraper(cache_dir=args.cache_dir, history_db=args.history_db,
+                          delta_snapshot=args.delta_snapshot, metrics_prom_path=args.metrics_prom)
+    # Sıcak süreçte metrikler çalıştırmalar boyunca birikir (Prometheus sayaçları)
+    metrics_server = scraper.metrics.serve(args.metrics_port) if args.metrics_port else None
+    groups = default_groups(scraper, args.hot_interval, args.cold_interval)
+    daemon = SchedulerDaemon(scraper, groups, lock_path=args.lock, overlap=args.overlap,
+                             parquet_dir=args.parquet_dir)
+    daemon.install_signal_handlers()
+    try:
+        daemon.run_forever(max_runs=len(groups) if args.once else None)
+    finally:
+        if metrics_server is not None:
+            metrics_server.shutdown()
+        scraper.close()
+
+if __name__ == "__main__":
+    main()
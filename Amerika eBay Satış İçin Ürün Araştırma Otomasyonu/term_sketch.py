@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Sınırlı Bellekli Trend Terim Takibi
+Bu modül başlıklardaki en sık kelime ve ikili kelime gruplarını (bigram)
+Space-Saving algoritmasıyla sabit bellekte takip eder. Her sayaç en fazla
+N / kapasite kadar fazla sayar (N: toplam gözlem); özetler parçalar ve
+çalıştırmalar arasında birleştirilebilir ve JSON'a kaydedilebilir.
+"""
+
+import re
+import math
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+# Başlık kelimesi deseni ve yaygın kelimeler
+TITLE_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+STOP_WORDS = frozenset({'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an'})
+
+class SpaceSaving:
+    """Space-Saving heavy-hitters özeti (stream-summary kovalarıyla O(1) artırım)"""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = max(1, int(capacity))
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        # sayı -> o sayıya sahip öğeler (ekleme sıralı küme; en eskisi O(1) çıkarılır)
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min = 0
+
+    @classmethod
+    def from_error(cls, epsilon: float) -> 'SpaceSaving':
+        """Sayaç hatası en fazla epsilon * N olacak kapasiteyle oluştur"""
+        return cls(math.ceil(1 / epsilon))
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _bucket_add(self, item: str, count: int):
+        bucket = self._buckets.get(count)
+        if bucket is None:
+            bucket = self._buckets[count] = OrderedDict()
+        bucket[item] = None
+
+    def _bucket_remove(self, item: str, count: int):
+        bucket = self._buckets[count]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[count]
+
+    def add(self, item: str, count: int = 1):
+        """Öğeyi count kez gözlemle"""
+        self.total += count
+        current = self._counts.get(item)
+
+        if current is not None:
+            vacated = current
+            new_count = current + count
+            self._bucket_remove(item, current)
+        elif len(self._counts) < self.capacity:
+            vacated = None
+            new_count = count
+            self._errors[item] = 0
+        else:
+            # En düşük sayaçlı (ve en eski) öğeyi çıkar, yerini yeni öğe alır
+            vacated = self._min
+            min_bucket = self._buckets[vacated]
+            victim, _ = min_bucket.popitem(last=False)
+            if not min_bucket:
+                del self._buckets[vacated]
+            del self._counts[victim]
+            del self._errors[victim]
+            self._errors[item] = vacated
+            new_count = vacated + count
+
+        self._counts[item] = new_count
+        self._bucket_add(item, new_count)
+
+        # Minimum sayacı güncelle
+        if len(self._counts) == 1:
+            self._min = new_count
+        elif vacated is None:
+            self._min = min(self._min, new_count)
+        elif vacated == self._min and vacated not in self._buckets:
+            # Birim artırımda yeni minimum her zaman bir üst kovadır
+            self._min = new_count if count == 1 else min(self._buckets)
+
+    def count(self, item: str) -> int:
+        """Tahmini sayı (gerçek sayının üst sınırı); izlenmiyorsa 0"""
+        return self._counts.get(item, 0)
+
+    def error(self, item: str) -> int:
+        """Tahmini sayıdaki olası fazla sayım"""
+        return self._errors.get(item, 0)
+
+    def top(self, n: int = 10) -> List[Tuple[str, int, int]]:
+        """En sık n öğe: (öğe, tahmini sayı, hata üst sınırı)"""
+        ranked = sorted(self._counts.items(), key=lambda x: x[1], reverse=True)[:n]
+        return [(item, count, self._errors[item]) for item, count in ranked]
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """Başka bir özeti birleştir (Agarwal vd. birleştirilebilir özet kuralı)"""
+        self_floor = self._min if len(self._counts) >= self.capacity else 0
+        other_floor = other._min if len(other._counts) >= other.capacity else 0
+
+        merged = {}
+        for item in list(self._counts) + [item for item in other._counts if item not in self._counts]:
+            count_a = self._counts.get(item)
+            count_b = other._counts.get(item)
+            error_a = self._errors.get(item, self_floor)
+            error_b = other._errors.get(item, other_floor)
+            merged[item] = (
+                (count_a if count_a is not None else self_floor) + (count_b if count_b is not None else other_floor),
+                error_a + error_b
+            )
+
+        kept = sorted(merged.items(), key=lambda x: x[1][0], reverse=True)[:self.capacity]
+        total = self.total + other.total
+        self._rebuild([(item, count, error) for item, (count, error) in kept])
+        self.total = total
+        return self
+
+    def _rebuild(self, entries: List[Tuple[str, int, int]]):
+        self._counts = {}
+        self._errors = {}
+        self._buckets = {}
+        for item, count, error in entries:
+            self._counts[item] = count
+            self._errors[item] = error
+            self._bucket_add(item, count)
+        self._min = min(self._buckets) if self._buckets else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON'a yazılabilir durum"""
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'items': [[item, count, self._errors[item]] for item, count in self._counts.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SpaceSaving':
+        sketch = cls(data['capacity'])
+        sketch._rebuild([tuple(entry) for entry in data['items']])
+        sketch.total = data['total']
+        return sketch
+
+class TrendTermTracker:
+    """Başlıklardaki kelime ve bigram trendlerini sınırlı bellekte takip eder"""
+
+    def __init__(self, capacity: int = 2000, bigram_capacity: Optional[int] = None):
+        self.words = SpaceSaving(capacity)
+        self.bigrams = SpaceSaving(bigram_capacity or capacity)
+
+    def add_title(self, title: str):
+        """Başlığın kelimelerini ve ardışık kelime çiftlerini say"""
+        words = [word for word in TITLE_WORD_RE.findall(title.lower()) if word not in STOP_WORDS]
+        add_word = self.words.add
+        for word in words:
+            add_word(word)
+        add_bigram = self.bigrams.add
+        for first, second in zip(words, words[1:]):
+            add_bigram(f"{first} {second}")
+
+    def merge(self, other: 'TrendTermTracker') -> 'TrendTermTracker':
+        self.words.merge(other.words)
+        self.bigrams.merge(other.bigrams)
+        return self
+
+    def top_terms(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return [{'keyword': word, 'frequency': count} for word, count, _ in self.words.top(limit)]
+
+    def top_phrases(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return [{'keyword': phrase, 'frequency': count} for phrase, count, _ in self.bigrams.top(limit)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'words': self.words.to_dict(), 'bigrams': self.bigrams.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TrendTermTracker':
+        tracker = cls()
+        tracker.words = SpaceSaving.from_dict(data['words'])
+        tracker.bigrams = SpaceSaving.from_dict(data['bigrams'])
+        return tracker
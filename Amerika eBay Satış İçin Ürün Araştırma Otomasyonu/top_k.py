@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Akış Halinde En İyi K Seçimi
+Bu modül skorlanan ürünleri tam sıralama yapmadan, sabit boyutlu bir min-heap
+ile O(n log k) sürede seçer. Eşit skorlarda önce gelen ürün önde kalır; bu,
+kararlı (stable) azalan sıralamanın ilk k elemanıyla birebir aynı sonucu verir.
+"""
+
+import heapq
+from typing import List, Any, Optional, Iterable
+
+class TopKSelector:
+    """En yüksek skorlu k ürünü (isteğe bağlı skor eşiğiyle) tutan seçici"""
+
+    def __init__(self, k: int = 10, min_score: Optional[float] = None, score_key: str = 'advanced_score'):
+        self.k = k
+        self.min_score = min_score
+        self.score_key = score_key
+        self._heap = []
+        self._seq = 0
+
+    def push(self, product: Any, score: Optional[float] = None):
+        """Ürünü seçiciye besle (ürünler geliş sırasıyla numaralandırılır)"""
+        seq = self._seq
+        self._seq += 1
+
+        if score is None:
+            score = product.get(self.score_key, 0)
+        if self.min_score is not None and score < self.min_score:
+            return
+        if self.k <= 0:
+            return
+
+        # Heap kökü en zayıf aday: en düşük skor, eşitlikte en geç gelen
+        entry = (score, -seq, product)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif (score, -seq) > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def extend(self, products: Iterable[Any]):
+        """Birden çok ürünü sırayla besle"""
+        for product in products:
+            self.push(product)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def results(self) -> List[Any]:
+        """Seçilen ürünleri skora göre azalan, eşitlikte geliş sırasına göre döndür"""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+HTTP Taşıma Katmanı (Kayıt / Tekrar Oynatma)
+Bu modül veri çekme motorunun HTTP isteklerini gönderdiği katmanı soyutlar.
+Canlı taşıma paylaşılan requests.Session'ı kullanır; kayıt modu canlı
+çalıştırmanın ham yanıtlarını sıkıştırılmış bir tar arşivine (zstandard
+kuruluysa .tar.zst, değilse .tar.gz) yazar; tekrar oynatma modu arşivdeki
+yanıtları ağa çıkmadan bellekten, isteğe bağlı yapay gecikme ve jitter ile
+sunar. Böylece tüm pipeline üzerindeki performans deneyleri çevrimdışı ve
+tekrarlanabilir yürütülür.
+"""
+
+import io
+import json
+import time
+import random
+import hashlib
+import logging
+import tarfile
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from response_cache import make_cache_key, normalize_url
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+_INDEX_NAME = 'index.json'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Arşive yazılan yanıt başlıkları (çerezler ve bağlantıya özgü başlıklar saklanmaz)
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Retry-After')
+# Kayıtta arşivin tam gövdeler içermesi için koşullu istek başlıkları gönderilmez
+CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+class ReplayMissError(LookupError):
+    """Tekrar oynatılan arşivde istenen URL için kayıt yok"""
+
+class LiveTransport:
+    """İstekleri doğrudan paylaşılan requests.Session ile gönderir"""
+
+    # Gerçek sunucuya gidildiği için host başına hız sınırı uygulanır
+    rate_limited = True
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session
+
+    def attach(self, session: requests.Session):
+        """Veri çekme motorunun oturumunu bağla (oturum verilmediyse)"""
+        if self.session is None:
+            self.session = session
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers=None, timeout=None) -> requests.Response:
+        return self.session.get(url, params=params, headers=headers, timeout=timeout)
+
+    def close(self):
+        pass
+
+class RecordingTransport:
+    """Canlı yanıtları döndürürken arşive kaydeder; arşiv close() ile yazılır"""
+
+    rate_limited = True
+
+    def __init__(self, archive_path: str, inner: Optional[LiveTransport] = None, compression: str = 'auto'):
+        if compression == 'auto':
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("zstd sıkıştırması için zstandard paketi gerekli")
+        if compression not in ('zstd', 'gzip'):
+            raise ValueError(f"Geçersiz sıkıştırma: {compression} (zstd, gzip)")
+        self.archive_path = archive_path
+        self.inner = inner
+        self.compression = compression
+        self._entries: List[Dict[str, Any]] = []
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def attach(self, session: requests.Session):
+        if self.inner is None:
+            self.inner = LiveTransport(session)
+        else:
+            self.inner.attach(session)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers=None, timeout=None) -> requests.Response:
+        if headers:
+            headers = {name: value for name, value in headers.items() if name not in CONDITIONAL_HEADERS} or None
+        response = self.inner.get(url, params=params, headers=headers, timeout=timeout)
+        self.record(url, params, response)
+        return response
+
+    def record(self, url: str, params: Optional[Dict[str, Any]], response: requests.Response):
+        """Yanıtı kayıt sırasına ekle; aynı gövdeler arşivde bir kez saklanır"""
+        body = response.content
+        digest = hashlib.sha1(body).hexdigest()
+        entry = {
+            'key': make_cache_key(url, params),
+            'url': normalize_url(url, params),
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            'body': digest,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self._bodies.setdefault(digest, body)
+
+    @property
+    def recorded(self) -> int:
+        return len(self._entries)
+
+    def save(self):
+        """Arşivi yaz: önce dizin (index.json), ardından içerik adresli gövdeler"""
+        with self._lock:
+            index = {
+                'version': ARCHIVE_VERSION,
+                'created_at': datetime.now().isoformat(),
+                'entries': list(self._entries),
+            }
+            bodies = dict(self._bodies)
+
+        with open(self.archive_path, 'wb') as f:
+            if self.compression == 'zstd':
+                with zstandard.ZstdCompressor(level=10).stream_writer(f, closefd=False) as stream:
+                    self._write_tar(tarfile.open(fileobj=stream, mode='w|'), index, bodies)
+            else:
+                self._write_tar(tarfile.open(fileobj=f, mode='w:gz'), index, bodies)
+        logger.info(f"Kayıt arşivi yazıldı: {self.archive_path} ({len(index['entries'])} yanıt, "
+                    f"{len(bodies)} benzersiz gövde)")
+
+    @staticmethod
+    def _write_tar(archive: tarfile.TarFile, index: Dict[str, Any], bodies: Dict[str, bytes]):
+        members = [(_INDEX_NAME, json.dumps(index, ensure_ascii=False).encode('utf-8'))]
+        members.extend((f"bodies/{digest}", body) for digest, body in bodies.items())
+        with archive:
+            for name, data in members:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        """Arşivi bir kez yaz (çalıştırma yarıda kesilse bile o ana kadarki yanıtlar saklanır)"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Kayıt arşivi yazılamadı ({self.archive_path}): {e}")
+        if self.inner is not None:
+            self.inner.close()
+
+class ReplayTransport:
+    """Arşivdeki yanıtları ağa çıkmadan sunar (isteğe bağlı yapay gecikme ve jitter)
+
+    Aynı URL için birden fazla kayıt varsa (ör. 503 ardından 200) yanıtlar
+    kayıt sırasıyla verilir, sonra sonuncusu tekrarlanır; rewind() sırayı
+    başa alır.
+    """
+
+    # Sunucuya gidilmediği için hız sınırı beklemesi yoktur (bellek hızında oynatma)
+    rate_limited = False
+
+    def __init__(self, archive_path: str, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None):
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency ve jitter negatif olamaz")
+        self.archive_path = archive_path
+        self.latency = latency
+        self.jitter = jitter
+        self.served = 0
+        self.misses = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._responses: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, int] = {}
+        self._load()
+
+    def _load(self):
+        index, bodies = load_archive(self.archive_path)
+        if index.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"Desteklenmeyen arşiv sürümü: {index.get('version')}")
+        for entry in index['entries']:
+            entry = dict(entry, content=bodies[entry['body']])
+            self._responses.setdefault(entry['key'], []).append(entry)
+        logger.info(f"Kayıt arşivi yüklendi: {self.archive_path} ({len(index['entries'])} yanıt, "
+                    f"{len(self._responses)} URL)")
+
+    def attach(self, session: requests.Session):
+        pass
+
+    def rewind(self):
+        """Her URL için yanıt sırasını başa al"""
+        with self._lock:
+            self._cursors.clear()
+
+    def _delay(self) -> float:
+        if not self.latency and not self.jitter:
+            return 0.0
+        with self._lock:
+            return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers=None, timeout=None) -> requests.Response:
+        key = make_cache_key(url, params)
+        with self._lock:
+            entries = self._responses.get(key)
+            if entries is None:
+                self.misses += 1
+                raise ReplayMissError(f"Arşivde kayıt yok: {normalize_url(url, params)}")
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = min(cursor + 1, len(entries) - 1)
+            self.served += 1
+        entry = entries[cursor]
+
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+
+        # Önbellekteki ETag kayıtlı yanıtla eşleşiyorsa sunucu gibi 304 döndür
+        etag = entry['headers'].get('ETag')
+        if headers and etag and headers.get('If-None-Match') == etag and entry['status'] == 200:
+            return self._response(url, params, 304, entry['headers'], b'')
+        return self._response(url, params, entry['status'], entry['headers'], entry['content'])
+
+    @staticmethod
+    def _response(url, params, status: int, headers: Dict[str, str], content: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response._content_consumed = True  # raw akış yok; close() güvenli
+        response.url = normalize_url(url, params)
+        return response
+
+    def close(self):
+        pass
+
+def load_archive(path: str):
+    """Arşivi oku: (dizin, özet -> gövde) döndürür; sıkıştırma biçimi otomatik algılanır"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+        f.seek(0)
+        if magic == _ZSTD_MAGIC:
+            if zstandard is None:
+                raise ImportError(f"{path} zstd ile sıkıştırılmış; zstandard paketi gerekli")
+            with zstandard.ZstdDecompressor().stream_reader(f) as stream:
+                return _read_tar(tarfile.open(fileobj=stream, mode='r|'))
+        return _read_tar(tarfile.open(fileobj=f, mode='r:*'))
+
+def _read_tar(archive: tarfile.TarFile):
+    index = None
+    bodies = {}
+    with archive:
+        for member in archive:
+            data = archive.extractfile(member).read() if member.isfile() else None
+            if member.name == _INDEX_NAME:
+                index = json.loads(data)
+            elif member.name.startswith('bodies/'):
+                bodies[member.name[len('bodies/'):]] = data
+    if index is None:
+        raise ValueError("Arşivde index.json yok")
+    return index, bodies
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Satış Hızı (Velocity) Takibi
+Bu modül her ürün için satış artışını, fiyat eğilimini ve izleyici büyümesini
+artımlı olarak izler. Ürün başına durum sabit boyutludur: son anlık görüntü
+ve zamana duyarlı üstel hareketli ortalamalar (kısa/uzun pencereli satış/gün,
+izleyici/gün, fiyat EWMA). Yeni anlık görüntü geldiğinde durum O(1) güncellenir;
+geçmişin tamamı yeniden okunmaz. Durum geçmiş deposunun SQLite veritabanında
+saklanır ve her çalıştırmada yalnızca o çalıştırmanın ürünleri yüklenir.
+"""
+
+import math
+import logging
+from operator import attrgetter
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional
+
+from product_record import Product
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS velocity (
+    item_id          TEXT PRIMARY KEY,
+    last_at          REAL NOT NULL,
+    last_sold        INTEGER NOT NULL,
+    last_watchers    INTEGER NOT NULL,
+    last_price       REAL NOT NULL,
+    price_ewma       REAL NOT NULL,
+    sold_rate_short  REAL NOT NULL,
+    sold_rate_long   REAL NOT NULL,
+    watcher_rate     REAL NOT NULL,
+    snapshots        INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_COLUMNS = ('item_id', 'last_at', 'last_sold', 'last_watchers', 'last_price', 'price_ewma',
+            'sold_rate_short', 'sold_rate_long', 'watcher_rate', 'snapshots')
+_row = attrgetter(*_COLUMNS)
+
+# SQLite IN (...) sorgusu başına kimlik sayısı (değişken sınırının altında)
+_LOOKUP_CHUNK = 500
+
+_SECONDS_PER_DAY = 86400.0
+
+def _decay(elapsed_days: float, window_days: float) -> float:
+    """Zamana duyarlı EWMA katsayısı: düzensiz aralıklı anlık görüntülerde pencere süresi korunur"""
+    return 1.0 - math.exp(-elapsed_days / window_days)
+
+class VelocityState:
+    """Tek bir ürünün sabit boyutlu hız durumu"""
+
+    __slots__ = _COLUMNS
+
+    def __init__(self, item_id: str, last_at: float, last_sold: int, last_watchers: int, last_price: float,
+                 price_ewma: float, sold_rate_short: float = 0.0, sold_rate_long: float = 0.0,
+                 watcher_rate: float = 0.0, snapshots: int = 1):
+        self.item_id = item_id
+        self.last_at = last_at
+        self.last_sold = last_sold
+        self.last_watchers = last_watchers
+        self.last_price = last_price
+        self.price_ewma = price_ewma
+        self.sold_rate_short = sold_rate_short
+        self.sold_rate_long = sold_rate_long
+        self.watcher_rate = watcher_rate
+        self.snapshots = snapshots
+
+    @classmethod
+    def first(cls, item_id: str, at: float, sold: int, watchers: int, price: float) -> 'VelocityState':
+        return cls(item_id, at, sold, watchers, price, price)
+
+    def update(self, at: float, sold: int, watchers: int, price: float,
+               short_window: float, long_window: float, price_window: float) -> bool:
+        """Yeni anlık görüntüyü uygula; aynı veya daha eski zamanlı görüntü yok sayılır"""
+        elapsed = (at - self.last_at) / _SECONDS_PER_DAY
+        if elapsed <= 0:
+            return False
+        # Satış sayısı azalamaz; düşüş yeniden listeleme gibi durumlardan gelir ve satış sayılmaz
+        sold_rate = max(0, sold - self.last_sold) / elapsed
+        watcher_rate = (watchers - self.last_watchers) / elapsed
+
+        self.sold_rate_short += _decay(elapsed, short_window) * (sold_rate - self.sold_rate_short)
+        long_alpha = _decay(elapsed, long_window)
+        self.sold_rate_long += long_alpha * (sold_rate - self.sold_rate_long)
+        self.watcher_rate += long_alpha * (watcher_rate - self.watcher_rate)
+        if price > 0:
+            if self.price_ewma <= 0:
+                self.price_ewma = price
+            else:
+                self.price_ewma += _decay(elapsed, price_window) * (price - self.price_ewma)
+
+        self.last_at = at
+        self.last_sold = sold
+        self.last_watchers = watchers
+        self.last_price = price
+        self.snapshots += 1
+        return True
+
+    @property
+    def price_ratio(self) -> float:
+        """Güncel fiyatın fiyat EWMA'sına oranı (1.0: eğilimde)"""
+        return self.last_price / self.price_ewma if self.price_ewma > 0 and self.last_price > 0 else 1.0
+
+    def row(self) -> tuple:
+        return _row(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'item_id': self.item_id,
+            'sold_per_day': round(self.sold_rate_long, 4),
+            'sold_per_day_short': round(self.sold_rate_short, 4),
+            'watcher_growth_per_day': round(self.watcher_rate, 4),
+            'price': self.last_price,
+            'price_ewma': round(self.price_ewma, 2),
+            'snapshots': self.snapshots,
+        }
+
+def _timestamp(scraped_at: Optional[str], default: float, cache: Dict[str, float]) -> float:
+    """ISO zaman damgasını epoch saniyesine çevir (çalıştırma içinde tekrarlanan değerler bir kez ayrıştırılır)"""
+    if not scraped_at:
+        return default
+    value = cache.get(scraped_at)
+    if value is None:
+        try:
+            value = datetime.fromisoformat(scraped_at).timestamp()
+        except ValueError:
+            value = default
+        cache[scraped_at] = value
+    return value
+
+class VelocityTracker:
+    """Geçmiş deposu veritabanında saklanan, artımlı güncellenen ürün hız durumları"""
+
+    def __init__(self, history_store, short_window_days: float = 1.0, long_window_days: float = 7.0,
+                 price_window_days: float = 7.0):
+        if min(short_window_days, long_window_days, price_window_days) <= 0:
+            raise ValueError("Pencere süreleri pozitif olmalı")
+        self.history_store = history_store
+        self.conn = history_store.conn
+        self.short_window = short_window_days
+        self.long_window = long_window_days
+        self.price_window = price_window_days
+        # Son güncellenen ürünlerin durumları (skorlama bu sözlükten okur) ve başlıkları
+        self.states: Dict[str, VelocityState] = {}
+        self.titles: Dict[str, str] = {}
+        # Skor bileşeni önbelleği için: her güncellemede artar
+        self.version = 0
+        self.conn.executescript(SCHEMA)
+        if self._needs_rebuild():
+            self.rebuild()
+
+    def _needs_rebuild(self) -> bool:
+        """Hız tablosu boş ama geçmişte anlık görüntü var (önceki sürümden kalan veritabanı)"""
+        if self.conn.execute("SELECT 1 FROM velocity LIMIT 1").fetchone() is not None:
+            return False
+        return self.conn.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone() is not None
+
+    def _load(self, item_ids: List[str]) -> Dict[str, VelocityState]:
+        states = {}
+        for start in range(0, len(item_ids), _LOOKUP_CHUNK):
+            chunk = item_ids[start:start + _LOOKUP_CHUNK]
+            cursor = self.conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM velocity WHERE item_id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            for row in cursor:
+                states[row[0]] = VelocityState(*row)
+        return states
+
+    def _apply(self, states: Dict[str, VelocityState], item_id: str, at: float,
+               sold: int, watchers: int, price: float) -> bool:
+        state = states.get(item_id)
+        if state is None:
+            states[item_id] = VelocityState.first(item_id, at, sold, watchers, price)
+            return True
+        return state.update(at, sold, watchers, price, self.short_window, self.long_window, self.price_window)
+
+    def update(self, products: Iterable[Any]) -> int:
+        """Çalıştırmanın ürünlerini uygula ve durumları tek işlemde kaydet; güncellenen ürün sayısını döndür"""
+        now = datetime.now().timestamp()
+        parsed: Dict[str, float] = {}
+        observations = []
+        titles = {}
+        for product in products:
+            product = Product.coerce(product)
+            item_id = product.item_id
+            titles[item_id] = product.title
+            observations.append((item_id, _timestamp(product.scraped_at, now, parsed), int(product.sold_count or 0),
+                                 int(product.watchers or 0), float(product.price or 0.0)))
+
+        states = self._load(list(dict.fromkeys(observation[0] for observation in observations)))
+        changed = {}
+        for observation in observations:
+            if self._apply(states, *observation):
+                changed[observation[0]] = states[observation[0]]
+
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO velocity ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (state.row() for state in changed.values())
+            )
+        self.states = states
+        self.titles = titles
+        self.version += 1
+        logger.info(f"Satış hızı güncellendi: {len(changed)}/{len(states)} ürün")
+        return len(changed)
+
+    def rebuild(self) -> int:
+        """Hız durumlarını geçmiş deposundaki anlık görüntülerden baştan oluştur (tek seferlik geçiş)"""
+        logger.info("Satış hızı durumları geçmiş deposundan oluşturuluyor...")
+        parsed: Dict[str, float] = {}
+        states: Dict[str, VelocityState] = {}
+        # Aynı anda birden fazla arama teriminde görülen ürün tek anlık görüntü sayılır
+        cursor = self.conn.execute("""
+            SELECT item_id, scraped_at, MAX(sold_count), MAX(watchers), MAX(price)
+            FROM snapshots
+            GROUP BY item_id, scraped_at
+            ORDER BY scraped_at
+        """)
+        for item_id, scraped_at, sold, watchers, price in cursor:
+            at = _timestamp(scraped_at, None, parsed)
+            if at is None:
+                continue
+            self._apply(states, item_id, at, int(sold or 0), int(watchers or 0), float(price or 0.0))
+        with self.conn:
+            self.conn.execute("DELETE FROM velocity")
+            self.conn.executemany(
+                f"INSERT INTO velocity ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                (state.row() for state in states.values())
+            )
+        logger.info(f"{len(states)} ürünün satış hızı durumu oluşturuldu")
+        return len(states)
+
+    def get(self, item_id: str) -> Optional[VelocityState]:
+        """Son güncellemedeki ürün durumu (bu çalıştırmada görülmeyen ürünler için None)"""
+        return self.states.get(item_id)
+
+    def feature_arrays(self, item_ids: List[str]):
+        """Skorlama için sütunlu özellikler: anlık görüntü sayısı, uzun/kısa satış hızı, izleyici büyümesi, fiyat oranı"""
+        import numpy as np
+        n = len(item_ids)
+        states = [self.states.get(item_id) for item_id in item_ids]
+        return {
+            'snapshots': np.fromiter((s.snapshots if s else 0 for s in states), dtype=np.int64, count=n),
+            'sold_rate_long': np.fromiter((s.sold_rate_long if s else 0.0 for s in states), dtype=np.float64, count=n),
+            'sold_rate_short': np.fromiter((s.sold_rate_short if s else 0.0 for s in states), dtype=np.float64, count=n),
+            'watcher_rate': np.fromiter((s.watcher_rate if s else 0.0 for s in states), dtype=np.float64, count=n),
+            'price_ratio': np.fromiter((s.price_ratio if s else 1.0 for s in states), dtype=np.float64, count=n),
+        }
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Bu çalıştırmada satış hızı en yüksek ürünler (en az iki anlık görüntüsü olanlar)"""
+        ranked = sorted((state for state in self.states.values() if state.snapshots > 1 and state.sold_rate_long > 0),
+                        key=lambda state: (-state.sold_rate_long, state.item_id))[:limit]
+        return [dict(state.to_dict(), title=self.titles.get(state.item_id)) for state in ranked]